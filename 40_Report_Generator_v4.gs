@@ -32,6 +32,10 @@ var REPORT_CONFIG_V4 = {
   geminiModel: "gemini-1.5-flash",
   geminiApiKey: "", // PropertiesService에서 가져옴
   
+  // AI 변환을 PDF 서버에서 동시에 실행 (HANDOFF만 전송, 서버에 GEMINI_API_KEY 필요)
+  // 스크립트 속성 SERVER_TRANSFORM ("true"/"false")이 있으면 그 값 사용
+  serverTransform: false,
+  
   // 이메일 설정
   emailSubject: "[G-IMPACT] 분석 리포트가 생성되었습니다",
   
@@ -453,6 +457,7 @@ function buildReportDialogHtml_V4() {
           setStepDone(4);
           showStatus('✅ 리포트 생성이 시작되었습니다.<br>완료되면 ' + email + '로 알림이 발송됩니다.', 'success');
           document.getElementById('startBtn').textContent = '✓ 요청 완료';
+          if (result && result.eventsUrl && window.EventSource) streamServerProgress(result.eventsUrl);
         })
         .withFailureHandler(function(e) {
           showStatus('오류 발생: ' + e.message, 'error');
@@ -483,6 +488,30 @@ function buildReportDialogHtml_V4() {
       }, 3000);
     }
     
+    // PDF 서버 진행 이벤트 (SSE) - 서버 단계(AI 변환/섹션 렌더링)를 폴링 없이 표시
+    function streamServerProgress(url) {
+      var source = new EventSource(url);
+      var labels = { summary: '요약 보고서', detail: '상세 보고서' };
+      source.addEventListener('transform', function(e) {
+        var d = JSON.parse(e.data);
+        updateProgress(20 + Math.round(60 * d.done / d.total), '서버 AI 변환 (' + d.done + '/' + d.total + ') ' + d.section);
+      });
+      source.addEventListener('section', function(e) {
+        var d = JSON.parse(e.data);
+        var base = d.report === 'detail' ? 88 : 80;
+        updateProgress(base + Math.round(7 * d.index / d.total),
+          labels[d.report] + ' 섹션 ' + d.index + '/' + d.total + ' (' + d.section + ')');
+      });
+      source.addEventListener('pdf', function(e) {
+        var d = JSON.parse(e.data);
+        updateProgress(d.report === 'detail' ? 95 : 88,
+          labels[d.report] + ' PDF 완료 (' + d.pages + '페이지, ' + Math.round(d.bytes / 1024) + 'KB)');
+      });
+      ['done', 'failed', 'expired'].forEach(function(name) {
+        source.addEventListener(name, function() { source.close(); });
+      });
+    }
+    
     function updateProgress(percent, text) {
       document.getElementById('progressFill').style.width = percent + '%';
       document.getElementById('progressText').textContent = text;
@@ -715,6 +744,8 @@ function showEmailSettingV4() {
  * 리포트 생성 시작 (백그라운드)
  */
 function startReportGenerationV4(params) {
+  // PDF 서버 작업 ID - 다이얼로그가 서버 진행 이벤트(SSE)를 바로 구독할 수 있도록 미리 정함
+  params.jobId = Utilities.getUuid();
   Logger.log("리포트 생성 시작: " + JSON.stringify(params));
   
   // 진행 상태 초기화
@@ -736,7 +767,13 @@ function startReportGenerationV4(params) {
   // 파라미터 저장
   PropertiesService.getScriptProperties().setProperty('REPORT_PARAMS_' + trigger.getUniqueId(), JSON.stringify(params));
   
-  return { status: "started", triggerId: trigger.getUniqueId() };
+  var serverUrl = PropertiesService.getScriptProperties().getProperty('PDF_SERVER_URL') || REPORT_CONFIG_V4.pdfServerUrl;
+  return {
+    status: "started",
+    triggerId: trigger.getUniqueId(),
+    jobId: params.jobId,
+    eventsUrl: serverUrl + "/jobs/" + params.jobId + "/events"
+  };
 }
 
 /**
@@ -759,12 +796,24 @@ function executeReportGenerationV4(e) {
     updateProgressV4(progressKey, 1, 10, "HANDOFF 데이터 수집 중...");
     var rawData = collectAllHandoffsV4(params.businessName, params.bm);
     
-    // Step 2: AI 변환
-    updateProgressV4(progressKey, 2, 20, "AI 분석 변환 중... (1/9)");
-    var transformedData = transformAllWithAI_V4(rawData, params.businessName, progressKey);
+    // 서버에 없는 HANDOFF만 업로드하고 이후 요청은 단계별 해시로 참조 (실패하면 본문 그대로 전송)
+    rawData.handoffRefs = syncBlobsV4(rawData.handoffs);
+    storeHandoffsV4(rawData);
+    
+    // 서버 사전 검증 - 렌더링할 수 없는 데이터면 AI 변환 전에 중단
+    validateHandoffsV4(rawData, params);
+    
+    // Step 2: AI 변환 (서버 변환이면 PDF 생성 요청에서 함께 처리)
+    var serverTransform = isServerTransformV4();
+    var transformedData = { sections: {}, executiveSummary: null };
+    if (!serverTransform) {
+      updateProgressV4(progressKey, 2, 20, "AI 분석 변환 중... (1/9)");
+      transformedData = transformAllWithAI_V4(rawData, params.businessName, progressKey);
+    }
     
     // Step 3: PDF 생성 요청
-    updateProgressV4(progressKey, 3, 80, "PDF 생성 중...");
+    updateProgressV4(progressKey, 3, serverTransform ? 20 : 80,
+      serverTransform ? "AI 변환 및 PDF 생성 중 (서버)..." : "PDF 생성 중...");
     var pdfResult = requestPdfGenerationV4(rawData, transformedData, params);
     
     // Step 4: 완료 및 이메일 발송
@@ -972,6 +1021,14 @@ function transformAllWithAI_V4(rawData, businessName, progressKey) {
   return transformed;
 }
 
+/**
+ * 서버 AI 변환 사용 여부 (스크립트 속성 SERVER_TRANSFORM 우선)
+ */
+function isServerTransformV4() {
+  var value = PropertiesService.getScriptProperties().getProperty('SERVER_TRANSFORM');
+  return value === null ? REPORT_CONFIG_V4.serverTransform : value === "true";
+}
+
 /**
  * 개별 섹션 AI 변환
  */
@@ -1440,18 +1497,167 @@ function callGeminiAPI_V4(prompt) {
 // [9] PDF 서버 연동
 // ============================================
 
+/**
+ * SHA-256 hex (UTF-8)
+ */
+function sha256HexV4(text) {
+  var bytes = Utilities.computeDigest(Utilities.DigestAlgorithm.SHA_256, text, Utilities.Charset.UTF_8);
+  return bytes.map(function(b) { return ("0" + (b & 0xff).toString(16)).slice(-2); }).join("");
+}
+
+/**
+ * 블롭 동기화 (/blobs/missing → /blobs)
+ * 항목별 JSON의 해시를 보내 서버에 없는 것만 업로드하고 {키: 해시} 반환, 실패하면 null
+ * items: {키: 객체} - HANDOFF 단계 또는 AI 변환 섹션
+ */
+function syncBlobsV4(items) {
+  var serverUrl = PropertiesService.getScriptProperties().getProperty('PDF_SERVER_URL') || REPORT_CONFIG_V4.pdfServerUrl;
+  
+  var texts = {};
+  var refs = {};
+  for (var key in items) {
+    var text = JSON.stringify(items[key]);
+    var hash = sha256HexV4(text);
+    texts[hash] = text;
+    refs[key] = hash;
+  }
+  
+  try {
+    var response = UrlFetchApp.fetch(serverUrl + "/blobs/missing", {
+      method: "post",
+      contentType: "application/json",
+      payload: JSON.stringify({ hashes: Object.keys(texts) }),
+      muteHttpExceptions: true
+    });
+    if (response.getResponseCode() !== 200) {
+      Logger.log("블롭 동기화 생략 (HTTP " + response.getResponseCode() + ")");
+      return null;
+    }
+    var missing = JSON.parse(response.getContentText()).missing;
+    
+    if (missing.length > 0) {
+      var blobs = {};
+      missing.forEach(function(h) { blobs[h] = texts[h]; });
+      response = UrlFetchApp.fetch(serverUrl + "/blobs", {
+        method: "post",
+        contentType: "application/json; charset=utf-8",
+        payload: JSON.stringify({ blobs: blobs }),
+        muteHttpExceptions: true
+      });
+      if (response.getResponseCode() !== 200) {
+        Logger.log("블롭 업로드 실패 (HTTP " + response.getResponseCode() + ")");
+        return null;
+      }
+    }
+    Logger.log("블롭 동기화: " + Object.keys(refs).length + "개 중 " + missing.length + "개 업로드");
+    return refs;
+  } catch (e) {
+    Logger.log("블롭 동기화 생략: " + e.message);
+    return null;
+  }
+}
+
+/**
+ * HANDOFF 서버 저장소에 버전 기록 (/handoffs) - 블롭 해시로 참조하므로 본문을 다시 보내지 않음
+ */
+function storeHandoffsV4(rawData) {
+  var serverUrl = PropertiesService.getScriptProperties().getProperty('PDF_SERVER_URL') || REPORT_CONFIG_V4.pdfServerUrl;
+  
+  var options = {
+    method: "post",
+    contentType: "application/json",
+    payload: JSON.stringify(handoffPayloadV4(rawData, {
+      business_name: rawData.meta.business_name,
+      bm: rawData.meta.bm
+    })),
+    muteHttpExceptions: true
+  };
+  
+  try {
+    var response = UrlFetchApp.fetch(serverUrl + "/handoffs", options);
+    if (response.getResponseCode() !== 200) {
+      Logger.log("HANDOFF 저장 생략 (HTTP " + response.getResponseCode() + ")");
+      return;
+    }
+    var result = JSON.parse(response.getContentText());
+    var steps = Object.keys(result.handoffs);
+    var created = steps.filter(function(step) { return result.handoffs[step].created; }).length;
+    Logger.log("HANDOFF 저장: " + steps.length + "개 (새 버전 " + created + "개)");
+  } catch (e) {
+    Logger.log("HANDOFF 저장 생략: " + e.message);
+  }
+}
+
+/**
+ * 요청 본문의 HANDOFF 부분 - 참조(해시/저장 ID)가 있으면 참조만, 없으면 전체 본문
+ */
+function handoffPayloadV4(rawData, payload) {
+  if (rawData.handoffRefs) {
+    payload.handoffRefs = rawData.handoffRefs;
+  } else {
+    payload.handoffs = rawData.handoffs;
+  }
+  return payload;
+}
+
+/**
+ * Python PDF 서버 사전 검증 (/validate)
+ * 렌더링할 수 없는 HANDOFF면 예외, 서버에 연결할 수 없으면 검증 생략
+ */
+function validateHandoffsV4(rawData, params) {
+  var serverUrl = PropertiesService.getScriptProperties().getProperty('PDF_SERVER_URL') || REPORT_CONFIG_V4.pdfServerUrl;
+  
+  var options = {
+    method: "post",
+    contentType: "application/json",
+    payload: JSON.stringify(handoffPayloadV4(rawData, {
+      meta: rawData.meta,
+      options: { businessName: params.businessName, bm: params.bm, sections: params.sections || null }
+    })),
+    muteHttpExceptions: true
+  };
+  
+  var result;
+  try {
+    var response = UrlFetchApp.fetch(serverUrl + "/validate", options);
+    if (response.getResponseCode() !== 200) {
+      Logger.log("사전 검증 생략 (HTTP " + response.getResponseCode() + ")");
+      return;
+    }
+    result = JSON.parse(response.getContentText());
+  } catch (e) {
+    // 서버에 연결할 수 없으면 검증 없이 진행 (PDF 단계에서 폴백)
+    Logger.log("사전 검증 생략: " + e.message);
+    return;
+  }
+  
+  if (rawData.handoffRefs && result.errors.some(function(err) { return err.type === "not_found"; })) {
+    // 참조한 데이터를 찾지 못함 (서버 인스턴스 교체, 블롭 정리) - 이후 요청은 본문으로
+    Logger.log("참조 실패, HANDOFF 본문으로 재검증");
+    rawData.handoffRefs = null;
+    return validateHandoffsV4(rawData, params);
+  }
+  
+  (result.warnings || []).forEach(function(w) {
+    Logger.log("HANDOFF 경고: " + w.path + " - " + w.message);
+  });
+  if (!result.valid) {
+    var lines = result.errors.slice(0, 5).map(function(err) { return err.path + ": " + err.message; });
+    throw new Error("HANDOFF 데이터 오류 " + result.errors.length + "건\n" + lines.join("\n"));
+  }
+}
+
 /**
  * Python PDF 서버에 생성 요청
  */
 function requestPdfGenerationV4(rawData, transformedData, params) {
   var serverUrl = PropertiesService.getScriptProperties().getProperty('PDF_SERVER_URL') || REPORT_CONFIG_V4.pdfServerUrl;
   
-  var payload = {
+  var payload = handoffPayloadV4(rawData, {
     // 메타 정보
     meta: rawData.meta,
     
-    // 원본 HANDOFF 데이터 (차트 생성용)
-    handoffs: rawData.handoffs,
+    // 원본 HANDOFF 데이터 (차트 생성용) - handoffPayloadV4가 참조(handoffRefs) 또는 본문(handoffs)을 채움
     
     // AI 변환된 텍스트 (보고서 본문용)
     transformed: transformedData,
@@ -1461,9 +1667,22 @@ function requestPdfGenerationV4(rawData, transformedData, params) {
       generateSummary: params.generateSummary,
       generateDetail: params.generateDetail,
       businessName: params.businessName,
-      bm: params.bm
+      bm: params.bm,
+      // 일부 섹션만 렌더링 (예: ["swot", "tows"]), 없으면 전체
+      sections: params.sections || null,
+      // 서버에서 AI 변환 (transformed가 비어 있어도 상세 보고서 본문 생성)
+      transform: isServerTransformV4(),
+      // 진행 이벤트 작업 ID (GET /jobs/{jobId}/events)
+      jobId: params.jobId || null
     }
-  };
+  });
+  
+  // AI 변환 섹션도 서버에 없는 것만 업로드하고 해시로 참조
+  var transformedRefs = syncBlobsV4(transformedData.sections || {});
+  if (transformedRefs) {
+    payload.transformed = { executiveSummary: transformedData.executiveSummary, sections: {} };
+    payload.transformedRefs = transformedRefs;
+  }
   
   var options = {
     method: "post",
@@ -1475,6 +1694,16 @@ function requestPdfGenerationV4(rawData, transformedData, params) {
   
   try {
     var response = UrlFetchApp.fetch(serverUrl + "/generate", options);
+    if (response.getResponseCode() === 422 && (payload.handoffRefs || payload.transformedRefs)) {
+      // 서버 인스턴스가 바뀌었거나 블롭이 정리된 경우 - 본문으로 한 번 더
+      Logger.log("참조 실패, HANDOFF/변환 본문으로 재요청");
+      delete payload.handoffRefs;
+      delete payload.transformedRefs;
+      payload.handoffs = rawData.handoffs;
+      payload.transformed = transformedData;
+      options.payload = JSON.stringify(payload);
+      response = UrlFetchApp.fetch(serverUrl + "/generate", options);
+    }
     var result = JSON.parse(response.getContentText());
     
     if (result.error) {
@@ -1512,6 +1741,11 @@ function requestPdfGenerationV4(rawData, transformedData, params) {
   } catch (e) {
     Logger.log("PDF 서버 요청 실패: " + e.message);
     
+    // 서버 변환을 맡겼다면 폴백 문서용으로 여기서 변환
+    if (isServerTransformV4() && Object.keys(transformedData.sections || {}).length === 0) {
+      transformedData = transformAllWithAI_V4(rawData, params.businessName, "REPORT_PROGRESS_" + params.businessName);
+    }
+    
     // 폴백: Google Docs로 생성
     return generateFallbackReportV4(rawData, transformedData, params);
   }
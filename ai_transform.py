@@ -0,0 +1,807 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT AI 변환 파이프라인 (서버 측)
+핸드오프 단계별 JSON을 LLM으로 고객 친화적 마크다운(transformed.sections)으로 변환
+
+Apps Script transformAllWithAI_V4는 섹션 9개 + 경영진 요약을 하나씩 호출하고 사이마다 1초씩 쉼.
+서버에서는 같은 프롬프트를 asyncio로 동시에 보냄:
+1. 섹션 9개와 경영진 요약은 서로 독립 (경영진 요약도 원본 핸드오프만 사용) - 10개를 한꺼번에 시작
+2. 동시 호출 수는 세마포어(concurrency), 호출 빈도는 토큰 버킷(rate/s, 프로세스 공유)으로 제한
+3. 429/5xx/타임아웃은 지수 백오프(+지터)로 재시도, 그 외 오류는 섹션에 {error, original}로 기록
+   (Apps Script와 같은 형식 - 상세 보고서가 "AI 변환 실패"로 표시)
+4. 입력(핸드오프, 기업명)/프롬프트/모델이 같은 섹션은 변환 캐시에서 바로 사용 (transform_cache.py)
+
+백엔드 (GIMPACT_TRANSFORM_BACKEND):
+- gemini: Gemini generateContent (GEMINI_API_KEY, GIMPACT_GEMINI_MODEL) - Apps Script callGeminiAPI_V4와 같은 설정
+- stub: 프롬프트로 정해지는 마크다운을 돌려주는 로컬 백엔드 (테스트/벤치마크, 네트워크 없음)
+
+사용법:
+    python ai_transform.py request.json                    # 변환 결과(transformed) JSON 출력
+    python ai_transform.py request.json --backend stub --out transformed.json
+JSON 파일은 핸드오프 딕셔너리 또는 /generate 요청 본문 ({'meta', 'handoffs', ...})
+"""
+
+import abc
+import argparse
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from transform_cache import get_transform_cache, input_digest
+
+# ==============================================================================
+# 설정
+# ==============================================================================
+TRANSFORM_BACKEND = os.environ.get('GIMPACT_TRANSFORM_BACKEND', 'gemini')
+GEMINI_MODEL = os.environ.get('GIMPACT_GEMINI_MODEL', 'gemini-1.5-flash')
+GEMINI_URL = 'https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={key}'
+
+# 동시 호출 수 / 초당 호출 수 (Gemini 무료 등급은 분당 15회 정도 - 배포 환경에 맞게 조정)
+TRANSFORM_CONCURRENCY = int(os.environ.get('GIMPACT_TRANSFORM_CONCURRENCY', '4'))
+TRANSFORM_RATE = float(os.environ.get('GIMPACT_TRANSFORM_RATE', '2'))
+TRANSFORM_TIMEOUT = float(os.environ.get('GIMPACT_TRANSFORM_TIMEOUT', '120'))
+TRANSFORM_ATTEMPTS = int(os.environ.get('GIMPACT_TRANSFORM_ATTEMPTS', '4'))
+
+# 프롬프트 버전 (Apps Script buildSectionPromptV4와 같이 맞출 것)
+# 변환 캐시 키는 PROMPT_KEY - 프롬프트 문구가 바뀌면 자동으로 바뀌므로 형식 해석이 바뀔 때만 올림
+PROMPT_VERSION = '4.0'
+
+# 변환할 섹션 (Apps Script REPORT_CONFIG_V4.analysisSteps와 같은 순서) - (섹션 ID, 핸드오프 단계, 이름)
+TRANSFORM_STEPS = (
+    ('pestel', 'step_2_1_pestel', 'PESTEL 분석'),
+    ('scenario', 'step_2_2_scenario', '시나리오 분석'),
+    ('competition', 'step_2_3_competition', '경쟁환경 분석'),
+    ('customer', 'step_2_4_customer', '고객 분석'),
+    ('market', 'step_2_5_market', '시장 분석'),
+    ('diagnosis', 'step_3_1_diagnosis', '경영진단'),
+    ('vrio', 'step_3_2_vrio', 'VRIO 분석'),
+    ('swot', 'step_3_3_swot', 'SWOT 분석'),
+    ('tows', 'step_3_4_tows', 'TOWS 전략'),
+)
+
+# 경영진 요약 프롬프트에 넣는 핸드오프 JSON 길이 상한 (Apps Script와 동일)
+EXECUTIVE_DATA_CHARS = 15000
+
+# ==============================================================================
+# 프롬프트 (Apps Script buildSectionPromptV4 / generateExecutiveSummaryV4와 같은 문구)
+# ==============================================================================
+BASE_INSTRUCTION = """당신은 15년 경력의 경영 컨설턴트입니다.
+중소기업 CEO "{business_name}" 대표님께 분석 결과를 설명합니다.
+
+[작성 원칙]
+1. 전문용어는 반드시 쉬운 말로 풀어서 설명하세요
+2. "그래서 우리 회사에 어떤 의미인가?"를 반드시 포함하세요
+3. 구체적 숫자와 사례를 활용하세요
+4. 권고사항은 실행 가능하게 작성하세요
+5. 마크다운 형식으로 작성하세요 (##, ###, 표, 불릿 등)
+
+"""
+
+SECTION_PROMPTS = {
+    'pestel': """[분석 유형: PESTEL 거시환경 분석]
+
+아래 JSON 데이터를 "고객 친화적 언어"로 변환하여 상세 보고서를 작성하세요.
+
+[데이터]
+{data}
+
+[출력 형식]
+## 1. 거시환경 분석 (PESTEL)
+
+### 핵심 메시지
+[CEO가 30초 안에 파악할 수 있는 핵심 3줄]
+
+### 1.1 정치·정책 환경 (Political)
+**현황**: [쉬운 설명]
+**귀사에 미치는 영향**: [구체적 해석]
+**대응 방향**: [실행 가능한 제안]
+
+### 1.2 경제 환경 (Economic)
+[동일 형식]
+
+### 1.3 사회·문화 환경 (Social)
+[동일 형식]
+
+### 1.4 기술 환경 (Technological)
+[동일 형식]
+
+### 1.5 환경·생태 (Environmental)
+[동일 형식]
+
+### 1.6 법률·규제 (Legal)
+[동일 형식]
+
+### 종합 시사점
+**핵심 기회 TOP 3**:
+| 순위 | 기회 | 영향도 | 활용 방안 |
+|------|------|--------|----------|
+
+**핵심 위협 TOP 3**:
+| 순위 | 위협 | 긴급도 | 대응 방안 |
+|------|------|--------|----------|
+""",
+
+    'scenario': """[분석 유형: 시나리오 분석]
+
+아래 JSON 데이터를 "고객 친화적 언어"로 변환하여 상세 보고서를 작성하세요.
+
+[데이터]
+{data}
+
+[출력 형식]
+## 2. 미래 시나리오 분석
+
+### 핵심 메시지
+[CEO가 30초 안에 파악할 수 있는 핵심]
+
+### 시나리오 개요
+| 시나리오 | 발생확률 | 핵심 특징 | 귀사 영향 |
+|----------|----------|----------|----------|
+
+### 시나리오 1: [이름]
+**상황 설명**: [쉬운 설명]
+**귀사에 미치는 영향**: [구체적 해석]
+**대응 전략**: [실행 가능한 제안]
+
+[나머지 시나리오도 동일 형식]
+
+### 강건한 전략 (어떤 시나리오에서도 유효)
+- 전략 1: [설명]
+- 전략 2: [설명]
+- 전략 3: [설명]
+""",
+
+    'competition': """[분석 유형: 경쟁환경 분석]
+
+아래 JSON 데이터를 "고객 친화적 언어"로 변환하여 상세 보고서를 작성하세요.
+
+[데이터]
+{data}
+
+[출력 형식]
+## 3. 경쟁환경 분석
+
+### 핵심 메시지
+[CEO가 30초 안에 파악할 수 있는 핵심]
+
+### 3.1 산업 경쟁 강도 (Five Forces)
+| 요소 | 강도 | 의미 | 대응 방향 |
+|------|------|------|----------|
+| 신규 진입 위협 | | | |
+| 기존 경쟁 강도 | | | |
+| 대체재 위협 | | | |
+| 공급자 교섭력 | | | |
+| 구매자 교섭력 | | | |
+
+**종합 평가**: [쉬운 설명]
+
+### 3.2 주요 경쟁사 분석
+| 경쟁사 | 강점 | 약점 | 위협 수준 | 대응 전략 |
+|--------|------|------|----------|----------|
+
+### 3.3 경쟁 포지셔닝
+**귀사의 현재 위치**: [설명]
+**목표 포지션**: [설명]
+**이동 전략**: [구체적 방안]
+""",
+
+    'customer': """[분석 유형: 고객 분석]
+
+아래 JSON 데이터를 "고객 친화적 언어"로 변환하여 상세 보고서를 작성하세요.
+
+[데이터]
+{data}
+
+[출력 형식]
+## 4. 고객 분석
+
+### 핵심 메시지
+[CEO가 30초 안에 파악할 수 있는 핵심]
+
+### 4.1 고객 생태계
+**구매자 (Payer)**: [누가 돈을 내는가?]
+**사용자 (User)**: [누가 실제로 사용하는가?]
+**영향자 (Influencer)**: [구매 결정에 영향을 미치는 사람은?]
+
+### 4.2 핵심 고객 세그먼트
+| 세그먼트 | 특성 | 니즈 | 공략 전략 |
+|----------|------|------|----------|
+
+### 4.3 신규 발견 고객
+[새롭게 발견된 잠재 고객에 대한 설명]
+
+### 4.4 고객 확보 전략
+**단기 (3개월)**: [구체적 액션]
+**중기 (6개월)**: [구체적 액션]
+**장기 (1년)**: [구체적 액션]
+""",
+
+    'market': """[분석 유형: 시장 분석]
+
+아래 JSON 데이터를 "고객 친화적 언어"로 변환하여 상세 보고서를 작성하세요.
+
+[데이터]
+{data}
+
+[출력 형식]
+## 5. 시장 분석
+
+### 핵심 메시지
+[CEO가 30초 안에 파악할 수 있는 핵심]
+
+### 5.1 시장 규모
+| 구분 | 규모 | 설명 |
+|------|------|------|
+| TAM (전체 시장) | 억원 | [쉬운 설명] |
+| SAM (접근 가능 시장) | 억원 | [쉬운 설명] |
+| SOM (1년 목표) | 억원 | [쉬운 설명] |
+
+### 5.2 시장 성장성
+**과거 성장률**: [데이터와 설명]
+**향후 전망**: [데이터와 설명]
+**성장 동인**: [핵심 요인 설명]
+
+### 5.3 시장 진입 전략
+**권장 진입 방식**: [구체적 방안]
+**예상 소요 기간**: [기간]
+**필요 투자 규모**: [금액 범위]
+""",
+
+    'diagnosis': """[분석 유형: 경영진단]
+
+아래 JSON 데이터를 "고객 친화적 언어"로 변환하여 상세 보고서를 작성하세요.
+
+[데이터]
+{data}
+
+[출력 형식]
+## 6. 경영진단
+
+### 핵심 메시지
+[CEO가 30초 안에 파악할 수 있는 핵심]
+
+### 6.1 영역별 진단 결과
+| 영역 | 점수 | 상태 | 핵심 이슈 | 개선 방향 |
+|------|------|------|----------|----------|
+| 사회적가치 | /5 | | | |
+| 경영일반 | /5 | | | |
+| 영업마케팅 | /5 | | | |
+| 재무 | /5 | | | |
+| 인사조직 | /5 | | | |
+
+### 6.2 강점 영역 (잘하고 있는 것)
+[구체적 설명과 유지/강화 방안]
+
+### 6.3 개선 필요 영역
+| 우선순위 | 영역 | 이슈 | 개선 방안 | 기대 효과 |
+|----------|------|------|----------|----------|
+
+### 6.4 즉시 실행 과제
+1. [과제명] - 담당: [누구], 기한: [언제]
+2. [과제명] - 담당: [누구], 기한: [언제]
+""",
+
+    'vrio': """[분석 유형: VRIO 분석]
+
+아래 JSON 데이터를 "고객 친화적 언어"로 변환하여 상세 보고서를 작성하세요.
+
+VRIO란?
+- V (Valuable): 가치 있는가?
+- R (Rare): 희소한가?
+- I (Inimitable): 모방하기 어려운가?
+- O (Organized): 조직이 활용하고 있는가?
+
+[데이터]
+{data}
+
+[출력 형식]
+## 7. 핵심 자원 분석 (VRIO)
+
+### 핵심 메시지
+[CEO가 30초 안에 파악할 수 있는 핵심]
+
+### 7.1 보유 자원 현황
+| 자원 | 유형 | V | R | I | O | 경쟁우위 |
+|------|------|---|---|---|---|----------|
+
+### 7.2 지속적 경쟁우위 자원
+[VRIO 모두 충족하는 자원에 대한 상세 설명]
+
+### 7.3 개발 필요 자원
+[부족한 자원과 확보 방안]
+
+### 7.4 자원 투자 우선순위
+| 순위 | 자원 | 현재 상태 | 투자 방향 | 예상 효과 |
+|------|------|----------|----------|----------|
+""",
+
+    'swot': """[분석 유형: SWOT 분석]
+
+아래 JSON 데이터를 "고객 친화적 언어"로 변환하여 상세 보고서를 작성하세요.
+
+[데이터]
+{data}
+
+[출력 형식]
+## 8. SWOT 분석
+
+### 핵심 메시지
+[CEO가 30초 안에 파악할 수 있는 핵심]
+
+### 8.1 SWOT 매트릭스
+
+#### 강점 (Strengths) - 우리가 잘하는 것
+| 항목 | 설명 | 활용 방안 |
+|------|------|----------|
+
+#### 약점 (Weaknesses) - 개선이 필요한 것
+| 항목 | 설명 | 개선 방안 |
+|------|------|----------|
+
+#### 기회 (Opportunities) - 외부의 좋은 변화
+| 항목 | 설명 | 포착 방안 |
+|------|------|----------|
+
+#### 위협 (Threats) - 외부의 나쁜 변화
+| 항목 | 설명 | 대응 방안 |
+|------|------|----------|
+
+### 8.2 핵심 인사이트
+1. [인사이트 1]
+2. [인사이트 2]
+3. [인사이트 3]
+""",
+
+    'tows': """[분석 유형: TOWS 전략]
+
+아래 JSON 데이터를 "고객 친화적 언어"로 변환하여 상세 보고서를 작성하세요.
+
+TOWS란?
+- SO전략: 강점으로 기회를 살린다 (공격)
+- WO전략: 약점을 보완하며 기회를 잡는다 (전환)
+- ST전략: 강점으로 위협을 막는다 (방어)
+- WT전략: 약점과 위협을 최소화한다 (생존)
+
+[데이터]
+{data}
+
+[출력 형식]
+## 9. TOWS 전략
+
+### 핵심 메시지
+[CEO가 30초 안에 파악할 수 있는 핵심]
+
+### 9.1 전략 옵션 매트릭스
+| 유형 | 전략명 | 핵심 가설 | 점수 | 우선순위 |
+|------|--------|----------|------|----------|
+
+### 9.2 최종 선정 전략 TOP 3
+
+#### 🥇 1순위: [전략명]
+**전략 유형**: [SO/WO/ST/WT]
+**핵심 내용**: [쉬운 설명]
+**왜 이 전략인가?**: [선정 근거]
+**실행 방안**:
+- 단기 (3개월): [구체적 액션]
+- 중기 (6개월): [구체적 액션]
+**기대 효과**: [정량적/정성적]
+**필요 자원**: [인력, 예산 등]
+
+#### 🥈 2순위: [전략명]
+[동일 형식]
+
+#### 🥉 3순위: [전략명]
+[동일 형식]
+
+### 9.3 전략 실행 로드맵
+| 단계 | 기간 | 핵심 전략 | 목표 |
+|------|------|----------|------|
+| Phase 1 | 0-6개월 | | |
+| Phase 2 | 6-12개월 | | |
+| Phase 3 | 1-2년 | | |
+
+### 9.4 즉시 실행 과제
+1. **[과제명]** - 담당: [누구], 기한: [언제]
+2. **[과제명]** - 담당: [누구], 기한: [언제]
+""",
+}
+
+DEFAULT_SECTION_PROMPT = "데이터를 분석하여 보고서를 작성하세요.\n\n{data}"
+
+EXECUTIVE_PROMPT = """당신은 15년 경력의 경영 컨설턴트입니다.
+"{business_name}" 대표님께 전체 분석 결과를 1페이지로 요약합니다.
+
+[작성 원칙]
+1. CEO가 3분 안에 핵심을 파악할 수 있도록 작성
+2. 전문용어는 모두 쉬운 말로 변환
+3. 숫자와 구체적 사례 활용
+4. 즉시 실행 가능한 액션 아이템 포함
+
+[분석 데이터 요약]
+{data}
+
+[출력 형식]
+## 경영진 요약 (Executive Summary)
+
+### 1. 핵심 결론 (30초 요약)
+1. [가장 중요한 결론]
+2. [두 번째 중요한 결론]
+3. [세 번째 중요한 결론]
+
+### 2. 외부환경 (기회 vs 위협)
+**주요 기회**: [핵심 기회 요약]
+**주요 위협**: [핵심 위협 요약]
+
+### 3. 내부역량 (강점 vs 약점)
+**핵심 강점**: [강점 요약]
+**핵심 약점**: [약점 요약]
+
+### 4. 전략 방향
+**추천 전략**: [핵심 전략 1-2문장]
+
+| 순위 | 전략 | 유형 | 핵심 근거 |
+|------|------|------|----------|
+| 1 | | | |
+| 2 | | | |
+| 3 | | | |
+
+### 5. 90일 실행 계획
+| 단계 | 기간 | 핵심 과제 | 담당 | 목표 |
+|------|------|----------|------|------|
+| Phase 1 | 0-30일 | | | |
+| Phase 2 | 30-60일 | | | |
+| Phase 3 | 60-90일 | | | |
+
+### 6. 핵심 리스크 및 대응
+| 리스크 | 발생확률 | 영향도 | 예방 조치 |
+|--------|----------|--------|----------|
+"""
+
+def _prompt_digest():
+    """프롬프트 문구 해시 (문구가 바뀌면 이전 변환 캐시 무효화)"""
+    digest = hashlib.sha1()
+    for template in (BASE_INSTRUCTION, DEFAULT_SECTION_PROMPT, EXECUTIVE_PROMPT, *SECTION_PROMPTS.values()):
+        digest.update(template.encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+PROMPT_KEY = f"{PROMPT_VERSION}-{_prompt_digest()}"
+
+def _pretty_json(data):
+    """JSON.stringify(data, null, 2)와 같은 들여쓰기"""
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+def build_section_prompt(section_id, data, business_name):
+    """섹션 프롬프트 (기본 지시문 + 섹션별 출력 형식)"""
+    template = SECTION_PROMPTS.get(section_id, DEFAULT_SECTION_PROMPT)
+    return (BASE_INSTRUCTION.format(business_name=business_name)
+            + template.format(data=_pretty_json(data)))
+
+def build_executive_prompt(handoffs, business_name):
+    """경영진 요약 프롬프트 (핸드오프 전체 JSON 앞부분)"""
+    return EXECUTIVE_PROMPT.format(business_name=business_name,
+                                   data=_pretty_json(handoffs)[:EXECUTIVE_DATA_CHARS])
+
+# ==============================================================================
+# 백엔드
+# ==============================================================================
+class TransformError(Exception):
+    """LLM 호출 실패 (retryable이면 백오프 후 재시도, retry_after는 서버가 알려준 대기 시간)"""
+
+    def __init__(self, message, retryable=False, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+class TransformBackend(abc.ABC):
+    """LLM 백엔드 인터페이스 - generate(prompt)는 마크다운 텍스트, 실패는 TransformError"""
+
+    name = 'base'
+    model = ''
+
+    @abc.abstractmethod
+    async def generate(self, prompt):
+        """프롬프트 → 마크다운 텍스트"""
+
+class GeminiBackend(TransformBackend):
+    """Gemini generateContent (urllib 동기 호출을 스레드에서 실행)"""
+
+    name = 'gemini'
+
+    def __init__(self, api_key=None, model=GEMINI_MODEL, temperature=0.7, max_output_tokens=8192,
+                 timeout=TRANSFORM_TIMEOUT):
+        self.api_key = api_key or os.environ.get('GEMINI_API_KEY')
+        if not self.api_key:
+            raise ValueError("Gemini API 키가 설정되지 않았습니다 (GEMINI_API_KEY)")
+        self.model = model
+        self.temperature = temperature
+        self.max_output_tokens = max_output_tokens
+        self.timeout = timeout
+
+    async def generate(self, prompt):
+        return await asyncio.to_thread(self._call, prompt)
+
+    def _call(self, prompt):
+        payload = {
+            'contents': [{'parts': [{'text': prompt}]}],
+            'generationConfig': {'temperature': self.temperature, 'maxOutputTokens': self.max_output_tokens},
+        }
+        request = urllib.request.Request(
+            GEMINI_URL.format(model=self.model, key=self.api_key),
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read())['error']['message']
+            except (ValueError, KeyError, TypeError):
+                message = e.reason
+            retry_after = e.headers.get('Retry-After')
+            raise TransformError(f"Gemini API 오류 ({e.code}): {message}",
+                                 retryable=e.code == 429 or e.code >= 500,
+                                 retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None)
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            # 연결 끊김(RemoteDisconnected, ConnectionResetError), 타임아웃, 응답 중간 끊김(IncompleteRead)
+            raise TransformError(f"Gemini API 연결 실패: {e}", retryable=True)
+
+        try:
+            result = json.loads(body)
+            if result.get('error'):
+                raise TransformError(f"Gemini API 오류: {result['error'].get('message')}")
+            return result['candidates'][0]['content']['parts'][0]['text']
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+            raise TransformError("Gemini API 응답을 파싱할 수 없습니다.") from None
+
+class StubBackend(TransformBackend):
+    """로컬 백엔드 - 프롬프트로 정해지는 마크다운 (같은 프롬프트면 같은 결과)
+
+    latency: 호출마다 기다리는 시간(초) - 벤치마크에서 LLM 응답 시간 흉내
+    """
+
+    name = 'stub'
+    model = 'stub'
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def generate(self, prompt):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]
+        _, _, output_format = prompt.partition('[출력 형식]')
+        title = next((line for line in output_format.splitlines() if line.startswith('## ')), '## 분석 결과')
+        return (f"{title}\n\n### 핵심 메시지\n"
+                f"- 로컬 변환 결과입니다 (프롬프트 {len(prompt):,}자, `{digest}`)\n")
+
+BACKENDS = {
+    'gemini': GeminiBackend,
+    'stub': StubBackend,
+}
+
+def create_backend(name=None, **kwargs):
+    """이름으로 백엔드 생성 (없는 이름이면 ValueError)"""
+    name = name or TRANSFORM_BACKEND
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 변환 백엔드: {name} (가능: {', '.join(BACKENDS)})") from None
+    return backend_class(**kwargs)
+
+# ==============================================================================
+# 속도 제한 / 재시도
+# ==============================================================================
+class TokenBucket:
+    """초당 rate회, 최대 capacity회까지 몰아서 허용
+
+    토큰을 먼저 예약하고(음수 = 대기열) 모자란 만큼만 잠 - 잠금은 계산에만 쓰므로
+    여러 이벤트 루프/스레드에서 같은 버킷을 공유해도 됨. rate <= 0이면 제한 없음.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """토큰 하나 예약 → 기다려야 하는 시간(초)"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+def backoff_delay(attempt, base=1.0, cap=30.0):
+    """attempt번째 재시도 대기 시간 (지수 증가, 절반~전체 사이 지터)"""
+    delay = min(cap, base * (2 ** attempt))
+    return delay * (0.5 + random.random() / 2)
+
+# ==============================================================================
+# 파이프라인
+# ==============================================================================
+class Transformer:
+    """섹션 변환 + 경영진 요약을 동시에 실행
+
+    Attributes:
+        backend: TransformBackend
+        concurrency: 한 번의 transform_all에서 동시에 진행할 호출 수
+        bucket: 호출 빈도 제한 (서버에서는 프로세스 하나를 공유)
+        attempts: 호출당 최대 시도 횟수
+        timeout: 호출 하나의 제한 시간(초)
+        cache: TransformCache (None이면 매번 변환)
+    """
+
+    def __init__(self, backend, concurrency=TRANSFORM_CONCURRENCY, rate=TRANSFORM_RATE,
+                 attempts=TRANSFORM_ATTEMPTS, timeout=TRANSFORM_TIMEOUT, backoff=1.0, cache=None):
+        self.backend = backend
+        self.cache = cache
+        self.concurrency = max(1, concurrency)
+        self.bucket = TokenBucket(rate)
+        self.attempts = max(1, attempts)
+        self.timeout = timeout
+        self.backoff = backoff
+
+    async def generate(self, prompt, stats=None):
+        """속도 제한 + 재시도를 거친 백엔드 호출"""
+        for attempt in range(self.attempts):
+            await self.bucket.acquire()
+            try:
+                return await asyncio.wait_for(self.backend.generate(prompt), self.timeout)
+            except asyncio.TimeoutError:
+                error = TransformError(f"{self.timeout:g}초 안에 응답이 없습니다", retryable=True)
+            except TransformError as e:
+                error = e
+            except Exception as e:
+                # 백엔드의 예상하지 못한 오류는 재시도하지 않고 이 섹션만 실패로 기록
+                error = TransformError(f"{type(e).__name__}: {e}")
+            if not error.retryable or attempt + 1 == self.attempts:
+                raise error
+            if stats is not None:
+                stats['retries'] += 1
+            await asyncio.sleep(error.retry_after or backoff_delay(attempt, self.backoff))
+
+    async def transform_all(self, handoffs, business_name, sections=None, executive=True, progress=None):
+        """핸드오프 → (transformed, stats)
+
+        Args:
+            handoffs: {단계: 핸드오프}
+            sections: 변환할 섹션 ID (없으면 핸드오프가 있는 섹션 전체)
+            executive: 경영진 요약도 생성할지
+            progress: 진행 콜백 - 섹션(경영진 요약은 'executive')이 끝날 때마다
+                      'transform' {section, status: done/cached/failed, done, total}
+
+        Returns:
+            transformed: {'sections': {ID: {'content', 'generatedAt'} | {'error', 'original'}},
+                          'executiveSummary': 마크다운 또는 None} - Apps Script transformAllWithAI_V4와 같은 형식
+            stats: {'backend', 'model', 'calls', 'cached', 'failed', 'retries', 'elapsed_ms'}
+        """
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        stats = {'backend': self.backend.name, 'model': self.backend.model,
+                 'calls': 0, 'cached': 0, 'failed': 0, 'retries': 0}
+        stored = []
+        steps = [(section_id, handoffs[source]) for section_id, source, _ in TRANSFORM_STEPS
+                 if handoffs.get(source) and (sections is None or section_id in sections)]
+        total = len(steps) + bool(executive)
+        finished = []
+
+        def report(key, status):
+            finished.append(key)
+            if progress is not None:
+                progress('transform', section=key, status=status, done=len(finished), total=total)
+
+        async def run(key, data, prompt):
+            """캐시에 있으면 그대로, 없으면 호출 후 저장 → (마크다운, 생성 시각)"""
+            cache_key = (key, input_digest(data, business_name), PROMPT_KEY, self.backend.model)
+            if self.cache is not None:
+                hit = self.cache.get(*cache_key)
+                if hit is not None:
+                    stats['cached'] += 1
+                    report(key, 'cached')
+                    return hit
+            async with semaphore:
+                stats['calls'] += 1
+                content = await self.generate(prompt, stats)
+            generated_at = datetime.now().isoformat()
+            if self.cache is not None:
+                self.cache.put(*cache_key, content, generated_at)
+                stored.append(key)
+            report(key, 'done')
+            return content, generated_at
+
+        async def section(section_id, data):
+            try:
+                content, generated_at = await run(
+                    section_id, data, build_section_prompt(section_id, data, business_name))
+                return {'content': content, 'generatedAt': generated_at}
+            except TransformError as e:
+                print(f"AI 변환 실패 ({section_id}): {e}")
+                stats['failed'] += 1
+                report(section_id, 'failed')
+                return {'error': str(e), 'original': data}
+
+        async def executive_summary():
+            try:
+                content, _ = await run('executive', handoffs, build_executive_prompt(handoffs, business_name))
+                return content
+            except TransformError as e:
+                print(f"경영진 요약 생성 실패: {e}")
+                stats['failed'] += 1
+                report('executive', 'failed')
+                return None
+
+        tasks = [section(section_id, data) for section_id, data in steps]
+        if executive:
+            tasks.append(executive_summary())
+        results = await asyncio.gather(*tasks)
+        if stored:
+            self.cache.prune()
+
+        transformed = {
+            'sections': {section_id: result for (section_id, _), result in zip(steps, results)},
+            'executiveSummary': results[-1] if executive else None,
+        }
+        stats['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return transformed, stats
+
+# 서버 프로세스당 하나 (속도 제한을 요청 간에 공유)
+_transformer = None
+_transformer_lock = threading.Lock()
+
+def get_transformer():
+    """설정(GIMPACT_TRANSFORM_*)으로 만든 Transformer (백엔드 설정이 잘못되면 ValueError)"""
+    global _transformer
+    with _transformer_lock:
+        if _transformer is None:
+            _transformer = Transformer(create_backend(), cache=get_transform_cache())
+        return _transformer
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='G-IMPACT AI 변환 (서버 측 파이프라인)')
+    parser.add_argument('input', help='핸드오프 JSON 또는 /generate 요청 본문')
+    parser.add_argument('--backend', default=TRANSFORM_BACKEND, choices=sorted(BACKENDS))
+    parser.add_argument('--business-name', help='기업명 (없으면 요청 본문 meta.business_name)')
+    parser.add_argument('--concurrency', type=int, default=TRANSFORM_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=TRANSFORM_RATE, help='초당 호출 수 (0 = 제한 없음)')
+    parser.add_argument('--no-cache', action='store_true', help='변환 캐시를 쓰지 않음')
+    parser.add_argument('--out', help='결과 JSON 파일 (없으면 표준 출력)')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        body = json.load(f)
+    handoffs = body.get('handoffs', body)
+    business_name = args.business_name or (body.get('meta') or {}).get('business_name') or '기업'
+
+    transformer = Transformer(create_backend(args.backend), concurrency=args.concurrency, rate=args.rate,
+                              cache=None if args.no_cache else get_transform_cache())
+    transformed, stats = asyncio.run(transformer.transform_all(handoffs, business_name))
+    text = json.dumps(transformed, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"변환 완료: {args.out}")
+    else:
+        print(text)
+    print(f"섹션 {len(transformed['sections'])}개, 호출 {stats['calls']}회 (캐시 {stats['cached']}, "
+          f"실패 {stats['failed']}, 재시도 {stats['retries']}), {stats['elapsed_ms']}ms")
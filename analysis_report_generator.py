@@ -10,9 +10,14 @@ Analysis Report Generator (2.1~3.4 단계)
 3. 단계별 상세 리포트 (2.1~3.4)
 """
 
+import functools
+import importlib
 import json
 import os
-from datetime import datetime
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime
 from io import BytesIO
 
 # ReportLab imports
@@ -23,19 +28,69 @@ from reportlab.lib.units import mm, cm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, 
-    PageBreak, Image, KeepTogether, HRFlowable, ListFlowable, ListItem
+    PageBreak, Image, KeepTogether, HRFlowable, ListFlowable, ListItem, Flowable
 )
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.fonts import addMapping
 
+from font_cache import register_font, setup_matplotlib_font
+from report_sections import DETAIL_SECTIONS, REPORT_SECTIONS, SUMMARY_SECTIONS, select_sections
+from handoff_models import average_impact, format_number, parse_handoffs
+
+# 지연 초기화 모드 (GIMPACT_LAZY_INIT=1)
+# matplotlib/numpy 임포트와 폰트 등록을 첫 사용 시점으로 미룸 - scale-to-zero 콜드 스타트용
+LAZY_INIT = os.environ.get('GIMPACT_LAZY_INIT', '0') == '1'
+
+# 섹션 조각 캐시 (GIMPACT_FRAGMENT_CACHE=1이면 켬, 기본은 매번 전체 레이아웃)
+# 상세 섹션별 PDF 조각을 입력 해시로 캐시하고 이어 붙임 - report_fragments.py
+# 조각마다 폰트 서브셋이 따로 들어가 결과 PDF가 전체 레이아웃보다 2배 넘게 커짐 - 렌더링 시간이 더 중요할 때만 사용
+FRAGMENT_CACHE = os.environ.get('GIMPACT_FRAGMENT_CACHE', '0') == '1'
+
+# 상세 섹션 동시 렌더링 프로세스 수 (GIMPACT_RENDER_WORKERS, 0/1이면 순서대로)
+RENDER_WORKERS = int(os.environ.get('GIMPACT_RENDER_WORKERS', '0'))
+
+# 표지/푸터의 생성일 표기
+REPORT_DATE_FORMAT = '%Y년 %m월 %d일'
+
+def format_report_date(report_date=None):
+    """생성일 문자열 - report_date(date 또는 'YYYY-MM-DD')가 없으면 오늘"""
+    if report_date is None:
+        return datetime.now().strftime(REPORT_DATE_FORMAT)
+    if isinstance(report_date, str):
+        report_date = date.fromisoformat(report_date)
+    return report_date.strftime(REPORT_DATE_FORMAT)
+
+class _LazyModule:
+    """첫 속성 접근 시 loader를 호출해 모듈을 불러오는 프록시"""
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = self._loader()
+        return getattr(self._module, attr)
+
+def _load_pyplot():
+    """Matplotlib (Agg 백엔드) 임포트 후 차트 폰트 설정"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as pyplot
+    setup_chart_fonts(pyplot)
+    return pyplot
+
 # Matplotlib for charts
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import numpy as np
+if LAZY_INIT:
+    plt = _LazyModule(_load_pyplot)
+    np = _LazyModule(lambda: importlib.import_module('numpy'))
+else:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import numpy as np
 
 # ==============================================================================
 # 색상 테마
@@ -71,28 +126,41 @@ COLORS = {
 # ==============================================================================
 # 폰트 설정
 # ==============================================================================
-def setup_fonts():
-    """한글 폰트 설정"""
-    font_path = '/usr/share/fonts/truetype/nanum/NanumGothic.ttf'
-    bold_path = '/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf'
+FONT_PATH = '/usr/share/fonts/truetype/nanum/NanumGothic.ttf'
+BOLD_PATH = '/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf'
+
+_pdf_fonts_ready = False
+
+def setup_pdf_fonts():
+    """ReportLab 한글 폰트 등록 (프로세스당 한 번)"""
+    global _pdf_fonts_ready
+    if _pdf_fonts_ready:
+        return
+    _pdf_fonts_ready = True
     
     try:
-        pdfmetrics.registerFont(TTFont('NanumGothic', font_path))
-        pdfmetrics.registerFont(TTFont('NanumGothicBold', bold_path))
+        # 파싱 결과는 디스크 캐시에서 로드, 프로세스당 한 번만 등록
+        register_font('NanumGothic', FONT_PATH)
+        register_font('NanumGothicBold', BOLD_PATH)
         addMapping('NanumGothic', 0, 0, 'NanumGothic')
         addMapping('NanumGothic', 1, 0, 'NanumGothicBold')
         addMapping('NanumGothic', 0, 1, 'NanumGothic')
         addMapping('NanumGothic', 1, 1, 'NanumGothicBold')
     except Exception as e:
         print(f"폰트 등록 오류: {e}")
-    
-    # Matplotlib 폰트
-    fm.fontManager.addfont(font_path)
-    prop = fm.FontProperties(fname=font_path)
-    plt.rcParams['font.family'] = prop.get_name()
-    plt.rcParams['axes.unicode_minus'] = False
 
-setup_fonts()
+def setup_chart_fonts(pyplot):
+    """Matplotlib 한글 폰트 설정 (캐시된 폰트 매니저에 없을 때만 추가 후 캐시 저장)"""
+    pyplot.rcParams['font.family'] = setup_matplotlib_font(FONT_PATH)
+    pyplot.rcParams['axes.unicode_minus'] = False
+
+def setup_fonts():
+    """한글 폰트 설정"""
+    setup_pdf_fonts()
+    setup_chart_fonts(plt)
+
+if not LAZY_INIT:
+    setup_fonts()
 
 FONT = 'NanumGothic'
 FONT_BOLD = 'NanumGothicBold'
@@ -119,11 +187,100 @@ def create_styles():
                               textColor=COLORS['medium'], alignment=TA_CENTER, spaceAfter=8))
     styles.add(ParagraphStyle('KBullet', fontName=FONT, fontSize=10, leading=14,
                               textColor=COLORS['dark'], leftIndent=15, spaceAfter=3))
+    # 섹션 전용 스타일
+    styles.add(ParagraphStyle('BoxStyle', fontName=FONT, fontSize=10, leading=14,
+                              textColor=COLORS['dark']))
+    styles.add(ParagraphStyle('TOCTitle', fontName=FONT_BOLD, fontSize=20,
+                              alignment=TA_CENTER, textColor=COLORS['primary'], spaceAfter=25))
+    styles.add(ParagraphStyle('OnepageTitle', fontName=FONT_BOLD, fontSize=16,
+                              alignment=TA_CENTER, textColor=COLORS['primary'], spaceAfter=10))
+    styles.add(ParagraphStyle('SWOTCell', fontName=FONT, fontSize=9, leading=12))
     return styles
 
+_shared_styles = None
+
+def get_styles():
+    """프로세스 공용 스타일시트 (처음 한 번만 생성, 공유 객체이므로 수정 금지)"""
+    global _shared_styles
+    if _shared_styles is None:
+        _shared_styles = create_styles()
+    return _shared_styles
+
+# ==============================================================================
+# 구간 시간 측정 (Server-Timing)
+# ==============================================================================
+class RenderTimings:
+    """렌더링 구간별 누적 시간 {이름: [초, 횟수]} - 같은 이름은 합산
+
+    이름: build.<섹션 키>, build.toc, chart.<차트>, doc.build, stitch
+    (차트는 섹션 빌드 안에서 그려지므로 build.* 구간과 겹침)
+    """
+
+    def __init__(self):
+        self.spans = {}
+
+    def add(self, name, seconds, count=1):
+        span = self.spans.setdefault(name, [0.0, 0])
+        span[0] += seconds
+        span[1] += count
+
+    @contextmanager
+    def span(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def merge(self, spans):
+        """다른 측정 결과({이름: [초, 횟수]}, 워커 프로세스의 조각 렌더링 등) 합산"""
+        for name, (seconds, count) in spans.items():
+            self.add(name, seconds, count)
+
+    def as_dict(self):
+        """{이름: {'ms', 'count'}} (시간이 긴 순서)"""
+        return {name: {'ms': round(seconds * 1000, 1), 'count': count}
+                for name, (seconds, count) in sorted(self.spans.items(), key=lambda item: -item[1][0])}
+
+# 현재 렌더링의 측정기 (collect_timings 안에서만 기록 - 밖에서는 구간마다 조회 한 번)
+_active_timings = ContextVar('gimpact_render_timings', default=None)
+
+@contextmanager
+def collect_timings(timings):
+    """이 블록 안의 렌더링 구간을 timings(RenderTimings)에 기록"""
+    token = _active_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _active_timings.reset(token)
+
+def current_timings():
+    return _active_timings.get()
+
+@contextmanager
+def timing_span(name):
+    """측정 중이면 구간 시간 기록"""
+    timings = _active_timings.get()
+    if timings is None:
+        yield
+        return
+    with timings.span(name):
+        yield
+
+def timed(name):
+    """함수 호출을 구간으로 기록하는 데코레이터"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timing_span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
 # ==============================================================================
 # 차트 생성 함수
 # ==============================================================================
+@timed('chart.horizontal_bar')
 def create_horizontal_bar_chart(data, labels, title, max_val=5, width=400, height=220):
     """수평 막대 차트"""
     fig, ax = plt.subplots(figsize=(width/100, height/100), dpi=100)
@@ -154,13 +311,23 @@ def create_horizontal_bar_chart(data, labels, title, max_val=5, width=400, heigh
     buf.seek(0)
     return buf
 
-def create_diagnosis_radar_only(scores_dict, width=280, height=280):
-    """레이더 차트만 생성 (테이블은 reportlab으로 별도 생성)"""
+def _cohort_label(short, area, benchmark):
+    """레이더 영역 라벨 + 코호트 위치 ('상위 N%', 비교 대상이 일부면 'n/전체')"""
+    label = f'{short}\n상위 {benchmark.top_percent(area)}%'
+    count = benchmark.counts.get(area, benchmark.size)
+    return label if count == benchmark.size else f'{label} ({count}/{benchmark.size})'
+
+@timed('chart.diagnosis_radar')
+def create_diagnosis_radar_only(scores, width=280, height=280, benchmark=None):
+    """레이더 차트만 생성 (테이블은 reportlab으로 별도 생성, scores: AreaScore 목록)
+
+    benchmark: cohort.CohortBenchmark - 코호트 중앙값(점선)과 영역별 '상위 N%' 표시
+    """
     
     fig, ax = plt.subplots(figsize=(width/100, height/100), subplot_kw=dict(polar=True), dpi=100)
     
-    labels = list(scores_dict.keys())
-    values = [float(scores_dict[k].get('score', 0)) for k in labels]
+    labels = [s.area for s in scores]
+    values = [s.score for s in scores]
     
     # 짧은 라벨
     short_labels = []
@@ -176,6 +343,12 @@ def create_diagnosis_radar_only(scores_dict, width=280, height=280):
         else:
             short_labels.append(l)
     
+    # 코호트 위치는 영역 라벨 아래에 (점수 라벨과 겹치지 않도록)
+    # 점수가 없는 기업이 있는 영역은 비교 대상 수를 함께 표시 (백분위는 그 기업들 기준)
+    if benchmark:
+        short_labels = [_cohort_label(short, l, benchmark) if l in benchmark.percentiles else short
+                        for short, l in zip(short_labels, labels)]
+    
     N = len(labels)
     angles = [n / float(N) * 2 * np.pi for n in range(N)]
     angles += angles[:1]
@@ -190,6 +363,13 @@ def create_diagnosis_radar_only(scores_dict, width=280, height=280):
     ax.plot(angles, values_plot, color='#2563EB', linewidth=2)
     ax.scatter(angles[:-1], values, color='#1E40AF', s=50, zorder=5)
     
+    # 코호트 중앙값 (점선)
+    if benchmark:
+        medians = [benchmark.medians.get(l, 0) for l in labels]
+        ax.plot(angles, medians + medians[:1], color='#6B7280', linewidth=1.2, linestyle='--',
+                label=f'코호트 중앙값 ({benchmark.size}개사)')
+        ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.2), fontsize=7, frameon=False)
+    
     # 점수 값 표시
     for angle, val in zip(angles[:-1], values):
         # 값 위치 조정 (바깥쪽으로)
@@ -211,13 +391,14 @@ def create_diagnosis_radar_only(scores_dict, width=280, height=280):
     buf.seek(0)
     return buf
 
-def create_score_horizontal_bar(scores_dict, width=380, height=140):
-    """수평 막대 점수 차트 - 1PAGE 요약용"""
+@timed('chart.score_bar')
+def create_score_horizontal_bar(scores, width=380, height=140):
+    """수평 막대 점수 차트 - 1PAGE 요약용 (scores: AreaScore 목록)"""
     fig, ax = plt.subplots(figsize=(width/100, height/100), dpi=100)
     
     # 데이터 준비
-    labels = list(scores_dict.keys())
-    values = [float(scores_dict[k].get('score', 0)) for k in labels]
+    labels = [s.area for s in scores]
+    values = [s.score for s in scores]
     
     # 짧은 라벨
     short_labels = []
@@ -294,10 +475,12 @@ def create_score_horizontal_bar(scores_dict, width=380, height=140):
     return buf
 
 # 호환성을 위해 기존 함수명 유지
-def create_diagnosis_combo_chart(scores_dict, width=280, height=280):
+@timed('chart.diagnosis_combo')
+def create_diagnosis_combo_chart(scores, width=280, height=280):
     """레이더 차트 생성 (테이블은 별도)"""
-    return create_diagnosis_radar_only(scores_dict, width, height)
+    return create_diagnosis_radar_only(scores, width, height)
 
+@timed('chart.market_circles')
 def create_concentric_market_chart(tam, sam, som, width=350, height=350):
     """동심원 버블 차트 - 시장 규모 (완전한 정원 보장)"""
     # 정사각형 figure 생성
@@ -359,6 +542,7 @@ def create_concentric_market_chart(tam, sam, som, width=350, height=350):
     buf.seek(0)
     return buf
 
+@timed('chart.radar')
 def create_radar_chart(categories, values, title, max_val=5, width=320, height=320):
     """레이더 차트"""
     N = len(categories)
@@ -381,6 +565,7 @@ def create_radar_chart(categories, values, title, max_val=5, width=320, height=3
     buf.seek(0)
     return buf
 
+@timed('chart.scenario_matrix')
 def create_scenario_matrix(scenarios, width=400, height=320):
     """시나리오 2x2 매트릭스"""
     fig, ax = plt.subplots(figsize=(width/100, height/100), dpi=100)
@@ -397,9 +582,9 @@ def create_scenario_matrix(scenarios, width=400, height=320):
     positions = {'++': (0.5, 0.5), '-+': (-0.5, 0.5), '--': (-0.5, -0.5), '+-': (0.5, -0.5)}
     
     for s in scenarios:
-        quadrant = s.get('quadrant', '++')
-        name = s.get('name', '')
-        prob = s.get('probability', '')
+        quadrant = s.quadrant
+        name = s.name
+        prob = s.probability
         if quadrant in positions:
             x, y = positions[quadrant]
             ax.scatter(x, y, s=300, c='#1E40AF', zorder=5, edgecolors='white', linewidth=2)
@@ -419,6 +604,7 @@ def create_scenario_matrix(scenarios, width=400, height=320):
     buf.seek(0)
     return buf
 
+@timed('chart.scenario_probability')
 def create_scenario_probability_chart(scenarios, width=280, height=200):
     """시나리오 확률 도넛 차트"""
     fig, ax = plt.subplots(figsize=(width/100, height/100), dpi=100)
@@ -431,15 +617,11 @@ def create_scenario_probability_chart(scenarios, width=280, height=200):
     color_map = {q: c for q, c in zip(quadrant_order, colors_list)}
     
     for s in scenarios:
-        names.append(s.get('name', '')[:8])
-        prob_str = s.get('probability', '0%').replace('%', '')
-        try:
-            probs.append(float(prob_str))
-        except:
-            probs.append(0)
+        names.append(s.name[:8])
+        probs.append(s.probability_pct)
     
     # 색상 매핑
-    chart_colors = [color_map.get(s.get('quadrant', '++'), '#6B7280') for s in scenarios]
+    chart_colors = [color_map.get(s.quadrant, '#6B7280') for s in scenarios]
     
     # 도넛 차트
     wedges, texts, autotexts = ax.pie(probs, labels=names, colors=chart_colors,
@@ -460,6 +642,7 @@ def create_scenario_probability_chart(scenarios, width=280, height=200):
     buf.seek(0)
     return buf
 
+@timed('chart.strategy_roadmap')
 def create_strategy_roadmap(strategies, width=480, height=180):
     """전략 로드맵 - 간트 차트 스타일"""
     fig, ax = plt.subplots(figsize=(width/80, height/80), dpi=120)
@@ -567,19 +750,15 @@ def create_strategy_roadmap(strategies, width=480, height=180):
     buf.seek(0)
     return buf
 
-def create_five_forces_chart(forces_data, width=400, height=300):
-    """Five Forces 차트 - 라벨 개선"""
+@timed('chart.five_forces')
+def create_five_forces_chart(forces, width=400, height=300):
+    """Five Forces 차트 - 라벨 개선 (forces: FiveForces)"""
     labels = ['신규진입', '경쟁강도', '대체재', '공급자', '구매자']
-    values = [
-        forces_data.get('new_entrants', {}).get('score', 0),
-        forces_data.get('rivalry', {}).get('score', 0),
-        forces_data.get('substitutes', {}).get('score', 0),
-        forces_data.get('supplier_power', {}).get('score', 0),
-        forces_data.get('buyer_power', {}).get('score', 0),
-    ]
+    values = forces.scores()
     
     return create_radar_chart(labels, values, 'Five Forces 분석', max_val=5, width=width, height=height)
 
+@timed('chart.market_funnel')
 def create_market_funnel(tam, sam, som, width=350, height=250):
     """시장 규모 퍼널 차트"""
     fig, ax = plt.subplots(figsize=(width/100, height/100), dpi=100)
@@ -618,6 +797,13 @@ def styled_table(data, col_widths=None, header_color=None):
         header_color = COLORS['primary']
     
     table = Table(data, colWidths=col_widths)
+    table.setStyle(get_table_style('styled', header_color, len(data)))
+    return table
+
+# ==============================================================================
+# 테이블 스타일 레지스트리
+# ==============================================================================
+def _styled_table_commands(header_color, n_rows):
     style = [
         ('BACKGROUND', (0, 0), (-1, 0), header_color),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
@@ -632,21 +818,187 @@ def styled_table(data, col_widths=None, header_color=None):
         ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
     ]
     # 교대 행 색상
-    for i in range(1, len(data)):
+    for i in range(1, n_rows):
         if i % 2 == 0:
             style.append(('BACKGROUND', (0, i), (-1, i), COLORS['light']))
-    
-    table.setStyle(TableStyle(style))
-    return table
+    return style
+
+def _highlight_box_commands(color):
+    return [
+        ('BACKGROUND', (0, 0), (-1, -1), color),
+        ('BOX', (0, 0), (-1, -1), 1, COLORS['primary']),
+        ('LEFTPADDING', (0, 0), (-1, -1), 12),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+    ]
+
+def _toc_commands():
+    return [
+        ('FONTNAME', (0, 0), (-1, -1), FONT),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('FONTNAME', (0, 0), (0, -1), FONT_BOLD),
+        ('TEXTCOLOR', (0, 0), (0, -1), COLORS['primary']),
+        ('TEXTCOLOR', (1, 0), (1, -1), COLORS['gray']),
+        ('TEXTCOLOR', (2, 0), (2, -1), COLORS['dark']),
+        ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('LINEBELOW', (0, 0), (-1, -2), 0.5, colors.HexColor('#E5E7EB')),
+    ]
+
+def _action_table_commands():
+    return [
+        ('FONTNAME', (0, 0), (-1, -1), FONT),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
+        ('BACKGROUND', (0, 0), (-1, 0), COLORS['warning']),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
+        ('ROWHEIGHT', (0, 0), (-1, -1), 18),
+    ]
+
+def _pestel_summary_commands():
+    return [
+        ('FONTNAME', (0, 0), (-1, -1), FONT),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#7C3AED')),  # 보라색
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('BACKGROUND', (1, 1), (1, -1), colors.HexColor('#ECFDF5')),  # 기회 - 연초록
+        ('BACKGROUND', (2, 1), (2, -1), colors.HexColor('#FEF2F2')),  # 위협 - 연빨강
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
+        ('ROWHEIGHT', (0, 0), (-1, -1), 20),
+    ]
+
+def _scenario_two_col_commands():
+    return [
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+        ('ALIGN', (1, 0), (1, 0), 'CENTER'),
+    ]
+
+def _vrio_commands(v_ok, r_ok, i_ok, o_ok):
+    """요소별 충족 비율(60% 이상 여부)에 따라 비율 셀 배경색"""
+    ok_color = colors.HexColor('#ECFDF5')
+    low_color = colors.HexColor('#FEF2F2')
+    return [
+        ('FONTNAME', (0, 0), (-1, -1), FONT),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
+        ('BACKGROUND', (0, 0), (-1, 0), COLORS['vrio']),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
+        ('ROWHEIGHT', (0, 0), (-1, -1), 22),
+        # 비율에 따라 배경색
+        ('BACKGROUND', (3, 1), (3, 1), ok_color if v_ok else low_color),
+        ('BACKGROUND', (3, 2), (3, 2), ok_color if r_ok else low_color),
+        ('BACKGROUND', (3, 3), (3, 3), ok_color if i_ok else low_color),
+        ('BACKGROUND', (3, 4), (3, 4), ok_color if o_ok else low_color),
+    ]
+
+def _swot_matrix_commands():
+    return [
+        # 헤더
+        ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
+        ('FONTNAME', (0, 0), (0, -1), FONT_BOLD),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 0), (0, -1), 9),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#F3F4F6')),
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F3F4F6')),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        # 셀 색상
+        ('BACKGROUND', (1, 1), (1, 1), colors.HexColor('#ECFDF5')),  # S - 연초록
+        ('BACKGROUND', (2, 1), (2, 1), colors.HexColor('#FEF2F2')),  # W - 연빨강
+        ('BACKGROUND', (1, 2), (1, 2), colors.HexColor('#EFF6FF')),  # O - 연파랑
+        ('BACKGROUND', (2, 2), (2, 2), colors.HexColor('#FFFBEB')),  # T - 연노랑
+        # 테두리
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#D1D5DB')),
+        ('BOX', (0, 0), (-1, -1), 2, COLORS['primary']),
+        # 패딩
+        ('LEFTPADDING', (1, 1), (-1, -1), 10),
+        ('RIGHTPADDING', (1, 1), (-1, -1), 10),
+        ('TOPPADDING', (1, 1), (-1, -1), 10),
+        ('BOTTOMPADDING', (1, 1), (-1, -1), 10),
+    ]
+
+def _swot_stats_commands():
+    return [
+        ('FONTNAME', (0, 0), (-1, -1), FONT),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
+        ('BACKGROUND', (0, 0), (-1, 0), COLORS['swot']),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('BACKGROUND', (0, 1), (0, 1), colors.HexColor('#ECFDF5')),  # S
+        ('BACKGROUND', (0, 2), (0, 2), colors.HexColor('#FEF2F2')),  # W
+        ('BACKGROUND', (0, 3), (0, 3), colors.HexColor('#EFF6FF')),  # O
+        ('BACKGROUND', (0, 4), (0, 4), colors.HexColor('#FFFBEB')),  # T
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
+        ('ROWHEIGHT', (0, 0), (-1, -1), 22),
+    ]
+
+def _markdown_table_commands(n_rows, has_header):
+    """마크다운 표 (셀은 Paragraph - 글꼴/색은 셀 스타일에서 지정)"""
+    style = [
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+    ]
+    first_body = 1 if has_header else 0
+    if has_header:
+        style.append(('BACKGROUND', (0, 0), (-1, 0), COLORS['primary']))
+    # 교대 행 색상
+    for i in range(first_body + 1, n_rows, 2):
+        style.append(('BACKGROUND', (0, i), (-1, i), COLORS['light']))
+    return style
+
+TABLE_STYLES = {
+    'styled': _styled_table_commands,
+    'highlight_box': _highlight_box_commands,
+    'toc': _toc_commands,
+    'action': _action_table_commands,
+    'pestel_summary': _pestel_summary_commands,
+    'scenario_two_col': _scenario_two_col_commands,
+    'vrio': _vrio_commands,
+    'swot_matrix': _swot_matrix_commands,
+    'swot_stats': _swot_stats_commands,
+    'markdown': _markdown_table_commands,
+}
+
+_table_style_cache = {}
+
+def get_table_style(name, *params):
+    """이름/파라미터별 TableStyle (프로세스 공용, 공유 객체이므로 수정 금지)"""
+    key = (name, params)
+    style = _table_style_cache.get(key)
+    if style is None:
+        style = _table_style_cache[key] = TableStyle(TABLE_STYLES[name](*params))
+    return style
 
 # ==============================================================================
 # 페이지 템플릿
 # ==============================================================================
+# 본문 페이지 공통 헤더/푸터 폼 XObject 이름 (문서마다 한 번 정의)
+PAGE_BAND_FORM = 'GImpactPageBand'
+
 class ReportTemplate:
-    def __init__(self, company_name, report_date):
+    def __init__(self, company_name, report_date, number_pages=True, scope="2.1 PESTEL ~ 3.4 TOWS",
+                 title="분석 리포트"):
         self.company_name = company_name
         self.report_date = report_date
+        self.title = title  # 표지 제목 / 헤더 (상세 보고서는 "상세 보고서")
+        self.scope = scope  # 표지의 분석 범위 (섹션 선택 시 선택한 섹션)
         self.page_num = 0
+        # 섹션 조각(fragment)은 번호 없이 그리고, 이어 붙인 뒤 번호를 찍음
+        self.number_pages = number_pages
     
     def cover_page(self, canvas, doc):
         """표지 - 프리미엄 디자인"""
@@ -678,7 +1030,7 @@ class ReportTemplate:
         # 메인 제목 영역
         canvas.setFillColor(colors.white)
         canvas.setFont(FONT_BOLD, 38)
-        canvas.drawCentredString(w/2, h - 55*mm, "분석 리포트")
+        canvas.drawCentredString(w/2, h - 55*mm, self.title)
         
         # 부제목
         canvas.setFont(FONT, 14)
@@ -715,7 +1067,7 @@ class ReportTemplate:
         canvas.setFont(FONT, 10)
         canvas.setFillColor(COLORS['medium'])
         canvas.drawCentredString(w/2, 58*mm, f"생성일: {self.report_date}")
-        canvas.drawCentredString(w/2, 46*mm, "분석 범위: 2.1 PESTEL ~ 3.4 TOWS")
+        canvas.drawCentredString(w/2, 46*mm, f"분석 범위: {self.scope}")
         canvas.drawCentredString(w/2, 34*mm, "버전: 3.0")
         
         # 하단 브랜딩 바
@@ -732,7 +1084,28 @@ class ReportTemplate:
         self.header_footer(canvas, doc)
     
     def header_footer(self, canvas, doc):
-        """헤더/푸터"""
+        """헤더/푸터
+        
+        고정 부분(헤더 띠, 회사명, 날짜)은 문서당 한 번 폼 XObject로 정의하고
+        페이지마다 참조만 함 - 페이지별로 그리는 것은 페이지 번호뿐
+        """
+        if not canvas.hasForm(PAGE_BAND_FORM):
+            canvas.beginForm(PAGE_BAND_FORM)
+            self.draw_page_band(canvas)
+            canvas.endForm()
+        canvas.doForm(PAGE_BAND_FORM)
+        
+        # 푸터 페이지 번호
+        if self.number_pages:
+            self.page_num += 1
+            canvas.saveState()
+            canvas.setFillColor(COLORS['medium'])
+            canvas.setFont(FONT, 8)
+            self.draw_page_number(canvas, self.page_num)
+            canvas.restoreState()
+    
+    def draw_page_band(self, canvas):
+        """헤더 띠와 푸터 날짜 (모든 본문 페이지에 공통)"""
         canvas.saveState()
         w, h = A4
         
@@ -742,34 +1115,157 @@ class ReportTemplate:
         
         canvas.setFillColor(colors.white)
         canvas.setFont(FONT_BOLD, 10)
-        canvas.drawString(15*mm, h - 12*mm, f"{self.company_name} 분석 리포트")
+        canvas.drawString(15*mm, h - 12*mm, f"{self.company_name} {self.title}")
         canvas.setFont(FONT, 9)
         canvas.drawRightString(w - 15*mm, h - 12*mm, "G-IMPACT Analysis Report")
         
         # 푸터
-        self.page_num += 1
         canvas.setFillColor(COLORS['medium'])
         canvas.setFont(FONT, 8)
-        canvas.drawCentredString(w/2, 10*mm, f"- {self.page_num} -")
         canvas.drawString(15*mm, 10*mm, self.report_date)
         
         canvas.restoreState()
+    
+    @staticmethod
+    def draw_page_number(canvas, page_num):
+        """푸터 페이지 번호 (글꼴/색은 호출 측에서 설정)"""
+        canvas.drawCentredString(A4[0]/2, 10*mm, f"- {page_num} -")
+
+# ==============================================================================
+# 목차 페이지 번호 (단일 패스)
+# ==============================================================================
+TOC_FONT_SIZE = 11
+TOC_LEADING = 12  # 목차 테이블 셀 기본 leading (FONTSIZE만 지정)
+TOC_NUMBER_WIDTH = 40  # 번호 칸 너비 (번호는 칸 오른쪽 끝에 맞춤)
+
+def toc_form_name(key):
+    return f"TOCPage_{key}"
+
+class TOCPageNumber(Flowable):
+    """목차 페이지 번호 자리
+
+    번호는 빌드가 끝난 뒤 ReportDocTemplate이 폼 XObject로 채우므로
+    레이아웃을 다시 돌리지 않고도 실제 시작 페이지가 들어감
+    """
+
+    def __init__(self, key, width=TOC_NUMBER_WIDTH):
+        Flowable.__init__(self)
+        self.key = key
+        self.width = width
+        self.height = TOC_LEADING
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        toc_refs = getattr(self._doctemplate, 'toc_refs', None)
+        if toc_refs is None:
+            # ReportDocTemplate 밖에서 빌드된 경우 번호 없이 표시
+            self.canv.setFont(FONT, TOC_FONT_SIZE)
+            self.canv.drawRightString(self.width, TOC_LEADING - TOC_FONT_SIZE, '-')
+            return
+        toc_refs.add(self.key)
+        self.canv.doForm(toc_form_name(self.key))
+
+class ReportDocTemplate(SimpleDocTemplate):
+    """afterFlowable로 섹션 시작 페이지를 기록하고, 빌드 후 목차 번호 폼을 채우는 문서
+
+    페이지는 푸터 번호 기준 (물리 페이지 - 번호 없는 앞 페이지 수 page_offset, 표지가 있으면 1)
+    progress: 진행 콜백 progress(event, **fields) - 섹션 제목이 배치되면 'layout' {section, page}
+    """
+
+    def __init__(self, *args, progress=None, page_offset=1, **kwargs):
+        SimpleDocTemplate.__init__(self, *args, **kwargs)
+        self.progress = progress
+        self.page_offset = page_offset
+        self.toc_pages = {}
+        self.toc_refs = set()
+        # 이 문서 뒤에 이어 붙일 섹션 조각의 제목 위치 (키 → 이어 붙인 부분 기준 페이지, 1부터)
+        self.appended_toc = {}
+
+    @property
+    def last_number(self):
+        """지금까지의 마지막 푸터 번호"""
+        return self.page - self.page_offset
+
+    def afterFlowable(self, flowable):
+        key = getattr(flowable, 'toc_key', None)
+        if key is not None and key not in self.toc_pages:
+            self.toc_pages[key] = self.last_number
+            if self.progress is not None:
+                self.progress('layout', section=key, page=self.last_number)
+
+    def build(self, flowables, **kwargs):
+        self._doSave = 0  # 목차 폼을 정의한 뒤 직접 저장
+        SimpleDocTemplate.build(self, flowables, **kwargs)
+        self._fill_toc_forms()
+        self.canv.save()
+
+    def _fill_toc_forms(self):
+        """참조된 목차 번호 폼 정의 (원점 = 번호 칸 왼쪽 끝, 칸 오른쪽에 맞춰 정렬)
+
+        폼 BBox는 페이지 영역(0 이상)이므로 글자는 원점 오른쪽에 그려야 잘리지 않음
+        """
+        canv = self.canv
+        for key in sorted(self.toc_refs):
+            page = self.toc_pages.get(key)
+            if page is None and key in self.appended_toc:
+                page = self.last_number + self.appended_toc[key]
+            canv.beginForm(toc_form_name(key))
+            canv.setFont(FONT, TOC_FONT_SIZE)
+            canv.setFillColor(COLORS['dark'])
+            canv.drawRightString(TOC_NUMBER_WIDTH, TOC_LEADING - TOC_FONT_SIZE, str(page) if page else '-')
+            canv.endForm()
+
+# ==============================================================================
+# 섹션 레지스트리 (report_sections.py)
+# ==============================================================================
+def describe_scope(keys):
+    """표지의 분석 범위 문구"""
+    if keys == list(REPORT_SECTIONS):
+        return "2.1 PESTEL ~ 3.4 TOWS"
+    titles = [REPORT_SECTIONS[k].title for k in keys]
+    return ', '.join(titles) if len(titles) <= 3 else f"{titles[0]} 외 {len(titles) - 1}개 섹션"
 
 # ==============================================================================
 # 리포트 빌더
 # ==============================================================================
 class AnalysisReportBuilder:
-    def __init__(self, data, company_name):
+    def __init__(self, data, company_name, sections=None, handoffs=None, benchmark=None, progress=None):
+        setup_pdf_fonts()  # 지연 초기화 모드에서는 여기서 처음 등록
         self.data = data
+        # 점수 등 숫자 필드는 정규화된 레코드로 조회 (요청에서 이미 파싱했으면 재사용)
+        self.handoffs = handoffs if handoffs is not None else parse_handoffs(data)
+        self.benchmark = benchmark  # 코호트 비교 (cohort.CohortBenchmark, 경영진단 차트용)
         self.company_name = company_name
-        self.styles = create_styles()
+        self.sections = select_sections(sections)  # 선택한 섹션만 빌드 (목차도 동일)
+        self.styles = get_styles()
         self.elements = []
+        # 진행 콜백 progress(event, **fields) - 섹션 빌드 'section', 차트 'chart' (jobs.py)
+        self.progress = progress
+        self.charts = 0
+    
+    def report_progress(self, event, **fields):
+        if self.progress is not None:
+            self.progress(event, **fields)
+    
+    def section_built(self, key, index=None, total=None, **fields):
+        """섹션 빌드 완료 이벤트 (index: 리포트 안의 순서, 1부터 - 기본은 선택한 섹션 목록 기준)"""
+        if index is None:
+            index, total = self.sections.index(key) + 1, len(self.sections)
+        self.report_progress('section', section=key, index=index, total=total, **fields)
     
-    def add_h1(self, text):
-        self.elements.append(Paragraph(text, self.styles['KH1']))
+    def add_h1(self, text, toc_key=None):
+        self.add_heading(Paragraph(text, self.styles['KH1']), toc_key)
     
-    def add_h2(self, text):
-        self.elements.append(Paragraph(text, self.styles['KH2']))
+    def add_h2(self, text, toc_key=None):
+        self.add_heading(Paragraph(text, self.styles['KH2']), toc_key)
+    
+    def add_heading(self, paragraph, toc_key=None):
+        """제목 추가 (toc_key가 있으면 그려진 페이지가 목차에 기록됨)"""
+        if toc_key is not None:
+            paragraph.toc_key = toc_key
+        self.elements.append(paragraph)
     
     def add_h3(self, text):
         self.elements.append(Paragraph(text, self.styles['KH3']))
@@ -794,6 +1290,8 @@ class AnalysisReportBuilder:
         self.elements.append(PageBreak())
     
     def add_chart(self, buf, caption=None, width=380, height=220):
+        self.charts += 1
+        self.report_progress('chart', rendered=self.charts)
         self.elements.append(Image(buf, width=width, height=height))
         if caption:
             self.elements.append(Paragraph(caption, self.styles['KCaption']))
@@ -804,68 +1302,33 @@ class AnalysisReportBuilder:
         if color is None:
             color = colors.HexColor('#EFF6FF')
         
-        box_style = ParagraphStyle('BoxStyle', fontName=FONT, fontSize=10, leading=14,
-                                   textColor=COLORS['dark'])
-        content = [[Paragraph(text, box_style)]]
+        content = [[Paragraph(text, self.styles['BoxStyle'])]]
         box = Table(content, colWidths=[450])
-        box.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), color),
-            ('BOX', (0, 0), (-1, -1), 1, COLORS['primary']),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ]))
+        box.setStyle(get_table_style('highlight_box', color))
         self.elements.append(box)
         self.add_spacer(10)
     
     # ==========================================================================
     # 0. 목차 페이지
     # ==========================================================================
-    def build_table_of_contents(self):
-        """목차 페이지"""
+    @timed('build.toc')
+    def build_table_of_contents(self, toc_items=None):
+        """목차 페이지 (toc_items: [(목차 키, 제목, 설명)], 기본은 선택한 섹션)"""
         
-        title_style = ParagraphStyle('TOCTitle', fontName=FONT_BOLD, fontSize=20, 
-                                     alignment=TA_CENTER, textColor=COLORS['primary'], spaceAfter=25)
-        self.elements.append(Paragraph("목 차", title_style))
+        self.elements.append(Paragraph("목 차", self.styles['TOCTitle']))
         self.add_line()
         self.add_spacer(15)
         
-        # 목차 항목 (목차가 2페이지이므로 실제 페이지 +1)
-        toc_items = [
-            ('1PAGE 요약', '핵심 결론과 전략 방향', 3),
-            ('경영진 요약', '현황 진단 및 90일 로드맵', 4),
-            ('2.1 PESTEL 분석', '거시환경 6대 영역 분석', 6),
-            ('2.2 시나리오 분석', '미래 4대 시나리오', 8),
-            ('2.3 경쟁환경 분석', 'Five Forces 및 경쟁사', 9),
-            ('2.4 고객 분석', 'User/Payer/Beneficiary', 10),
-            ('2.5 시장 분석', 'TAM/SAM/SOM 시장규모', 11),
-            ('3.1 경영진단', '5대 영역 역량 평가', 12),
-            ('3.2 VRIO 분석', '핵심 자원 경쟁우위', 13),
-            ('3.3 SWOT 분석', '강점/약점/기회/위협', 14),
-            ('3.4 TOWS 전략', '전략 옵션 및 우선순위', 15),
-        ]
-        
-        # 목차 테이블
+        # 목차 항목 - 선택한 섹션만 (페이지 번호는 빌드 중 기록된 각 섹션 제목의 실제 페이지)
+        if toc_items is None:
+            toc_items = [(key, REPORT_SECTIONS[key].title, REPORT_SECTIONS[key].desc)
+                         for key in self.sections]
         toc_data = []
-        for section, desc, page in toc_items:
-            toc_data.append([section, desc, str(page)])
-        
-        toc_style = TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), FONT),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('FONTNAME', (0, 0), (0, -1), FONT_BOLD),
-            ('TEXTCOLOR', (0, 0), (0, -1), COLORS['primary']),
-            ('TEXTCOLOR', (1, 0), (1, -1), COLORS['gray']),
-            ('TEXTCOLOR', (2, 0), (2, -1), COLORS['dark']),
-            ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('LINEBELOW', (0, 0), (-1, -2), 0.5, colors.HexColor('#E5E7EB')),
-        ])
+        for key, section, desc in toc_items:
+            toc_data.append([section, desc, TOCPageNumber(key)])
         
         toc_table = Table(toc_data, colWidths=[150, 250, 50])
-        toc_table.setStyle(toc_style)
+        toc_table.setStyle(get_table_style('toc'))
         self.elements.append(toc_table)
         
         self.add_page_break()
@@ -879,12 +1342,9 @@ class AnalysisReportBuilder:
         # SWOT/TOWS에서 핵심 정보 추출
         swot = self.data.get('step_3_3_swot', {})
         tows = self.data.get('step_3_4_tows', {})
-        mgmt = self.data.get('step_3_1_diagnosis', {})
         
         # 타이틀
-        title_style = ParagraphStyle('OnepageTitle', fontName=FONT_BOLD, fontSize=16, 
-                                     alignment=TA_CENTER, textColor=COLORS['primary'], spaceAfter=10)
-        self.elements.append(Paragraph(f"{self.company_name} 분석 요약", title_style))
+        self.add_heading(Paragraph(f"{self.company_name} 분석 요약", self.styles['OnepageTitle']), 'summary')
         self.add_line()
         
         # 핵심 결론 (간결하게)
@@ -899,7 +1359,7 @@ class AnalysisReportBuilder:
         
         # 종합 진단 - 수평 막대 차트로 변경
         self.add_h3("종합 진단")
-        scores = mgmt.get('scores_summary', {})
+        scores = self.handoffs.diagnosis
         if scores:
             # 수평 막대 점수 차트
             chart_buf = create_score_horizontal_bar(scores, width=420, height=130)
@@ -937,15 +1397,7 @@ class AnalysisReportBuilder:
                     action.get('deadline', '')
                 ])
             action_table = Table(action_data, colWidths=[280, 60, 60])
-            action_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), FONT),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
-                ('BACKGROUND', (0, 0), (-1, 0), COLORS['warning']),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
-                ('ROWHEIGHT', (0, 0), (-1, -1), 18),
-            ]))
+            action_table.setStyle(get_table_style('action'))
             self.elements.append(action_table)
         
         self.add_page_break()
@@ -955,7 +1407,7 @@ class AnalysisReportBuilder:
     # ==========================================================================
     def build_executive_summary(self):
         """경영진용 요약"""
-        self.add_h1("📈 경영진용 요약 (Executive Summary)")
+        self.add_h1("📈 경영진용 요약 (Executive Summary)", toc_key='executive')
         self.add_line()
         
         # 현황 진단
@@ -988,10 +1440,10 @@ class AnalysisReportBuilder:
         
         if strengths:
             self.add_small("<font color='#10B981'><b>핵심 강점:</b></font> " + 
-                          " / ".join([s.get('description', '')[:25] for s in strengths]))
+                          " / ".join([(s.get('description') or '')[:25] for s in strengths]))
         if weaknesses:
             self.add_small("<font color='#EF4444'><b>핵심 약점:</b></font> " + 
-                          " / ".join([w.get('description', '')[:25] for w in weaknesses]))
+                          " / ".join([(w.get('description') or '')[:25] for w in weaknesses]))
         
         self.add_spacer(15)
         
@@ -1056,46 +1508,38 @@ class AnalysisReportBuilder:
     # 3. 단계별 상세 리포트
     # ==========================================================================
     def build_detailed_sections(self):
-        """단계별 상세 리포트"""
+        """단계별 상세 리포트 (선택한 상세 섹션만)"""
+        detail_keys = self.detail_section_keys()
+        if not detail_keys:
+            return
+        self.build_detail_heading()
+        for key in detail_keys:
+            self.build_detail_section(key)
+    
+    def detail_section_keys(self):
+        """선택한 상세 섹션 키 (리포트 순서)"""
+        return [s.key for s in DETAIL_SECTIONS if s.key in self.sections]
+    
+    def build_detail_heading(self):
+        """상세 분석 대제목 (첫 섹션과 같은 페이지에 놓임)"""
         self.add_h1("📑 단계별 상세 분석")
         self.add_line()
-        
-        # 2.1 PESTEL
-        self.build_pestel_detail()
-        
-        # 2.2 시나리오
-        self.build_scenario_detail()
-        
-        # 2.3 경쟁환경
-        self.build_competition_detail()
-        
-        # 2.4 고객분석
-        self.build_customer_detail()
-        
-        # 2.5 시장분석
-        self.build_market_detail()
-        
-        # 3.1 경영진단
-        self.build_diagnosis_detail()
-        
-        # 3.2 VRIO
-        self.build_vrio_detail()
-        
-        # 3.3 SWOT
-        self.build_swot_detail()
-        
-        # 3.4 TOWS
-        self.build_tows_detail()
+    
+    def build_detail_section(self, key):
+        """레지스트리의 상세 섹션 하나 빌드"""
+        with timing_span(f"build.{key}"):
+            getattr(self, REPORT_SECTIONS[key].method)()
+        self.section_built(key)
     
     def build_pestel_detail(self):
         """2.1 PESTEL 상세"""
-        self.add_h2("2.1 PESTEL 분석")
+        self.add_h2("2.1 PESTEL 분석", toc_key='pestel')
         
         pestel = self.data.get('step_2_1_pestel', {})
         pestel_data = pestel.get('pestel', {})
         
         # PESTEL 요약 히트맵 추가
-        self._add_pestel_summary_chart(pestel_data)
+        self._add_pestel_summary_chart(self.handoffs.pestel)
         
         areas = [
             ('political', 'Political (정치)', 'P'),
@@ -1115,16 +1559,16 @@ class AnalysisReportBuilder:
                 if summary:
                     self.add_small(f"<i>{summary}</i>")
                 
-                issues = area.get('issues', [])
+                issues = self.handoffs.pestel[key]
                 if issues:
                     issue_data = [['ID', '이슈', '영향', '긴급', '분류']]
                     for issue in issues[:4]:
                         issue_data.append([
-                            issue.get('id', ''),
-                            issue.get('name', '')[:20],
-                            str(issue.get('impact_score', '')),
-                            str(issue.get('urgency_score', '')),
-                            issue.get('classification', '')
+                            issue.id,
+                            issue.name[:20],
+                            format_number(issue.impact_score),
+                            format_number(issue.urgency_score),
+                            issue.classification
                         ])
                     self.elements.append(styled_table(issue_data, col_widths=[35, 180, 45, 45, 50], 
                                                       header_color=COLORS['pestel']))
@@ -1157,8 +1601,9 @@ class AnalysisReportBuilder:
         
         self.add_page_break()
     
-    def _add_pestel_summary_chart(self, pestel_data):
-        """PESTEL 요약 차트 - 영역별 기회/위협 현황"""
+    @timed('chart.pestel_summary')
+    def _add_pestel_summary_chart(self, issues_by_area):
+        """PESTEL 요약 차트 - 영역별 기회/위협 현황 (issues_by_area: {영역: (PestelIssue, ...)})"""
         areas_info = [
             ('political', 'P', '정치'),
             ('economic', 'E', '경제'),
@@ -1171,18 +1616,10 @@ class AnalysisReportBuilder:
         # 각 영역의 기회/위협 카운트
         summary_data = []
         for key, abbr, name in areas_info:
-            area = pestel_data.get(key, {})
-            issues = area.get('issues', [])
-            opp_count = sum(1 for i in issues if i.get('classification') == '기회')
-            threat_count = sum(1 for i in issues if i.get('classification') == '위협')
-            # impact_score를 int로 변환
-            impacts = []
-            for i in issues:
-                try:
-                    impacts.append(int(i.get('impact_score', 0)))
-                except:
-                    impacts.append(0)
-            avg_impact = sum(impacts) / len(impacts) if impacts else 0
+            issues = issues_by_area.get(key, ())
+            opp_count = sum(1 for i in issues if i.classification == '기회')
+            threat_count = sum(1 for i in issues if i.classification == '위협')
+            avg_impact = average_impact(issues)
             summary_data.append({
                 'abbr': abbr, 'name': name,
                 'opp': opp_count, 'threat': threat_count,
@@ -1201,39 +1638,20 @@ class AnalysisReportBuilder:
             ])
         
         summary_table = Table(table_data, colWidths=[100, 50, 50, 80])
-        summary_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), FONT),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#7C3AED')),  # 보라색
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('BACKGROUND', (1, 1), (1, -1), colors.HexColor('#ECFDF5')),  # 기회 - 연초록
-            ('BACKGROUND', (2, 1), (2, -1), colors.HexColor('#FEF2F2')),  # 위협 - 연빨강
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
-            ('ROWHEIGHT', (0, 0), (-1, -1), 20),
-        ]))
+        summary_table.setStyle(get_table_style('pestel_summary'))
         
         self.elements.append(summary_table)
         self.add_spacer(12)
     
     def build_scenario_detail(self):
         """2.2 시나리오 상세"""
-        self.add_h2("2.2 시나리오 분석")
+        self.add_h2("2.2 시나리오 분석", toc_key='scenario')
         
         scenario = self.data.get('step_2_2_scenario', {})
         
         # 시나리오 매트릭스
         scenarios_data = scenario.get('scenarios', {})
-        scenarios_list = []
-        for key in ['scenario_1', 'scenario_2', 'scenario_3', 'scenario_4']:
-            s = scenarios_data.get(key, {})
-            if s:
-                scenarios_list.append({
-                    'quadrant': s.get('quadrant', '++'),
-                    'name': s.get('name', ''),
-                    'probability': s.get('probability', '')
-                })
+        scenarios_list = self.handoffs.scenarios
         
         if scenarios_list:
             # 매트릭스와 확률 차트를 나란히 배치
@@ -1245,11 +1663,7 @@ class AnalysisReportBuilder:
             prob_img = Image(prob_buf, width=180, height=150)
             
             two_col = Table([[matrix_img, prob_img]], colWidths=[280, 200])
-            two_col.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-                ('ALIGN', (1, 0), (1, 0), 'CENTER'),
-            ]))
+            two_col.setStyle(get_table_style('scenario_two_col'))
             self.elements.append(two_col)
             self.add_spacer(15)
         
@@ -1281,10 +1695,10 @@ class AnalysisReportBuilder:
     
     def build_competition_detail(self):
         """2.3 경쟁환경 상세"""
-        self.add_h2("2.3 경쟁환경 분석")
+        self.add_h2("2.3 경쟁환경 분석", toc_key='competition')
         
         competition = self.data.get('step_2_3_competition', {})
-        five_forces = competition.get('five_forces', {})
+        five_forces = self.handoffs.five_forces
         
         # Five Forces 차트
         if five_forces:
@@ -1292,9 +1706,9 @@ class AnalysisReportBuilder:
             self.add_chart(chart_buf, width=280, height=280)
         
         # Five Forces 테이블
-        overall = five_forces.get('overall', {})
+        overall = competition.get('five_forces', {}).get('overall', {})
         if overall:
-            self.add_small(f"<b>산업 매력도:</b> {overall.get('industry_attractiveness', '')} (평균: {overall.get('average_score', '')}/5)")
+            self.add_small(f"<b>산업 매력도:</b> {five_forces.industry_attractiveness} (평균: {five_forces.average_score}/5)")
         
         # 경쟁사 분석
         competitor_analysis = competition.get('competitor_analysis', {})
@@ -1316,7 +1730,7 @@ class AnalysisReportBuilder:
     
     def build_customer_detail(self):
         """2.4 고객분석 상세"""
-        self.add_h2("2.4 고객 분석")
+        self.add_h2("2.4 고객 분석", toc_key='customer')
         
         customer = self.data.get('step_2_4_customer', {})
         ecosystem = customer.get('customer_ecosystem', {})
@@ -1354,21 +1768,14 @@ class AnalysisReportBuilder:
     
     def build_market_detail(self):
         """2.5 시장분석 상세"""
-        self.add_h2("2.5 시장 분석")
+        self.add_h2("2.5 시장 분석", toc_key='market')
         
         market = self.data.get('step_2_5_market', {})
-        sizing = market.get('market_sizing', {})
         
         # 시장 규모
-        tam_data = sizing.get('tam', {})
-        sam_data = sizing.get('sam', {})
-        som_data = sizing.get('som', {})
-        
-        if tam_data:
-            tri = tam_data.get('triangulation', {})
-            tam = float(tri.get('confirmed_tam', 0))
-            sam = float(sam_data.get('total', 0))
-            som_y1 = float(som_data.get('year_1', {}).get('value', 0))
+        sizing = self.handoffs.market
+        if sizing:
+            tam, sam, som_y1 = sizing.tam, sizing.sam, sizing.som_year1
             
             if tam > 0:
                 self.add_h3("시장 규모")
@@ -1393,7 +1800,7 @@ class AnalysisReportBuilder:
     
     def build_diagnosis_detail(self):
         """3.1 경영진단 상세"""
-        self.add_h2("3.1 경영진단")
+        self.add_h2("3.1 경영진단", toc_key='diagnosis')
         
         diagnosis = self.data.get('step_3_1_diagnosis', {})
         
@@ -1403,15 +1810,23 @@ class AnalysisReportBuilder:
             self.add_highlight_box(summary[:300] + '...' if len(summary) > 300 else summary)
         
         # 점수 차트 (레이더만)
-        scores = diagnosis.get('scores_summary', {})
+        scores = self.handoffs.diagnosis
         if scores:
-            chart_buf = create_diagnosis_radar_only(scores, width=280, height=280)
-            self.add_chart(chart_buf, width=240, height=240)
+            if self.benchmark:
+                # 영역 라벨에 코호트 위치가 붙어 차트 영역이 줄어드는 만큼 키움
+                chart_buf = create_diagnosis_radar_only(scores, width=340, height=340, benchmark=self.benchmark)
+                self.add_chart(chart_buf, width=280, height=280)
+            else:
+                chart_buf = create_diagnosis_radar_only(scores, width=280, height=280)
+                self.add_chart(chart_buf, width=240, height=240)
+            if self.benchmark:
+                self.add_small(f"코호트 {self.benchmark.size}개사 비교: 점선은 영역별 중앙값, "
+                               f"'상위 N%'는 같은 영역 점수가 있는 기업 중 위치 (일부만 있으면 'n/전체' 표시)")
             
             # 점수 테이블 (reportlab)
             score_data = [['영역', '점수', '상태', '핵심 평가']]
-            for area, info in scores.items():
-                score = float(info.get('score', 0))
+            for area_score in scores:
+                area, score = area_score.area, area_score.score
                 # 이모지 대신 텍스트 사용
                 if score >= 4:
                     status = '양호'
@@ -1419,7 +1834,7 @@ class AnalysisReportBuilder:
                     status = '보통'
                 else:
                     status = '취약'
-                eval_text = info.get('evaluation', '')[:30]
+                eval_text = area_score.evaluation[:30]
                 score_data.append([area, f'{score:.1f}', status, eval_text])
             self.elements.append(styled_table(score_data, col_widths=[70, 45, 40, 295]))
         
@@ -1427,7 +1842,7 @@ class AnalysisReportBuilder:
     
     def build_vrio_detail(self):
         """3.2 VRIO 상세"""
-        self.add_h2("3.2 VRIO 분석")
+        self.add_h2("3.2 VRIO 분석", toc_key='vrio')
         
         vrio = self.data.get('step_3_2_vrio', {})
         resources = vrio.get('resource_identification', {})
@@ -1479,6 +1894,7 @@ class AnalysisReportBuilder:
         
         self.add_page_break()
     
+    @timed('chart.vrio')
     def _add_vrio_chart(self, resources):
         """VRIO 4요소 평가 차트"""
         if not resources:
@@ -1513,46 +1929,32 @@ class AnalysisReportBuilder:
         self.add_h3("VRIO 요소 충족 현황")
         
         vrio_table = Table(chart_data, colWidths=[40, 140, 80, 60])
-        vrio_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), FONT),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
-            ('BACKGROUND', (0, 0), (-1, 0), COLORS['vrio']),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
-            ('ROWHEIGHT', (0, 0), (-1, -1), 22),
-            # 비율에 따라 배경색
-            ('BACKGROUND', (3, 1), (3, 1), colors.HexColor('#ECFDF5') if vrio_scores['V']/count >= 0.6 else colors.HexColor('#FEF2F2')),
-            ('BACKGROUND', (3, 2), (3, 2), colors.HexColor('#ECFDF5') if vrio_scores['R']/count >= 0.6 else colors.HexColor('#FEF2F2')),
-            ('BACKGROUND', (3, 3), (3, 3), colors.HexColor('#ECFDF5') if vrio_scores['I']/count >= 0.6 else colors.HexColor('#FEF2F2')),
-            ('BACKGROUND', (3, 4), (3, 4), colors.HexColor('#ECFDF5') if vrio_scores['O']/count >= 0.6 else colors.HexColor('#FEF2F2')),
-        ]))
+        vrio_table.setStyle(get_table_style(
+            'vrio', *(vrio_scores[k] / count >= 0.6 for k in ('V', 'R', 'I', 'O'))))
         self.elements.append(vrio_table)
     
     def build_swot_detail(self):
         """3.3 SWOT 상세 - 2x2 매트릭스 레이아웃"""
-        self.add_h2("3.3 SWOT 분석")
+        self.add_h2("3.3 SWOT 분석", toc_key='swot')
         
         swot = self.data.get('step_3_3_swot', {})
+        quadrants = self.handoffs.swot
         
         # 각 사분면 데이터 준비
         def format_items(items, max_items=3):
             """아이템을 포맷팅"""
             formatted = []
             for item in items[:max_items]:
-                desc = item.get('description', '')[:35]
-                score = item.get('impact_score', '')
-                formatted.append(f"• {desc} ({score})")
+                formatted.append(f"• {item.description[:35]} ({format_number(item.impact_score)})")
             return '\n'.join(formatted) if formatted else '-'
         
-        s_items = format_items(swot.get('strengths', []))
-        w_items = format_items(swot.get('weaknesses', []))
-        o_items = format_items(swot.get('opportunities', []))
-        t_items = format_items(swot.get('threats', []))
+        s_items = format_items(quadrants['strengths'])
+        w_items = format_items(quadrants['weaknesses'])
+        o_items = format_items(quadrants['opportunities'])
+        t_items = format_items(quadrants['threats'])
         
         # 2x2 매트릭스 테이블
-        cell_style = ParagraphStyle('SWOTCell', fontName=FONT, fontSize=9, leading=12)
+        cell_style = self.styles['SWOTCell']
         
         matrix_data = [
             ['', '긍정적 요인', '부정적 요인'],
@@ -1565,31 +1967,7 @@ class AnalysisReportBuilder:
         ]
         
         matrix_table = Table(matrix_data, colWidths=[50, 200, 200], rowHeights=[25, 120, 120])
-        matrix_table.setStyle(TableStyle([
-            # 헤더
-            ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
-            ('FONTNAME', (0, 0), (0, -1), FONT_BOLD),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('FONTSIZE', (0, 0), (0, -1), 9),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#F3F4F6')),
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F3F4F6')),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            # 셀 색상
-            ('BACKGROUND', (1, 1), (1, 1), colors.HexColor('#ECFDF5')),  # S - 연초록
-            ('BACKGROUND', (2, 1), (2, 1), colors.HexColor('#FEF2F2')),  # W - 연빨강
-            ('BACKGROUND', (1, 2), (1, 2), colors.HexColor('#EFF6FF')),  # O - 연파랑
-            ('BACKGROUND', (2, 2), (2, 2), colors.HexColor('#FFFBEB')),  # T - 연노랑
-            # 테두리
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#D1D5DB')),
-            ('BOX', (0, 0), (-1, -1), 2, COLORS['primary']),
-            # 패딩
-            ('LEFTPADDING', (1, 1), (-1, -1), 10),
-            ('RIGHTPADDING', (1, 1), (-1, -1), 10),
-            ('TOPPADDING', (1, 1), (-1, -1), 10),
-            ('BOTTOMPADDING', (1, 1), (-1, -1), 10),
-        ]))
+        matrix_table.setStyle(get_table_style('swot_matrix'))
         
         self.elements.append(matrix_table)
         self.add_spacer(15)
@@ -1602,26 +1980,22 @@ class AnalysisReportBuilder:
                 self.add_body(f"<b>{i}.</b> {insight[:80]}{'...' if len(insight) > 80 else ''}")
         
         # SWOT 요약 통계 추가
-        self._add_swot_summary_stats(swot)
+        self._add_swot_summary_stats(quadrants)
         
         self.add_page_break()
     
-    def _add_swot_summary_stats(self, swot):
-        """SWOT 요약 통계"""
-        s_count = len(swot.get('strengths', []))
-        w_count = len(swot.get('weaknesses', []))
-        o_count = len(swot.get('opportunities', []))
-        t_count = len(swot.get('threats', []))
+    def _add_swot_summary_stats(self, quadrants):
+        """SWOT 요약 통계 (quadrants: {사분면: (SwotItem, ...)})"""
+        s_count = len(quadrants['strengths'])
+        w_count = len(quadrants['weaknesses'])
+        o_count = len(quadrants['opportunities'])
+        t_count = len(quadrants['threats'])
         
         # 평균 영향도 계산
-        def avg_impact(items):
-            scores = [item.get('impact_score', 0) for item in items]
-            return sum(scores) / len(scores) if scores else 0
-        
-        s_avg = avg_impact(swot.get('strengths', []))
-        w_avg = avg_impact(swot.get('weaknesses', []))
-        o_avg = avg_impact(swot.get('opportunities', []))
-        t_avg = avg_impact(swot.get('threats', []))
+        s_avg = average_impact(quadrants['strengths'])
+        w_avg = average_impact(quadrants['weaknesses'])
+        o_avg = average_impact(quadrants['opportunities'])
+        t_avg = average_impact(quadrants['threats'])
         
         self.add_spacer(10)
         self.add_h3("SWOT 요약 통계")
@@ -1635,28 +2009,14 @@ class AnalysisReportBuilder:
         ]
         
         stats_table = Table(stats_data, colWidths=[80, 70, 80, 100])
-        stats_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), FONT),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
-            ('BACKGROUND', (0, 0), (-1, 0), COLORS['swot']),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('BACKGROUND', (0, 1), (0, 1), colors.HexColor('#ECFDF5')),  # S
-            ('BACKGROUND', (0, 2), (0, 2), colors.HexColor('#FEF2F2')),  # W
-            ('BACKGROUND', (0, 3), (0, 3), colors.HexColor('#EFF6FF')),  # O
-            ('BACKGROUND', (0, 4), (0, 4), colors.HexColor('#FFFBEB')),  # T
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
-            ('ROWHEIGHT', (0, 0), (-1, -1), 22),
-        ]))
+        stats_table.setStyle(get_table_style('swot_stats'))
         self.elements.append(stats_table)
     
     def build_tows_detail(self):
         """3.4 TOWS 상세"""
-        self.add_h2("3.4 TOWS 전략")
+        self.add_h2("3.4 TOWS 전략", toc_key='tows')
         
         tows = self.data.get('step_3_4_tows', {})
-        options = tows.get('strategy_options', {})
         
         # 전략 유형별 테이블로 정리
         strategy_data = []
@@ -1667,12 +2027,11 @@ class AnalysisReportBuilder:
             ('ST', 'ST 전략', '강점으로 위협 방어'),
             ('WT', 'WT 전략', '약점/위협 최소화')
         ]:
-            strategies = options.get(stype, [])
+            strategies = [s for s in self.handoffs.strategies if s.type == stype]
             for s in strategies[:2]:
-                name = s.get('name', '')
-                hypothesis = s.get('hypothesis', '')[:50]
-                eval_data = s.get('evaluation', {})
-                total_score = eval_data.get('total_score', 0)
+                name = s.name
+                hypothesis = s.hypothesis[:50]
+                total_score = s.total_score
                 
                 # 우선순위 표시
                 if total_score >= 22:
@@ -1696,7 +2055,7 @@ class AnalysisReportBuilder:
             for s in strategy_data:
                 table_data.append([
                     s['type'], s['name'][:18], s['hypothesis'] + '...', 
-                    str(s['score']), s['priority']
+                    format_number(s['score']), s['priority']
                 ])
             self.elements.append(styled_table(table_data, col_widths=[40, 120, 180, 40, 70]))
         
@@ -1743,44 +2102,97 @@ class AnalysisReportBuilder:
         # 표지 후 빈 콘텐츠로 페이지 넘김 처리
         # (표지는 onFirstPage에서 그려지므로 첫 element 전에 PageBreak 불필요)
         
-        self.build_table_of_contents()  # 목차 추가
-        self.build_one_page_summary()
-        self.build_executive_summary()
+        self.build_front()
         self.build_detailed_sections()
         return self.elements
+    
+    def build_front(self):
+        """목차 ~ 경영진 요약 (상세 섹션 앞부분, 선택한 요약만)"""
+        self.build_table_of_contents()  # 목차 추가
+        for section in SUMMARY_SECTIONS:
+            if section.key in self.sections:
+                with timing_span(f"build.{section.key}"):
+                    getattr(self, section.method)()
+                self.section_built(section.key)
+        return self.elements
 
 
 # ==============================================================================
 # 메인 함수
 # ==============================================================================
-def generate_analysis_report(data, output_path, company_name=None):
-    """분석 리포트 PDF 생성"""
+def create_report_doc(output, progress=None, invariant=False, cover=True):
+    """리포트 본문 문서 (A4, 공통 여백) - output은 경로 또는 파일 객체, progress는 배치 진행 콜백
+
+    invariant: ReportLab 고정 출력 (생성/수정 시각과 문서 ID를 고정 - 같은 입력이면 같은 바이트)
+    cover: 첫 페이지가 번호 없는 표지인지 (섹션 조각은 False - 목차 번호를 조각 안 페이지로 기록)
+    """
+    return ReportDocTemplate(
+        output, pagesize=A4,
+        rightMargin=15*mm, leftMargin=15*mm,
+        topMargin=25*mm, bottomMargin=20*mm,
+        progress=progress,
+        page_offset=1 if cover else 0,
+        invariant=invariant or None  # None이면 rl_config.invariant
+    )
+
+def cover_elements():
+    """표지 후 콘텐츠 시작을 위한 빈 요소 + PageBreak (표지는 onFirstPage에서 그림)"""
+    return [Spacer(1, 1), PageBreak()]
+
+def generate_analysis_report(data, output_path, company_name=None, use_fragment_cache=None,
+                             workers=None, sections=None, metrics=None, handoffs=None, benchmark=None,
+                             progress=None, report_date=None, invariant=False):
+    """분석 리포트 PDF 생성
+    
+    use_fragment_cache가 켜져 있으면(기본: GIMPACT_FRAGMENT_CACHE, 꺼짐) 상세 섹션은
+    캐시된 조각을 재사용하고 바뀐 섹션만 다시 렌더링
+    workers > 1이면(기본: GIMPACT_RENDER_WORKERS) 상세 섹션을 프로세스 풀에서
+    동시에 렌더링한 뒤 순서대로 이어 붙이고 페이지 번호/목차를 맞춤
+    sections: 렌더링할 섹션 키 목록 (REPORT_SECTIONS, 기본 전체) - 목차/표지도 선택 반영
+    metrics: dict를 넘기면 섹션/페이지 수/렌더링 시간(ms)을 채움
+    handoffs: 요청에서 이미 정규화한 Handoffs (상세 보고서와 공유, 없으면 여기서 파싱)
+    benchmark: cohort.CohortBenchmark - 경영진단 차트에 코호트 중앙값/백분위 표시
+    progress: 진행 콜백 progress(event, **fields) - 섹션 빌드/차트/배치 이벤트 (jobs.py)
+    구간 시간은 collect_timings 블록 안에서 호출하면 기록됨 (build.*, chart.*, doc.build, stitch)
+    report_date: 표지/푸터 생성일 (date 또는 'YYYY-MM-DD', 기본 오늘)
+    invariant: 재현 가능한 출력 - report_date와 함께 주면 같은 입력에서 바이트까지 같은 PDF
+    """
     
     if company_name is None:
         pestel = data.get('step_2_1_pestel', {})
         meta = pestel.get('analysis_meta', {})
         company_name = meta.get('company', '기업명')
     
-    report_date = datetime.now().strftime('%Y년 %m월 %d일')
-    template = ReportTemplate(company_name, report_date)
-    
-    doc = SimpleDocTemplate(
-        output_path, pagesize=A4,
-        rightMargin=15*mm, leftMargin=15*mm,
-        topMargin=25*mm, bottomMargin=20*mm
-    )
-    
-    builder = AnalysisReportBuilder(data, company_name)
-    
-    # 표지 후 콘텐츠 시작을 위해 빈 요소 + PageBreak 추가
-    from reportlab.platypus import PageBreak, Spacer
-    cover_elements = [Spacer(1, 1), PageBreak()]  # 표지 페이지 채우기
-    
-    content_elements = builder.build()
-    all_elements = cover_elements + content_elements
-    
-    doc.build(all_elements, onFirstPage=template.cover_page, onLaterPages=template.header_footer)
-    
+    started = time.perf_counter()
+    sections = select_sections(sections)
+    template = ReportTemplate(company_name, format_report_date(report_date), scope=describe_scope(sections))
+    if metrics is None:
+        metrics = {}
+    
+    if use_fragment_cache is None:
+        use_fragment_cache = FRAGMENT_CACHE
+    if workers is None:
+        workers = RENDER_WORKERS
+    if use_fragment_cache or workers > 1:
+        from report_fragments import generate_incremental_report
+        generate_incremental_report(data, output_path, template, sections,
+                                    use_cache=use_fragment_cache, workers=workers, metrics=metrics,
+                                    handoffs=handoffs, benchmark=benchmark, progress=progress,
+                                    invariant=invariant)
+    else:
+        doc = create_report_doc(output_path, progress, invariant)
+        builder = AnalysisReportBuilder(data, company_name, sections, handoffs, benchmark, progress)
+        
+        content_elements = builder.build()
+        all_elements = cover_elements() + content_elements
+        
+        with timing_span('doc.build'):
+            doc.build(all_elements, onFirstPage=template.cover_page, onLaterPages=template.header_footer)
+        metrics['pages'] = doc.page
+    
+    metrics['sections'] = sections
+    metrics['skipped_sections'] = [k for k in REPORT_SECTIONS if k not in sections]
+    metrics['render_ms'] = round((time.perf_counter() - started) * 1000, 1)
     return output_path
 
 
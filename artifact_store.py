@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 보고서 산출물(PDF) 저장소
+렌더링한 PDF를 응답 본문(Base64) 대신 저장소에 두고 유효 시간이 짧은 다운로드 URL을 돌려줌
+
+구조:
+- 키 = 내용의 SHA-256 + 확장자 (같은 PDF는 한 번만 저장, ETag도 해시)
+- local (기본): ARTIFACT_DIR/<키> 파일 - GET /artifacts/{키}?name=&expires=&sig= 로 다운로드
+  · sig = HMAC-SHA256(GIMPACT_ARTIFACT_SECRET, "키\\n파일명\\n만료 시각") - 만료/변조 시 403
+  · Range(단일 구간, 206/416), If-Range, ETag, If-None-Match(304) 지원 → 이어 받기, 구간 병렬 다운로드
+  · 전체 크기가 상한(GIMPACT_ARTIFACT_CACHE_MB)을 넘으면 오래 안 쓴 파일부터 삭제
+- s3: S3 호환 버킷 (GIMPACT_S3_BUCKET, MinIO는 GIMPACT_S3_ENDPOINT=http://localhost:9000)
+  · boto3 presigned URL - Range/ETag/If-None-Match는 S3가 처리
+  · 자격 증명은 boto3 기본 방식 (AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY 등), 보관 기간은 버킷 수명 주기 규칙으로
+
+서명 키가 없으면 프로세스마다 임의 키를 씀 (URL은 발급한 인스턴스에서만 유효) - 여러 인스턴스면 같은 키를 주입
+
+사용법:
+    python artifact_store.py report.pdf             # 저장 후 키, 크기, 다운로드 URL 출력
+    python artifact_store.py --prune                # 로컬 저장소 용량 초과분 삭제
+"""
+
+import argparse
+import hashlib
+import hmac
+import os
+import re
+import shutil
+import threading
+import time
+from urllib.parse import quote, urlencode
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+except ImportError:  # s3 백엔드에서만 필요
+    boto3 = None
+
+# ==============================================================================
+# 설정
+# ==============================================================================
+ARTIFACT_BACKEND = os.environ.get('GIMPACT_ARTIFACT_STORE', 'local')
+ARTIFACT_DIR = os.environ.get('GIMPACT_ARTIFACT_DIR') or os.path.join(
+    os.environ.get('GIMPACT_CACHE_DIR', os.path.expanduser('~/.cache/gimpact')), 'artifacts')
+
+# 로컬 저장소 전체 크기 상한 / 다운로드 URL 유효 시간
+ARTIFACT_MAX_BYTES = int(os.environ.get('GIMPACT_ARTIFACT_CACHE_MB', '1024')) * 1024 * 1024
+ARTIFACT_URL_TTL = int(float(os.environ.get('GIMPACT_ARTIFACT_URL_TTL_MINUTES', '15')) * 60)
+ARTIFACT_SECRET = os.environ.get('GIMPACT_ARTIFACT_SECRET') or os.urandom(32).hex()
+
+S3_BUCKET = os.environ.get('GIMPACT_S3_BUCKET', '')
+S3_ENDPOINT = os.environ.get('GIMPACT_S3_ENDPOINT') or None
+S3_PREFIX = os.environ.get('GIMPACT_S3_PREFIX', 'reports/')
+
+ARTIFACT_KEY_PATTERN = re.compile(r'^[0-9a-f]{64}\.pdf$')
+
+CHUNK_SIZE = 64 * 1024
+
+def file_digest(path):
+    """파일 내용의 SHA-256 hex (청크 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def content_disposition(filename):
+    """다운로드 파일명 헤더 (한글은 filename*=utf-8''...)"""
+    quoted = quote(filename)
+    if quoted == filename:
+        return f'attachment; filename="{filename}"'
+    return f"attachment; filename*=utf-8''{quoted}"
+
+# ==============================================================================
+# 저장소
+# ==============================================================================
+class Artifact:
+    """저장된 산출물 (키, 바이트 수, ETag)"""
+
+    def __init__(self, key, size, etag):
+        self.key = key
+        self.size = size
+        self.etag = etag
+
+class ArtifactStore:
+    """산출물 저장소 공통 인터페이스"""
+
+    name = 'base'
+
+    def put_file(self, path, content_type='application/pdf'):
+        """파일 내용 저장 (이미 있으면 그대로) → Artifact"""
+        raise NotImplementedError
+
+    def url(self, key, filename, base_url='', ttl=ARTIFACT_URL_TTL):
+        """다운로드 URL → (URL, 만료 유닉스 초)"""
+        raise NotImplementedError
+
+    def path(self, key):
+        """서버가 직접 보내는 파일 경로 (로컬 저장소만, 없으면 None)"""
+        return None
+
+class LocalArtifactStore(ArtifactStore):
+    """디스크 저장소 + 서명한 다운로드 URL (GET /artifacts/{키})"""
+
+    name = 'local'
+
+    def __init__(self, directory=ARTIFACT_DIR, max_bytes=ARTIFACT_MAX_BYTES, secret=ARTIFACT_SECRET):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.secret = secret
+        self._prune_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        if not ARTIFACT_KEY_PATTERN.match(key):
+            raise ValueError(f"산출물 키 형식이 아닙니다: {key!r}")
+        return os.path.join(self.directory, key)
+
+    def put_file(self, path, content_type='application/pdf'):
+        digest = file_digest(path)
+        key = f"{digest}.pdf"
+        target = self._path(key)
+        if os.path.exists(target):
+            os.utime(target)
+        else:
+            tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, target)
+            self.prune()
+        return Artifact(key, os.path.getsize(target), f'"{digest}"')
+
+    def path(self, key):
+        """키 → 파일 경로 (없으면 None), 최근 사용 표시"""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def sign(self, key, filename, expires):
+        message = f"{key}\n{filename}\n{expires}".encode('utf-8')
+        return hmac.new(self.secret.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+    def verify(self, key, filename, expires, signature):
+        """다운로드 URL 확인 - 서명이 맞고 만료 전이면 True"""
+        try:
+            if int(expires) < time.time():
+                return False
+        except (TypeError, ValueError):
+            return False
+        return bool(signature) and hmac.compare_digest(self.sign(key, filename, expires), signature)
+
+    def url(self, key, filename, base_url='', ttl=ARTIFACT_URL_TTL):
+        expires = int(time.time()) + ttl
+        query = urlencode({'name': filename, 'expires': expires, 'sig': self.sign(key, filename, expires)})
+        return f"{base_url}/artifacts/{key}?{query}", expires
+
+    def prune(self):
+        """전체 크기가 상한을 넘으면 오래 안 쓴 파일부터 삭제 → 삭제한 개수"""
+        with self._prune_lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if ARTIFACT_KEY_PATTERN.match(entry.name):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+            return removed
+
+class S3ArtifactStore(ArtifactStore):
+    """S3 호환 버킷 (AWS S3, MinIO 등) + presigned URL"""
+
+    name = 's3'
+
+    def __init__(self, bucket=S3_BUCKET, endpoint_url=S3_ENDPOINT, prefix=S3_PREFIX):
+        if boto3 is None:
+            raise ValueError("s3 산출물 저장소에는 boto3가 필요합니다 (pip install boto3)")
+        if not bucket:
+            raise ValueError("S3 버킷이 설정되지 않았습니다 (GIMPACT_S3_BUCKET)")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client('s3', endpoint_url=endpoint_url)
+
+    def put_file(self, path, content_type='application/pdf'):
+        digest = file_digest(path)
+        key = f"{digest}.pdf"
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+            return Artifact(key, head['ContentLength'], head['ETag'])
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey', 'NotFound'):
+                raise
+        self.client.upload_file(path, self.bucket, self.prefix + key,
+                                ExtraArgs={'ContentType': content_type, 'Metadata': {'sha256': digest}})
+        head = self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+        return Artifact(key, head['ContentLength'], head['ETag'])
+
+    def url(self, key, filename, base_url='', ttl=ARTIFACT_URL_TTL):
+        url = self.client.generate_presigned_url('get_object', ExpiresIn=ttl, Params={
+            'Bucket': self.bucket,
+            'Key': self.prefix + key,
+            'ResponseContentDisposition': content_disposition(filename),
+        })
+        return url, int(time.time()) + ttl
+
+ARTIFACT_STORES = {
+    'local': LocalArtifactStore,
+    's3': S3ArtifactStore,
+}
+
+# 서버 프로세스당 하나
+_store = None
+_store_lock = threading.Lock()
+
+def get_artifact_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            if ARTIFACT_BACKEND not in ARTIFACT_STORES:
+                raise ValueError(f"알 수 없는 산출물 저장소: {ARTIFACT_BACKEND} (가능: {', '.join(ARTIFACT_STORES)})")
+            _store = ARTIFACT_STORES[ARTIFACT_BACKEND]()
+        return _store
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='G-IMPACT 보고서 산출물 저장소')
+    parser.add_argument('pdf', nargs='?', help='저장할 PDF 파일')
+    parser.add_argument('--base-url', default='http://localhost:8080', help='로컬 저장소 다운로드 URL 앞부분')
+    parser.add_argument('--prune', action='store_true', help='로컬 저장소 용량 초과분 삭제')
+    args = parser.parse_args()
+
+    store = get_artifact_store()
+    if args.prune and isinstance(store, LocalArtifactStore):
+        print(f"삭제: {store.prune()}개")
+    if args.pdf:
+        artifact = store.put_file(args.pdf)
+        url, expires = store.url(artifact.key, os.path.basename(args.pdf), args.base_url)
+        print(f"{artifact.key} {artifact.size:,}B ETag {artifact.etag}")
+        print(url)
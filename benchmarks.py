@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 성능 측정 스크립트
+
+사용법:
+    python benchmarks.py string-width    # 한글 문자열 폭 계산 / 문단 줄바꿈
+    python benchmarks.py import-time     # 모듈별 임포트 비용 / 콜드 스타트 예산 확인
+    python benchmarks.py fragments       # 섹션 조각 캐시 / 병렬 렌더링 (전체 / 콜드 / 재사용 / 한 섹션 변경)
+    python benchmarks.py markdown        # 상세 보고서 마크다운 컴파일 (캐시 전/후) 및 렌더링
+    python benchmarks.py request-parse   # 대용량 요청 본문 파싱 (dict 그래프 후 검증 vs 바이트에서 바로 검증)
+    python benchmarks.py blob-refs       # 반복 렌더링 요청 (전체 본문 vs 블롭 해시 참조) 바이트/파싱 시간
+    python benchmarks.py cohort          # 코호트 백분위/표준점수/순위 (기업별 파이썬 루프 vs NumPy 행렬)
+    python benchmarks.py transform       # AI 변환 10회 호출 (순차 vs 동시 / 변환 캐시, 로컬 stub 백엔드에 응답 지연)
+
+콜드 스타트 예산 (Cloud Run 등 scale-to-zero, 1 vCPU 기준 임포트 시간):
+- pdf_api_server                                   1500ms  (대부분 fastapi/pydantic 모델 구성)
+- analysis_report_generator (기본, 즉시 초기화)    1200ms  (matplotlib.pyplot, reportlab, 폰트 등록)
+- analysis_report_generator (GIMPACT_LAZY_INIT=1)   400ms  (reportlab만, 차트/폰트는 첫 사용 시)
+지연 모드에서는 첫 리포트 요청이 matplotlib 임포트 비용(약 400ms)을 추가로 부담
+"""
+
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from collections import defaultdict
+
+from real_sample_data import REAL_SAMPLE_DATA
+
+# ==============================================================================
+# 공통
+# ==============================================================================
+def collect_sample_text(obj=REAL_SAMPLE_DATA):
+    """샘플 데이터의 모든 문자열 값 수집"""
+    texts = []
+    if isinstance(obj, dict):
+        for v in obj.values():
+            texts.extend(collect_sample_text(v))
+    elif isinstance(obj, list):
+        for v in obj:
+            texts.extend(collect_sample_text(v))
+    elif isinstance(obj, str):
+        texts.append(obj)
+    return texts
+
+def timeit(fn, repeat=5):
+    """최소 실행 시간 (초)"""
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+def report(name, baseline, optimized):
+    print(f"{name:<28} 기존 {baseline*1000:8.2f}ms  개선 {optimized*1000:8.2f}ms  ({baseline/optimized:.1f}x)")
+
+# ==============================================================================
+# 문자열 폭 / 문단 줄바꿈
+# ==============================================================================
+def bench_string_width(rounds=20):
+    """조밀 폭 테이블 vs ReportLab 기본 TTF stringWidth"""
+    from reportlab.pdfbase.pdfmetrics import getFont, stringWidth
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.platypus import Paragraph
+    from analysis_report_generator import FONT, create_styles
+
+    font = getFont(FONT)
+    texts = collect_sample_text()
+    words = [w for t in texts for w in t.split()]
+    long_text = ' '.join(texts)
+    style = create_styles()['KBody']
+
+    def measure_words():
+        for _ in range(rounds):
+            for w in words:
+                stringWidth(w, FONT, 10)
+
+    def wrap_paragraphs():
+        for t in texts:
+            Paragraph(t, style).wrap(450, 10000)
+        Paragraph(long_text, style).wrap(450, 100000)
+
+    def with_default_width(fn):
+        # 폰트 인스턴스에 기본 구현을 덮어써서 비교 후 복구
+        font.stringWidth = types.MethodType(TTFont.stringWidth, font)
+        try:
+            return timeit(fn)
+        finally:
+            del font.stringWidth
+
+    print(f"샘플: 문자열 {len(texts)}개, 단어 {len(words)}개, 전체 {len(long_text)}자")
+    report(f"stringWidth x{rounds}", with_default_width(measure_words), timeit(measure_words))
+    report("Paragraph.wrap (KBody)", with_default_width(wrap_paragraphs), timeit(wrap_paragraphs))
+
+# ==============================================================================
+# 임포트 시간 / 콜드 스타트
+# ==============================================================================
+COLD_START_BUDGET_MS = {
+    ('pdf_api_server', False): 1500,
+    ('analysis_report_generator', False): 1200,
+    ('analysis_report_generator', True): 400,
+}
+
+def profile_import(module, lazy=False):
+    """새 인터프리터에서 -X importtime으로 임포트 비용 측정
+
+    Returns:
+        (전체 누적 시간 ms, [(모듈명, self ms, 누적 ms), ...])
+    """
+    env = dict(os.environ, GIMPACT_LAZY_INIT='1' if lazy else '0')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          env=env, capture_output=True, text=True, check=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    total = next((cum for name, _, cum in rows if name == module), 0)
+    return total, rows
+
+def bench_import_time(top=8):
+    """모듈별 임포트 비용과 콜드 스타트 예산 비교"""
+    for (module, lazy), budget in COLD_START_BUDGET_MS.items():
+        total, rows = profile_import(module, lazy)
+        by_package = defaultdict(float)
+        for name, self_ms, _ in rows:
+            by_package[name.split('.')[0]] += self_ms
+
+        status = 'OK' if total <= budget else '초과'
+        print(f"\n{module}{' (지연 모드)' if lazy else ''}: {total:.0f}ms / 예산 {budget}ms [{status}]")
+        for package, ms in sorted(by_package.items(), key=lambda x: -x[1])[:top]:
+            print(f"  {package:<36} {ms:8.1f}ms")
+        print("  -- self 시간 상위 모듈 --")
+        for name, self_ms, _ in sorted(rows, key=lambda r: -r[1])[:top]:
+            print(f"  {name:<36} {self_ms:8.1f}ms")
+
+# ==============================================================================
+# 섹션 조각 캐시
+# ==============================================================================
+def bench_fragments():
+    """전체 레이아웃 vs 조각 캐시 (비어 있을 때 / 모두 재사용 / TOWS만 변경)"""
+    import report_fragments
+    from analysis_report_generator import generate_analysis_report
+
+    changed = copy.deepcopy(REAL_SAMPLE_DATA)
+    changed.setdefault('step_3_4_tows', {})['benchmark_revision'] = 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report_fragments.FRAGMENT_CACHE_DIR = os.path.join(tmp, 'fragments')
+        output = os.path.join(tmp, 'report.pdf')
+
+        def render(data, use_fragment_cache=True, workers=0):
+            t = time.perf_counter()
+            generate_analysis_report(data, output, 'G임팩트',
+                                     use_fragment_cache=use_fragment_cache, workers=workers)
+            return time.perf_counter() - t
+
+        full = render(REAL_SAMPLE_DATA, use_fragment_cache=False)
+        full_size = os.path.getsize(output)
+        cold = render(REAL_SAMPLE_DATA)
+        warm = render(REAL_SAMPLE_DATA)
+        one_changed = render(changed)
+        stitched_size = os.path.getsize(output)
+
+        workers = os.cpu_count() or 1
+        if workers > 1:
+            render(REAL_SAMPLE_DATA, use_fragment_cache=False, workers=workers)  # 워커 풀 예열
+            parallel = render(REAL_SAMPLE_DATA, use_fragment_cache=False, workers=workers)
+
+    report("조각 캐시 비어 있음", full, cold)
+    report("조각 모두 재사용", full, warm)
+    report("TOWS만 변경", full, one_changed)
+    if workers > 1:
+        report(f"캐시 없이 워커 {workers}개", full, parallel)
+    else:
+        print("병렬 렌더링: CPU 1개 - 측정 생략 (GIMPACT_RENDER_WORKERS는 코어 수 이하로)")
+    print(f"파일 크기: 전체 {full_size/1024:.0f}KB, 조각 이어 붙임 {stitched_size/1024:.0f}KB")
+
+# ==============================================================================
+# 상세 보고서 마크다운
+# ==============================================================================
+def sample_markdown(step_data):
+    """핸드오프 데이터로 AI 변환 결과와 비슷한 마크다운 생성 (제목/문단/목록/표)"""
+    texts = collect_sample_text(step_data)
+    lines = ["## 개요", ' '.join(texts[:3]), "", "### 주요 내용"]
+    lines += [f"- **{t[:12]}** {t[12:]}" for t in texts[3:15]]
+    lines += ["", "| 항목 | 내용 |", "|---|---|"]
+    lines += [f"| {t[:10]} | {t[:60]} |" for t in texts[15:25]]
+    lines += ["", "> " + ' '.join(texts[25:27])]
+    return '\n'.join(lines)
+
+def bench_markdown():
+    """마크다운 컴파일 (캐시 없음 / 캐시 적중) 및 상세 보고서 렌더링"""
+    import detail_report_generator as drg
+
+    transformed = {
+        'executiveSummary': sample_markdown(REAL_SAMPLE_DATA.get('step_3_3_swot', {})),
+        'sections': {s.key: {'content': sample_markdown(REAL_SAMPLE_DATA.get(s.step, {}))}
+                     for s in drg.DETAIL_SECTIONS},
+    }
+    documents = [transformed['executiveSummary']] + [v['content'] for v in transformed['sections'].values()]
+
+    def compile_all():
+        for text in documents:
+            drg.compile_markdown(text)
+
+    def compile_uncached():
+        drg.compile_markdown.cache_clear()
+        compile_all()
+
+    def render():
+        drg.DetailReportGenerator({}, transformed, 'G임팩트').generate()
+
+    print(f"샘플: 마크다운 {len(documents)}개, 전체 {sum(map(len, documents))}자")
+    report("마크다운 컴파일 (캐시 적중)", timeit(compile_uncached), timeit(compile_all))
+    render()  # 폰트/스타일 예열
+    print(f"상세 보고서 렌더링: {timeit(render, repeat=3)*1000:.1f}ms")
+
+# ==============================================================================
+# 요청 본문 파싱
+# ==============================================================================
+def large_request_body(scale=40):
+    """목록 항목을 scale배로 늘린 /generate 요청 본문 (JSON 바이트)"""
+    handoffs = copy.deepcopy(REAL_SAMPLE_DATA)
+    for area in handoffs['step_2_1_pestel']['pestel'].values():
+        area['issues'] = area['issues'] * scale
+    swot = handoffs['step_3_3_swot']
+    for quadrant in ('strengths', 'weaknesses', 'opportunities', 'threats'):
+        swot[quadrant] = swot[quadrant] * scale
+    for stype, options in handoffs['step_3_4_tows']['strategy_options'].items():
+        handoffs['step_3_4_tows']['strategy_options'][stype] = options * scale
+    handoffs['step_3_2_vrio']['resource_identification']['resources'] *= scale
+
+    transformed = {'sections': {key: {'content': sample_markdown(step) * 4}
+                                for key, step in handoffs.items()}}
+    body = {'meta': {'business_name': 'G임팩트'}, 'handoffs': handoffs, 'transformed': transformed,
+            'options': {'businessName': 'G임팩트'}}
+    return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+def bench_request_parse():
+    """요청 본문 파싱 + 핸드오프 정규화
+
+    - 기존: json.loads → handoffs: Dict[str, Any] (검증 없음, 점수 변환은 렌더러에서)
+    - dict 경유: json.loads → 같은 단계별 스키마로 검증 (FastAPI 기본 본문 처리)
+    - 바이트 직접: model_validate_json (pdf_api_server.parse_generate_request)
+    pydantic 2.5의 JSON 파서는 한글 문자열이 많으면 json.loads보다 느려서 dict 경유와 비슷하거나
+    약간 느림 - 검증 비용 자체는 렌더링 전에 한 번만 내고, 잘못된 본문은 렌더링 없이 422
+    """
+    from typing import Any, Dict
+
+    from pydantic import BaseModel
+
+    import pdf_api_server as api
+    from handoff_models import parse_handoffs
+
+    class LegacyGenerateRequest(BaseModel):
+        meta: api.ReportMeta
+        handoffs: Dict[str, Any]
+        transformed: api.TransformedData
+        options: api.ReportOptions
+
+    body = large_request_body()
+
+    def legacy():
+        request = LegacyGenerateRequest.model_validate(json.loads(body))
+        parse_handoffs(dict(request.handoffs))
+
+    def via_dict():
+        request = api.GenerateRequest.model_validate(json.loads(body))
+        parse_handoffs(request.handoffs)
+
+    def direct():
+        request = api.GenerateRequest.model_validate_json(body)
+        parse_handoffs(request.handoffs)
+
+    direct_time = timeit(direct, repeat=20)
+    print(f"요청 본문: {len(body)/1024:.0f}KB")
+    report("검증 없음 → 바이트 직접 검증", timeit(legacy, repeat=20), direct_time)
+    report("dict 경유 검증 → 바이트 직접", timeit(via_dict, repeat=20), direct_time)
+
+def bench_blob_refs():
+    """반복 렌더링 요청: 전체 본문 vs 블롭 해시 참조 (handoffRefs/transformedRefs)
+
+    참조 요청은 블롭이 이미 서버에 있는 경우 (두 번째 렌더링부터) - 파싱된 블롭은 프로세스 캐시에서 재사용
+    """
+    import hashlib
+
+    import blob_store
+    import pdf_api_server as api
+
+    body = large_request_body()
+    full = json.loads(body)
+    with tempfile.TemporaryDirectory() as tmp:
+        blob_store._store = blob_store.BlobStore(tmp)  # 서버 전역 저장소 대신 임시 폴더
+        api._parsed_handoff_blob.cache_clear()
+        api._parsed_section_blob.cache_clear()
+
+        def upload(items):
+            refs = {}
+            for key, value in items.items():
+                text = json.dumps(value, ensure_ascii=False)
+                refs[key] = hashlib.sha256(text.encode('utf-8')).hexdigest()
+                blob_store._store.put(refs[key], text)
+            return refs
+
+        refs_body = json.dumps({
+            'meta': full['meta'], 'options': full['options'], 'transformed': {'sections': {}},
+            'handoffRefs': upload(full['handoffs']), 'transformedRefs': upload(full['transformed']['sections']),
+        }).encode('utf-8')
+
+        def parse_full():
+            api.GenerateRequest.model_validate_json(body)
+
+        def parse_refs():
+            request = api.GenerateRequest.model_validate_json(refs_body)
+            assert not api.resolve_handoff_refs(request) and not api.resolve_transformed_refs(request)
+
+        print(f"요청 본문: 전체 {len(body)/1024:.0f}KB → 참조 {len(refs_body)/1024:.1f}KB")
+        report("요청 파싱 (반복 렌더링)", timeit(parse_full, repeat=20), timeit(parse_refs, repeat=20))
+        blob_store._store = None
+
+# ==============================================================================
+# 코호트 벤치마킹
+# ==============================================================================
+def bench_cohort(companies=5000):
+    """코호트 통계 (지표별 백분위/표준점수/순위)
+
+    - 기존: 기업마다 정렬된 값에 bisect (지표 × 기업 파이썬 루프)
+    - 개선: cohort.Cohort (열 단위 NumPy 연산)
+    지표 행렬 적재(기업별 parse_handoffs)는 따로 측정
+    """
+    import bisect
+    import statistics
+
+    import numpy as np
+
+    from cohort import Cohort, company_metrics
+
+    rng = np.random.default_rng(0)
+    base = company_metrics(REAL_SAMPLE_DATA)
+    columns = list(base)
+    values = np.clip(np.array(list(base.values())) + rng.normal(0, 0.8, (companies, len(columns))), 0, None)
+    values[rng.random(values.shape) < 0.05] = np.nan  # 일부 지표 누락
+    names = [f'기업{i:05d}' for i in range(companies)]
+
+    def python_loop():
+        for j in range(len(columns)):
+            column = [v for v in values[:, j].tolist() if v == v]
+            ordered = sorted(column)
+            mean, std = statistics.fmean(column), statistics.pstdev(column)
+            for v in values[:, j].tolist():
+                if v == v:
+                    below, upto = bisect.bisect_left(ordered, v), bisect.bisect_right(ordered, v)
+                    (below + upto) * 50.0 / len(ordered), (v - mean) / std if std else 0.0, len(ordered) - upto + 1
+
+    def vectorized():
+        Cohort(names, columns, values)
+
+    sample = [(f'기업{i}', REAL_SAMPLE_DATA) for i in range(200)]
+    load = timeit(lambda: Cohort.from_companies(sample), repeat=3)
+    print(f"코호트: 기업 {companies}곳 × 지표 {len(columns)}개")
+    report("백분위/표준점수/순위", timeit(python_loop, repeat=3), timeit(vectorized))
+    print(f"지표 행렬 적재: 기업당 {load / len(sample) * 1000:.3f}ms (핸드오프 정규화 포함)")
+
+# ==============================================================================
+# AI 변환 파이프라인
+# ==============================================================================
+def bench_transform(latency=0.2, concurrency=4):
+    """섹션 9개 + 경영진 요약 변환 (StubBackend가 호출마다 latency초 대기)
+
+    - 기존: 한 번에 하나씩 (Apps Script transformAllWithAI_V4 - 호출 사이 1초 대기는 제외)
+    - 개선: ai_transform.Transformer 동시 호출 (속도 제한 없음)
+    - 재변환: 핸드오프가 그대로인 두 번째 요청 (변환 캐시 적중, LLM 호출 없음)
+    """
+    import asyncio
+
+    from ai_transform import StubBackend, Transformer
+    from transform_cache import TransformCache
+
+    def run(n, cache=None):
+        transformer = Transformer(StubBackend(latency), concurrency=n, rate=0, cache=cache)
+        transformed, stats = asyncio.run(transformer.transform_all(REAL_SAMPLE_DATA, '샘플기업'))
+        assert not stats['failed'] and transformed['executiveSummary']
+        return stats['calls']
+
+    calls = run(1)
+    print(f"호출 {calls}회, 호출당 응답 {latency*1000:.0f}ms, 동시 {concurrency}개 "
+          f"(Apps Script는 호출마다 1초 추가 대기 - 약 {calls}초)")
+    concurrent = timeit(lambda: run(concurrency), repeat=1)
+    report("AI 변환 전체", timeit(lambda: run(1), repeat=1), concurrent)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TransformCache(os.path.join(tmp, 'transforms.sqlite3'))
+        run(concurrency, cache)
+        report("AI 변환 (변경 없음, 캐시)", concurrent, timeit(lambda: run(concurrency, cache)))
+        cache.close()
+
+# ==============================================================================
+# 실행
+# ==============================================================================
+BENCHMARKS = {
+    'string-width': bench_string_width,
+    'import-time': bench_import_time,
+    'fragments': bench_fragments,
+    'markdown': bench_markdown,
+    'request-parse': bench_request_parse,
+    'blob-refs': bench_blob_refs,
+    'cohort': bench_cohort,
+    'transform': bench_transform,
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='G-IMPACT 성능 측정')
+    parser.add_argument('names', nargs='*', metavar='name', help=f"실행할 측정 {list(BENCHMARKS)} (기본: 전체)")
+    args = parser.parse_args()
+    unknown = [n for n in args.names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"알 수 없는 측정: {', '.join(unknown)}")
+    for name in args.names or BENCHMARKS:
+        print(f"\n[{name}]")
+        BENCHMARKS[name]()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 콘텐츠 주소 블롭 저장소
+요청 본문의 핸드오프/AI 변환 섹션을 SHA-256 해시로 저장해 반복 렌더링 시 다시 받지 않음
+
+업로드 프로토콜 (2단계):
+1. 클라이언트가 항목별 JSON 텍스트의 SHA-256(hex)을 POST /blobs/missing으로 보냄
+2. 서버에 없는 해시만 POST /blobs {해시: JSON 텍스트}로 업로드 (서버가 해시 재계산해 확인)
+3. /generate, /validate는 본문 대신 handoffRefs {단계: 해시}, transformedRefs {섹션: 해시}로 참조
+
+구조:
+- 블롭은 BLOB_DIR/<해시>.json 파일 하나 (내용이 해시로 정해지므로 덮어쓰기/잠금 불필요)
+- 전체 크기가 상한(GIMPACT_BLOB_CACHE_MB)을 넘으면 오래 안 쓴 블롭부터 삭제 (읽을 때 mtime 갱신)
+- 삭제된 블롭을 참조하면 422 not_found - 클라이언트는 본문으로 다시 보냄
+"""
+
+import hashlib
+import os
+import re
+import threading
+
+# ==============================================================================
+# 설정
+# ==============================================================================
+BLOB_DIR = os.environ.get('GIMPACT_BLOB_DIR') or os.path.join(
+    os.environ.get('GIMPACT_CACHE_DIR', os.path.expanduser('~/.cache/gimpact')), 'blobs')
+
+# 저장소 전체 크기 상한 - 넘으면 오래 안 쓴 블롭부터 삭제
+BLOB_MAX_BYTES = int(os.environ.get('GIMPACT_BLOB_CACHE_MB', '256')) * 1024 * 1024
+
+BLOB_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+def blob_hash(text):
+    """JSON 텍스트(str 또는 UTF-8 바이트)의 SHA-256 hex"""
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return hashlib.sha256(text).hexdigest()
+
+# ==============================================================================
+# 저장소
+# ==============================================================================
+class BlobStore:
+    """디스크 블롭 저장소 (크기 상한 초과 시 LRU 삭제)"""
+
+    def __init__(self, directory=BLOB_DIR, max_bytes=BLOB_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._prune_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, digest):
+        if not BLOB_HASH_PATTERN.match(digest):
+            raise ValueError(f"SHA-256 hex 해시가 아닙니다: {digest!r}")
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def missing(self, digests):
+        """저장소에 없는 해시 (요청 순서 유지, 중복 제거)"""
+        return [d for d in dict.fromkeys(digests) if not os.path.exists(self._path(d))]
+
+    def put(self, digest, text):
+        """블롭 저장 - 해시가 내용과 다르면 ValueError
+
+        Returns:
+            새로 저장했으면 True, 이미 있으면 False
+        """
+        data = text.encode('utf-8') if isinstance(text, str) else text
+        actual = blob_hash(data)
+        if actual != digest:
+            raise ValueError(f"내용의 SHA-256이 다릅니다: {actual}")
+        path = self._path(digest)
+        if os.path.exists(path):
+            os.utime(path)
+            return False
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return True
+
+    def touch(self, digest):
+        """블롭이 있으면 최근 사용 표시 후 True (삭제된 블롭은 False)"""
+        try:
+            os.utime(self._path(digest))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def get(self, digest):
+        """블롭 바이트 (없으면 None), 최근 사용 표시"""
+        path = self._path(digest)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def prune(self):
+        """전체 크기가 상한을 넘으면 오래 안 쓴 블롭부터 삭제 → 삭제한 개수"""
+        with self._prune_lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.json'):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+            return removed
+
+# 서버 프로세스당 하나
+_store = None
+_store_lock = threading.Lock()
+
+def get_blob_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BlobStore()
+        return _store
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 작업 완료 콜백 (웹훅)
+options.callbackUrl이 있는 /generate 요청은 바로 202로 응답하고, 작업이 끝나면 완료 알림을 POST
+
+알림 본문 (JSON):
+    {event: report.completed | report.failed, jobId, status, businessName, generatedAt, finishedAt,
+     reports: {summary|detail: {url, expiresAt, pages, bytes}},
+     timings: {transform_ms, summary_ms, detail_ms, total_ms, summary|detail: {구간: {ms, count}}}, warnings, error}
+    reports.*.url은 산출물 저장소의 유효 시간이 짧은 URL (만료 후에는 GET /jobs/{id}/reports/{보고서})
+
+서명 (GIMPACT_CALLBACK_SECRET 공유 비밀키):
+- X-GImpact-Timestamp: 보낸 시각 (유닉스 초)
+- X-GImpact-Signature: sha256=HMAC-SHA256(비밀키, "{timestamp}." + 본문 바이트) hex
+- X-GImpact-Delivery: 알림 ID (재시도해도 같음 - 수신 측 중복 제거용)
+수신 측은 verify_signature로 확인하고 timestamp가 오래된 알림은 버림 (재전송 공격 방지)
+
+재시도:
+- 연결 실패/타임아웃/429/5xx는 지수 백오프(+지터)로 최대 GIMPACT_CALLBACK_ATTEMPTS번
+- 그 외 4xx는 수신 측이 거부한 것으로 보고 중단
+- 전달 결과는 작업 이벤트 'callback' {delivered, attempts, status, error}로 남음 (GET /jobs/{id})
+
+사용법 (로컬 수신 서버 - 테스트용):
+    python callbacks.py --listen 9000              # 받은 알림을 서명 확인 후 출력
+    python callbacks.py --listen 9000 --fail 2     # 처음 2번은 503으로 응답 (재시도 확인)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import http.client
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit
+
+from ai_transform import backoff_delay
+
+# ==============================================================================
+# 설정
+# ==============================================================================
+# 비밀키가 없으면 서버는 callbackUrl 요청을 422로 거부 (빈 키로 서명한 알림은 누구나 위조 가능)
+CALLBACK_SECRET = os.environ.get('GIMPACT_CALLBACK_SECRET', '').strip()
+CALLBACK_ATTEMPTS = max(1, int(os.environ.get('GIMPACT_CALLBACK_ATTEMPTS', '6')))
+CALLBACK_BACKOFF = float(os.environ.get('GIMPACT_CALLBACK_BACKOFF', '2'))
+CALLBACK_TIMEOUT = 10
+
+# 수신 측이 받아들이는 timestamp 오차 (초)
+SIGNATURE_TOLERANCE = 300
+
+SIGNATURE_HEADER = 'X-GImpact-Signature'
+TIMESTAMP_HEADER = 'X-GImpact-Timestamp'
+DELIVERY_HEADER = 'X-GImpact-Delivery'
+
+class CallbackError(Exception):
+    """콜백 전송 실패 (retryable이면 백오프 후 재시도)"""
+
+    def __init__(self, message, retryable=True, status=None, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.status = status
+        self.retry_after = retry_after
+
+# ==============================================================================
+# 서명
+# ==============================================================================
+def sign(body, timestamp, secret=CALLBACK_SECRET):
+    """본문 바이트 + timestamp → 'sha256=<hex>'"""
+    mac = hmac.new(secret.encode('utf-8'), f"{timestamp}.".encode('ascii') + body, hashlib.sha256)
+    return 'sha256=' + mac.hexdigest()
+
+def verify_signature(body, timestamp, signature, secret=CALLBACK_SECRET, tolerance=SIGNATURE_TOLERANCE):
+    """수신 측 확인 - 서명이 맞고 timestamp가 tolerance초 안이면 True"""
+    try:
+        age = abs(time.time() - int(timestamp))
+    except (TypeError, ValueError):
+        return False
+    if age > tolerance or not signature:
+        return False
+    return hmac.compare_digest(sign(body, timestamp, secret), signature)
+
+# ==============================================================================
+# 전송
+# ==============================================================================
+def check_callback_url(url):
+    """콜백 URL 확인 - urllib로 열 수 없는 URL이면 ValueError (요청 검증에서 422)"""
+    try:
+        parts = urlsplit(url)
+        parts.port  # 숫자가 아니거나 범위 밖 포트는 여기서 ValueError
+    except ValueError as e:
+        raise ValueError(f"콜백 URL 형식이 잘못되었습니다: {e}") from None
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError("콜백 URL은 호스트가 있는 http(s) 주소여야 합니다")
+    return url
+
+def post_notice(url, body, delivery_id, secret=CALLBACK_SECRET, timeout=CALLBACK_TIMEOUT):
+    """서명한 알림을 한 번 POST → HTTP 상태 코드
+
+    Raises:
+        CallbackError: 연결 실패 또는 2xx가 아닌 응답
+    """
+    timestamp = str(int(time.time()))
+    try:
+        request = urllib.request.Request(url, data=body, method='POST', headers={
+            'Content-Type': 'application/json; charset=utf-8',
+            'User-Agent': 'G-IMPACT-PDF-Server',
+            TIMESTAMP_HEADER: timestamp,
+            SIGNATURE_HEADER: sign(body, timestamp, secret),
+            DELIVERY_HEADER: delivery_id,
+        })
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        retry_after = e.headers.get('Retry-After')
+        raise CallbackError(f"콜백 응답 오류 ({e.code})", retryable=e.code == 429 or e.code >= 500, status=e.code,
+                            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None)
+    except (urllib.error.URLError, TimeoutError, OSError) as e:
+        raise CallbackError(f"콜백 연결 실패: {e}")
+    except (ValueError, http.client.InvalidURL) as e:
+        # 열 수 없는 URL - 다시 보내도 같으므로 재시도하지 않음
+        raise CallbackError(f"콜백 URL 오류: {e}", retryable=False)
+
+async def deliver(url, notice, secret=CALLBACK_SECRET, attempts=CALLBACK_ATTEMPTS, backoff=CALLBACK_BACKOFF,
+                  timeout=CALLBACK_TIMEOUT):
+    """알림 전달 (재시도 포함) → {delivered, attempts, status, error}"""
+    if not secret:
+        return {'delivered': False, 'attempts': 0, 'status': None,
+                'error': "콜백 서명 키(GIMPACT_CALLBACK_SECRET)가 없어 보내지 않았습니다"}
+    attempts = max(1, attempts)
+    body = json.dumps(notice, ensure_ascii=False).encode('utf-8')
+    delivery_id = uuid.uuid4().hex
+    error = None
+    for attempt in range(attempts):
+        try:
+            status = await asyncio.to_thread(post_notice, url, body, delivery_id, secret, timeout)
+            return {'delivered': True, 'attempts': attempt + 1, 'status': status, 'error': None}
+        except CallbackError as e:
+            error = e
+            print(f"콜백 실패 ({attempt + 1}/{attempts}): {url} - {e}")
+            if not e.retryable or attempt == attempts - 1:
+                break
+            await asyncio.sleep(e.retry_after or backoff_delay(attempt, backoff, cap=300.0))
+    return {'delivered': False, 'attempts': attempt + 1, 'status': error.status, 'error': str(error)}
+
+# ==============================================================================
+# 로컬 수신 서버 (테스트용)
+# ==============================================================================
+def make_handler(secret=CALLBACK_SECRET, fail=0, received=None):
+    """수신 핸들러 클래스 - 처음 fail번은 503, 그 뒤로는 서명 확인 후 204/401
+
+    received: 리스트를 넘기면 받은 요청마다 {delivery, status, valid, notice}를 추가 (503 응답은 valid/notice None)
+    """
+    remaining = [fail]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            if remaining[0] > 0:
+                remaining[0] -= 1
+                self.send_response(503)
+                self.end_headers()
+                if received is not None:
+                    received.append({'delivery': self.headers.get(DELIVERY_HEADER), 'status': 503,
+                                     'valid': None, 'notice': None})
+                print(f"503 응답 (남은 실패 {remaining[0]}회)")
+                return
+            valid = verify_signature(body, self.headers.get(TIMESTAMP_HEADER),
+                                     self.headers.get(SIGNATURE_HEADER), secret)
+            self.send_response(204 if valid else 401)
+            self.end_headers()
+            notice = json.loads(body)
+            if received is not None:
+                received.append({'delivery': self.headers.get(DELIVERY_HEADER), 'status': 204 if valid else 401,
+                                 'valid': valid, 'notice': notice})
+            print(f"알림 {self.headers.get(DELIVERY_HEADER)} - 서명 {'확인' if valid else '불일치'}")
+            print(json.dumps(notice, ensure_ascii=False, indent=2), flush=True)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def serve(port, secret=CALLBACK_SECRET, fail=0):
+    """받은 알림의 서명을 확인해 출력 - 처음 fail번은 503으로 응답"""
+    print(f"콜백 수신 대기: http://127.0.0.1:{port}/", flush=True)
+    HTTPServer(('127.0.0.1', port), make_handler(secret, fail)).serve_forever()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='G-IMPACT 작업 완료 콜백 수신 서버 (테스트용)')
+    parser.add_argument('--listen', type=int, default=9000, help='포트')
+    parser.add_argument('--secret', default=CALLBACK_SECRET, help='서명 비밀키 (기본: GIMPACT_CALLBACK_SECRET)')
+    parser.add_argument('--fail', type=int, default=0, help='처음 N번은 503으로 응답')
+    args = parser.parse_args()
+    serve(args.listen, args.secret, args.fail)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 코호트 벤치마킹
+여러 기업의 핸드오프를 NumPy 배열 하나로 모아 지표별 백분위/표준점수/순위를 한 번에 계산
+
+구조:
+1. 기업마다 parse_handoffs로 정규화한 뒤 지표 행렬 (기업 수 × 지표 수)로 적재
+   - 경영진단 영역 점수, PESTEL 영역별 영향도/긴급도 평균, TOWS 최고/평균 종합점수
+   - 값이 없으면 NaN (지표마다 값이 있는 기업끼리만 비교)
+2. 평균/표준편차/표준점수는 행렬 연산, 백분위/순위는 지표별 정렬 한 번 (argsort)
+   - 동점은 정렬 배열의 같은 값 구간으로 처리 - 기업/지표 축 모두 파이썬 루프 없음
+3. 기업별 CohortBenchmark를 분석 리포트에 넘기면 경영진단 레이더 차트에 코호트 중앙값과 백분위 표시
+
+사용법:
+    python cohort.py companies/                 # 폴더의 JSON마다 지표별 순위 출력
+    python cohort.py companies/ --out reports/  # 기업별 분석 리포트 (코호트 백분위 포함)
+JSON 파일은 핸드오프 딕셔너리 또는 /generate 요청 본문 ({'meta', 'handoffs', ...})
+"""
+
+import argparse
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from handoff_models import parse_handoffs
+
+# ==============================================================================
+# 지표 추출
+# ==============================================================================
+def company_metrics(handoffs):
+    """기업 하나의 지표 {열 이름: 값} (값이 없는 지표는 빠짐)
+
+    열 이름: 'diagnosis.<영역>', 'pestel.<영역>.impact', 'pestel.<영역>.urgency',
+             'tows.top_score', 'tows.mean_score'
+    """
+    h = parse_handoffs(handoffs)
+    metrics = {f'diagnosis.{s.area}': s.score for s in h.diagnosis}
+    for area, issues in h.pestel.items():
+        if issues:
+            metrics[f'pestel.{area}.impact'] = sum(i.impact_score for i in issues) / len(issues)
+            metrics[f'pestel.{area}.urgency'] = sum(i.urgency_score for i in issues) / len(issues)
+    scores = [s.total_score for s in h.strategies]
+    if scores:
+        metrics['tows.top_score'] = max(scores)
+        metrics['tows.mean_score'] = sum(scores) / len(scores)
+    return metrics
+
+def company_name(body, default=''):
+    """요청 본문/핸드오프에서 기업명 (meta.business_name → PESTEL analysis_meta.company → default)"""
+    name = body.get('meta', {}).get('business_name') if isinstance(body.get('meta'), dict) else None
+    if not name:
+        handoffs = body.get('handoffs', body)
+        name = handoffs.get('step_2_1_pestel', {}).get('analysis_meta', {}).get('company')
+    return name or default
+
+# ==============================================================================
+# 코호트
+# ==============================================================================
+@dataclass(frozen=True)
+class CohortBenchmark:
+    """리포트에 넘기는 기업 하나의 경영진단 코호트 비교 (영역별 백분위 / 코호트 중앙값)
+
+    size: 코호트 전체 기업 수
+    counts: 영역별 비교 대상 수 (그 영역 점수가 있는 기업 수 - 백분위/중앙값의 기준, size 이하)
+    percentile: 0~100, 같은 점수는 절반만 아래로 셈 (중앙 순위 백분위)
+    """
+    size: int
+    percentiles: dict
+    medians: dict
+    counts: dict
+
+    def top_percent(self, area):
+        """'상위 N%' 표시용 N (1 이상 정수)"""
+        return max(1, round(100 - self.percentiles[area]))
+
+class Cohort:
+    """기업 수 × 지표 수 행렬과 지표별 통계
+
+    Attributes:
+        names: 기업명 목록 (행 순서)
+        columns: 지표 이름 목록 (열 순서)
+        values: (기업, 지표) float 행렬, 값 없음 = NaN (inf도 값 없음으로 취급)
+        counts: 지표별 값이 있는 기업 수
+        mean, std, median: 지표별 통계 (값 있는 기업 기준)
+        percentiles: 중앙 순위 백분위 (0~100, 값 없음 = NaN)
+        zscores: 표준점수 (표준편차 0이면 0, 값 없음 = NaN)
+        ranks: 높은 점수 1위, 동점은 같은 순위 (값 없음 = 0)
+    """
+
+    __slots__ = ('names', 'columns', 'values', 'counts', 'mean', 'std', 'median',
+                 'percentiles', 'zscores', 'ranks', '_rows')
+
+    def __init__(self, names, columns, values):
+        self.names = list(names)
+        self.columns = list(columns)
+        self.values = np.asarray(values, dtype=float).reshape(len(self.names), len(self.columns))
+        self._rows = {}
+        for i, name in enumerate(self.names):
+            self._rows.setdefault(name, i)
+        self._compute()
+
+    @classmethod
+    def from_companies(cls, companies):
+        """[(기업명, 핸드오프 딕셔너리 또는 Handoffs), ...] → Cohort (지표 열은 처음 나온 순서)"""
+        names, rows, columns = [], [], {}
+        for name, handoffs in companies:
+            metrics = company_metrics(handoffs)
+            for column in metrics:
+                columns.setdefault(column, len(columns))
+            names.append(name)
+            rows.append(metrics)
+
+        values = np.full((len(rows), len(columns)), np.nan)
+        for i, metrics in enumerate(rows):
+            values[i, [columns[c] for c in metrics]] = list(metrics.values())
+        return cls(names, list(columns), values)
+
+    def _compute(self):
+        values = self.values
+        valid = np.isfinite(values)
+        counts = valid.sum(axis=0)
+        n = np.maximum(counts, 1)
+
+        mean = np.where(valid, values, 0.0).sum(axis=0) / n
+        deviation = np.where(valid, values - mean, 0.0)
+        std = np.sqrt((deviation ** 2).sum(axis=0) / n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zscores = np.where(std > 0, deviation / std, 0.0)
+        zscores[~valid] = np.nan
+
+        # 지표별 정렬 후 동점 구간의 시작/끝 위치 = 그 값보다 작은 / 작거나 같은 기업 수
+        # 전치해서 지표마다 연속 메모리, 값 없음은 +inf로 바꿔 각 행의 앞 counts[j]개가 값 있는 기업
+        # (NaN이 섞이면 argsort가 느린 경로로 빠져 수 배 느려짐)
+        by_column = np.where(valid, values, np.inf).T.copy()
+        order = np.argsort(by_column, axis=1)  # 동점 순서는 결과와 무관 (구간 단위로 처리)
+        ordered = np.take_along_axis(by_column, order, axis=1)
+        size = ordered.shape[1]
+        position = np.broadcast_to(np.arange(size), ordered.shape)
+        run_start = np.ones(ordered.shape, dtype=bool)
+        run_start[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        run_end = np.ones(ordered.shape, dtype=bool)
+        run_end[:, :-1] = run_start[:, 1:]
+        below_sorted = np.maximum.accumulate(np.where(run_start, position, 0), axis=1)
+        upto_sorted = np.minimum.accumulate(np.where(run_end, position + 1, size)[:, ::-1], axis=1)[:, ::-1]
+        below = np.empty_like(below_sorted)
+        upto = np.empty_like(upto_sorted)
+        np.put_along_axis(below, order, below_sorted, axis=1)
+        np.put_along_axis(upto, order, upto_sorted, axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentiles = ((below + upto) * (50.0 / counts[:, None])).T
+        ranks = (counts[:, None] - upto + 1).T
+        median = np.full(len(counts), np.nan)
+        if size:
+            middle = np.maximum(counts - 1, 0)[:, None]
+            median = (np.take_along_axis(ordered, middle // 2, axis=1)
+                      + np.take_along_axis(ordered, (middle + 1) // 2, axis=1))[:, 0] / 2
+            median[counts == 0] = np.nan
+        percentiles[~valid] = np.nan
+        ranks[~valid] = 0
+
+        self.counts, self.mean, self.std, self.median = counts, mean, std, median
+        self.percentiles, self.zscores, self.ranks = percentiles, zscores, ranks
+
+    def __len__(self):
+        return len(self.names)
+
+    def row(self, name):
+        """기업명 → 행 번호 (이름이 겹치면 처음 나온 기업)"""
+        try:
+            return self._rows[name]
+        except KeyError:
+            raise KeyError(f"코호트에 없는 기업: {name}") from None
+
+    def standing(self, name):
+        """기업 하나의 지표별 위치 [{'column', 'value', 'percentile', 'zscore', 'rank', 'count'}, ...]"""
+        i = self.row(name)
+        return [
+            {'column': column, 'value': float(self.values[i, j]), 'percentile': float(self.percentiles[i, j]),
+             'zscore': float(self.zscores[i, j]), 'rank': int(self.ranks[i, j]), 'count': int(self.counts[j])}
+            for j, column in enumerate(self.columns)
+            if self.ranks[i, j]
+        ]
+
+    def ranking(self, column, top=None):
+        """지표 하나의 순위표 [(순위, 기업명, 값), ...] (값 없는 기업 제외)"""
+        j = self.columns.index(column)
+        rows = np.flatnonzero(self.ranks[:, j])
+        rows = rows[np.argsort(self.ranks[rows, j], kind='stable')][:top]
+        return [(int(self.ranks[i, j]), self.names[i], float(self.values[i, j])) for i in rows]
+
+    def benchmark(self, name):
+        """리포트용 경영진단 코호트 비교 (경영진단 점수가 없으면 None)"""
+        i = self.row(name)
+        percentiles, medians, counts = {}, {}, {}
+        for j, column in enumerate(self.columns):
+            if column.startswith('diagnosis.') and self.ranks[i, j]:
+                area = column[len('diagnosis.'):]
+                percentiles[area] = round(float(self.percentiles[i, j]), 1)
+                medians[area] = round(float(self.median[j]), 2)
+                counts[area] = int(self.counts[j])
+        if not percentiles:
+            return None
+        return CohortBenchmark(len(self), percentiles, medians, counts)
+
+# ==============================================================================
+# 불러오기 / 리포트
+# ==============================================================================
+def load_cohort(paths):
+    """JSON 파일 목록 → Cohort (기업명이 없으면 파일 이름), 읽지 못한 파일은 건너뜀"""
+    companies = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                body = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"코호트 파일 로드 실패 ({path}): {e}")
+            continue
+        default = os.path.splitext(os.path.basename(path))[0]
+        companies.append((company_name(body, default), body.get('handoffs', body)))
+    return Cohort.from_companies(companies), dict(companies)
+
+def print_rankings(cohort, top=5):
+    """지표별 상위 기업과 코호트 평균/중앙값"""
+    for j, column in enumerate(cohort.columns):
+        print(f"\n{column}  (기업 {cohort.counts[j]}곳, 평균 {cohort.mean[j]:.2f}, "
+              f"중앙값 {cohort.median[j]:.2f}, 표준편차 {cohort.std[j]:.2f})")
+        for rank, name, value in cohort.ranking(column, top):
+            print(f"  {rank:>4}위  {name:<20} {value:.2f}")
+
+def generate_cohort_reports(cohort, handoffs_by_name, output_dir):
+    """기업별 분석 리포트 (경영진단 차트에 코호트 백분위 표시)"""
+    from analysis_report_generator import generate_analysis_report
+
+    os.makedirs(output_dir, exist_ok=True)
+    for name, handoffs in handoffs_by_name.items():
+        output_path = os.path.join(output_dir, f"{name}_분석리포트.pdf")
+        generate_analysis_report(handoffs, output_path, name, benchmark=cohort.benchmark(name))
+        print(f"PDF 생성 완료: {output_path}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='G-IMPACT 코호트 벤치마킹')
+    parser.add_argument('directory', help='기업별 핸드오프 JSON 폴더')
+    parser.add_argument('--out', help='기업별 분석 리포트 출력 폴더 (없으면 순위만 출력)')
+    parser.add_argument('--top', type=int, default=5, help='지표별 출력할 상위 기업 수')
+    args = parser.parse_args()
+
+    paths = sorted(os.path.join(args.directory, n) for n in os.listdir(args.directory) if n.endswith('.json'))
+    cohort, handoffs_by_name = load_cohort(paths)
+    print(f"코호트: 기업 {len(cohort)}곳, 지표 {len(cohort.columns)}개")
+    print_rankings(cohort, args.top)
+    if args.out:
+        generate_cohort_reports(cohort, handoffs_by_name, args.out)
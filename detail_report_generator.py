@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 상세 보고서 생성기
+AI 변환 텍스트(transformed.sections, 마크다운)를 상세 보고서 PDF로 렌더링
+
+구조:
+1. 표지 / 목차 (섹션 시작 페이지는 빌드 중 기록해 단일 패스로 채움)
+2. 경영진 요약 (transformed.executiveSummary)
+3. 섹션별 본문 (PESTEL ~ TOWS 순서, 섹션마다 새 페이지)
+   - 본문 앞에 핸드오프 핵심 수치 표 (요약 보고서와 같은 Handoffs 레코드 사용)
+
+마크다운 컴파일:
+- 한 번 훑으면서 블록(제목/문단/목록/표/인용/구분선)과 인라인 서식(굵게/기울임/코드/링크)을 처리
+- 컴파일 결과(블록 튜플)는 내용 기준 LRU 캐시 - 같은 섹션을 다시 렌더링할 때 파싱 생략
+- Flowable은 레이아웃 중 상태가 바뀌므로 캐시하지 않고 빌드마다 블록에서 새로 생성
+"""
+
+import re
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, Table
+
+from analysis_report_generator import (
+    AnalysisReportBuilder, ReportTemplate, COLORS, FONT_BOLD,
+    DETAIL_SECTIONS, REPORT_SECTIONS, cover_elements, create_report_doc, format_report_date, get_table_style,
+    styled_table, timing_span,
+)
+from report_sections import detail_section_order
+
+# 컴파일 캐시 크기 (섹션 수 x 최근 리포트 수 정도)
+MARKDOWN_CACHE_SIZE = 256
+
+# 본문 폭 (AnalysisReportBuilder 표/박스와 동일)
+CONTENT_WIDTH = 450
+
+# ==============================================================================
+# 마크다운 컴파일러
+# ==============================================================================
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*$')
+_RULE_RE = re.compile(r'^(?:-{3,}|\*{3,}|_{3,})$')
+_BULLET_RE = re.compile(r'^(\s*)[-*+•]\s+(.*)$')
+_ORDERED_RE = re.compile(r'^(\s*)(\d+)[.)]\s+(.*)$')
+_QUOTE_RE = re.compile(r'^>\s?(.*)$')
+_TABLE_SEPARATOR_RE = re.compile(r'^:?-+:?$')
+
+_INLINE_RE = re.compile(
+    r'\*\*\*(.+?)\*\*\*'                       # 1: 굵은 기울임
+    r'|\*\*(.+?)\*\*|__(.+?)__'                # 2, 3: 굵게
+    r'|\*(?=\S)(.+?)(?<=\S)\*'                 # 4: 기울임
+    r'|(?<![\w])_(?=\S)(.+?)(?<=\S)_(?![\w])'  # 5: 기울임 (단어 안의 _는 제외)
+    r'|`([^`]+)`'                              # 6: 코드
+    r'|\[([^\]]+)\]\(([^)\s]+)\)'              # 7, 8: 링크
+)
+
+def _inline_sub(m):
+    bold_italic, bold, bold2, italic, italic2, code, link_text, link_url = m.groups()
+    if bold_italic is not None:
+        return f"<b><i>{_INLINE_RE.sub(_inline_sub, bold_italic)}</i></b>"
+    if bold is not None or bold2 is not None:
+        return f"<b>{_INLINE_RE.sub(_inline_sub, bold or bold2)}</b>"
+    if italic is not None or italic2 is not None:
+        return f"<i>{_INLINE_RE.sub(_inline_sub, italic or italic2)}</i>"
+    if code is not None:
+        return f'<font color="#B45309">{code}</font>'
+    url = link_url.replace('"', '&quot;')
+    return f'<link href="{url}" color="#2563EB">{_INLINE_RE.sub(_inline_sub, link_text)}</link>'
+
+def render_inline(text):
+    """인라인 마크다운 → ReportLab Paragraph 마크업 (HTML 특수문자는 이스케이프)"""
+    return _INLINE_RE.sub(_inline_sub, escape(text))
+
+def _split_row(line):
+    """'| a | b |' → ['a', 'b']"""
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|'):
+        line = line[:-1]
+    return [cell.strip() for cell in line.split('|')]
+
+def _compile_table(lines):
+    """표 줄 목록 → ('table', 행 튜플, 헤더 여부, 열 정렬)"""
+    rows = [_split_row(line) for line in lines]
+    has_header = len(rows) > 1 and all(_TABLE_SEPARATOR_RE.match(c) for c in rows[1] if c)
+    aligns = ()
+    if has_header:
+        aligns = tuple(
+            'center' if c.startswith(':') and c.endswith(':') else 'right' if c.endswith(':') else 'left'
+            for c in rows[1]
+        )
+        del rows[1]
+    n_cols = max(len(r) for r in rows)
+    aligns = (aligns + ('left',) * n_cols)[:n_cols]
+    cells = tuple(tuple(render_inline(c) for c in r + [''] * (n_cols - len(r))) for r in rows)
+    return ('table', cells, has_header, aligns)
+
+@lru_cache(maxsize=MARKDOWN_CACHE_SIZE)
+def compile_markdown(text):
+    """마크다운 → 블록 튜플 (한 번 훑어 컴파일, 내용 기준 LRU 캐시)
+
+    블록:
+        ('heading', 수준, 마크업)
+        ('para', 마크업)
+        ('bullet', 깊이, 마크업)
+        ('ordered', 깊이, 번호, 마크업)
+        ('quote', 마크업)
+        ('table', 셀 마크업 행들, 헤더 여부, 열 정렬)
+        ('rule',)
+    """
+    blocks = []
+    para = []   # 이어지는 문단 줄 (한 문단으로 합침)
+    table = []  # 이어지는 표 줄
+
+    def flush():
+        if para:
+            blocks.append(('para', render_inline(' '.join(para))))
+            para.clear()
+        if table:
+            blocks.append(_compile_table(table))
+            table.clear()
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            flush()
+            continue
+
+        if stripped.startswith('|'):
+            if para:
+                flush()
+            table.append(stripped)
+            continue
+        if table:
+            flush()
+
+        m = _HEADING_RE.match(stripped)
+        if m:
+            flush()
+            blocks.append(('heading', len(m.group(1)), render_inline(m.group(2))))
+            continue
+        if _RULE_RE.match(stripped):
+            flush()
+            blocks.append(('rule',))
+            continue
+        m = _BULLET_RE.match(line)
+        if m:
+            flush()
+            blocks.append(('bullet', len(m.group(1).expandtabs(4)) // 2, render_inline(m.group(2))))
+            continue
+        m = _ORDERED_RE.match(line)
+        if m:
+            flush()
+            blocks.append(('ordered', len(m.group(1).expandtabs(4)) // 2, m.group(2),
+                           render_inline(m.group(3))))
+            continue
+        m = _QUOTE_RE.match(stripped)
+        if m:
+            flush()
+            blocks.append(('quote', render_inline(m.group(1))))
+            continue
+        para.append(stripped)
+
+    flush()
+    return tuple(blocks)
+
+# ==============================================================================
+# 블록 → Flowable
+# ==============================================================================
+_derived_styles = {}
+
+def _derived_style(base, name, **overrides):
+    """공용 스타일에서 파생한 스타일 (프로세스당 한 번 생성)"""
+    style = _derived_styles.get(name)
+    if style is None:
+        style = _derived_styles[name] = ParagraphStyle(name, parent=base, **overrides)
+    return style
+
+_ALIGNMENTS = {'left': TA_LEFT, 'center': TA_CENTER, 'right': TA_RIGHT}
+
+def _list_style(styles, depth):
+    if depth == 0:
+        return styles['KBullet']
+    return _derived_style(styles['KBullet'], f'KBullet{depth}', leftIndent=15 + 14 * depth)
+
+def _table_cell_style(styles, header, align):
+    if header:
+        return _derived_style(styles['SWOTCell'], f'MDHeader_{align}', fontName=FONT_BOLD,
+                              textColor=colors.white, alignment=_ALIGNMENTS[align])
+    return _derived_style(styles['SWOTCell'], f'MDCell_{align}', textColor=COLORS['dark'],
+                          alignment=_ALIGNMENTS[align])
+
+# ==============================================================================
+# 상세 보고서 빌더
+# ==============================================================================
+class DetailReportGenerator(AnalysisReportBuilder):
+    """AI 변환 텍스트 기반 상세 보고서
+
+    Args:
+        data: 핸드오프 데이터 (본문은 transformed, 핵심 수치 표만 핸드오프 사용)
+        transformed: {'sections': {섹션 키: {'content': 마크다운} | 문자열}, 'executiveSummary': 마크다운}
+        company_name: 회사명
+        handoffs: 요청에서 이미 정규화한 Handoffs (요약 보고서와 공유, 없으면 data에서 파싱)
+        progress: 진행 콜백 progress(event, **fields) - 섹션 빌드/배치 이벤트 (jobs.py)
+        report_date: 표지/푸터 생성일 (date 또는 'YYYY-MM-DD', 기본 오늘)
+        invariant: ReportLab 고정 출력 (report_date와 함께 주면 같은 입력에서 같은 바이트)
+    """
+
+    def __init__(self, data, transformed, company_name, handoffs=None, progress=None, report_date=None,
+                 invariant=False):
+        AnalysisReportBuilder.__init__(self, data, company_name, handoffs=handoffs, progress=progress)
+        self.transformed = transformed or {}
+        self.report_date = report_date
+        self.invariant = invariant
+        self.page_count = 0
+
+    def section_keys(self):
+        """본문 섹션 순서 (레지스트리 순서, 레지스트리에 없는 섹션은 뒤에 받은 순서대로)"""
+        return detail_section_order(self.transformed.get('sections') or {})[0]
+
+    def dropped_section_keys(self):
+        """받았지만 상세 본문에 넣지 않는 섹션 키 (요약 섹션 키 - 서버는 응답 warnings로 알림)"""
+        return detail_section_order(self.transformed.get('sections') or {})[1]
+
+    def add_markdown(self, text):
+        """마크다운 본문 추가 (컴파일 결과는 캐시, Flowable은 새로 생성)"""
+        styles = self.styles
+        for block in compile_markdown(text):
+            kind = block[0]
+            if kind == 'para':
+                self.elements.append(Paragraph(block[1], styles['KBody']))
+            elif kind == 'heading':
+                style = styles['KH2'] if block[1] <= 2 else styles['KH3']
+                self.elements.append(Paragraph(block[2], style))
+            elif kind == 'bullet':
+                self.elements.append(Paragraph(f"• {block[2]}", _list_style(styles, block[1])))
+            elif kind == 'ordered':
+                self.elements.append(Paragraph(f"{block[2]}. {block[3]}", _list_style(styles, block[1])))
+            elif kind == 'quote':
+                self.add_highlight_box(block[1])
+            elif kind == 'table':
+                self._add_markdown_table(*block[1:])
+            elif kind == 'rule':
+                self.add_line()
+
+    def add_key_figures(self, key):
+        """섹션 핵심 수치 표 (핸드오프에 해당 수치가 없으면 생략)"""
+        rows = self.handoffs.key_figures(key)
+        if rows:
+            self.elements.append(styled_table([['핵심 지표', '값']] + rows, col_widths=[270, 180]))
+            self.add_spacer(10)
+
+    def _add_markdown_table(self, rows, has_header, aligns):
+        data = [
+            [Paragraph(cell, _table_cell_style(self.styles, has_header and i == 0, align))
+             for cell, align in zip(row, aligns)]
+            for i, row in enumerate(rows)
+        ]
+        table = Table(data, colWidths=[CONTENT_WIDTH / len(aligns)] * len(aligns),
+                      repeatRows=1 if has_header else 0)
+        table.setStyle(get_table_style('markdown', len(rows), has_header))
+        self.add_spacer(4)
+        self.elements.append(table)
+        self.add_spacer(8)
+
+    # ==========================================================================
+    # 빌드
+    # ==========================================================================
+    def build(self):
+        """목차 → 경영진 요약 → 섹션별 본문"""
+        keys = self.section_keys()
+        executive = self.transformed.get('executiveSummary')
+        dropped = self.dropped_section_keys()
+        if dropped:
+            print(f"상세 보고서 본문이 없는 섹션 제외: {', '.join(dropped)}")
+
+        toc_items = []
+        if executive:
+            toc_items.append(('executive', '경영진 요약', 'AI 종합 요약'))
+        for key in keys:
+            section = REPORT_SECTIONS.get(key)
+            toc_items.append((key, section.title if section else key, section.desc if section else ''))
+        if not toc_items:
+            # AI 변환 결과가 하나도 없으면 목차 대신 안내 페이지 (빈 목차 표는 ReportLab이 거부)
+            self.add_h1("상세 분석")
+            self.add_line()
+            self.add_small("AI 변환된 섹션이 없습니다. 핸드오프를 변환한 뒤 다시 생성하세요 (options.transform).")
+            return self.elements
+        self.build_table_of_contents(toc_items)
+
+        total = len(keys) + bool(executive)
+        if executive:
+            with timing_span('build.executive'):
+                self.add_h1("📈 경영진 요약", toc_key='executive')
+                self.add_line()
+                self.add_markdown(executive)
+                self.add_page_break()
+            self.section_built('executive', 1, total)
+
+        sections = self.transformed.get('sections') or {}
+        for index, key in enumerate(keys, start=total - len(keys) + 1):
+            with timing_span(f"build.{key}"):
+                section = REPORT_SECTIONS.get(key)
+                self.add_h1(section.title if section else key, toc_key=key)
+                self.add_line()
+                self.add_key_figures(key)
+
+                section_data = sections[key]
+                if isinstance(section_data, dict):
+                    if section_data.get('error'):
+                        self.add_small(f"AI 변환 실패: {escape(str(section_data['error']))}")
+                    content = section_data.get('content') or ''
+                else:
+                    content = str(section_data)
+                if content:
+                    self.add_markdown(content)
+                self.add_page_break()
+            self.section_built(key, index, total)
+        return self.elements
+
+    def generate(self, output=None):
+        """PDF 생성 (output: 경로 또는 파일 객체, 기본 BytesIO) 후 output 반환"""
+        if output is None:
+            output = BytesIO()
+        scope = f"{len(self.section_keys())}개 섹션 상세 분석"
+        template = ReportTemplate(self.company_name, format_report_date(self.report_date), scope=scope,
+                                  title="상세 보고서")
+
+        doc = create_report_doc(output, self.progress, self.invariant)
+        elements = cover_elements() + self.build()
+        with timing_span('doc.build'):
+            doc.build(elements, onFirstPage=template.cover_page, onLaterPages=template.header_footer)
+        self.page_count = doc.page
+
+        if hasattr(output, 'seek'):
+            output.seek(0)
+        return output
+
+
+# ==============================================================================
+# 테스트
+# ==============================================================================
+if __name__ == '__main__':
+    sample = {
+        'executiveSummary': (
+            "## 핵심 결론\n"
+            "G임팩트는 **정부 정책 수혜**와 *조직 번아웃* 리스크가 공존합니다.\n\n"
+            "1. 조직 시스템화\n2. 공공 사업 수주\n3. B2B SaaS 확장\n"
+        ),
+        'sections': {
+            'swot': {'content': (
+                "### 강점\n- MYSC JV 파트너십\n  - 투자/네트워크 연계\n- 광주·전남 로컬 네트워크\n\n"
+                "| 구분 | 항목 | 점수 |\n|:---|---|---:|\n| S1 | MYSC JV | 5 |\n| W1 | 번아웃 | 5 |\n\n"
+                "> 조직 운영 시스템 개선 없이는 어떤 전략도 지속 불가능\n"
+            )},
+            'tows': {'content': "### 우선 전략\n**WO-1** 공공 자금 기반 조직 시스템화 (`24점`)\n\n---\n다음 단계: 실행"},
+        },
+    }
+    generator = DetailReportGenerator({}, sample, 'G임팩트')
+    generator.generate('detail_report_sample.pdf')
+    print(f"상세 보고서 생성 완료: detail_report_sample.pdf ({generator.page_count}페이지)")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 폰트 캐시
+파싱된 TTF 폰트 정보를 디스크에 저장하고 프로세스 간 공유
+
+구조:
+1. TTF 파싱 결과(메트릭, 서브셋용 테이블 위치)를 pickle로 디스크 캐시
+2. 캐시는 mmap으로 로드, 폰트 원본도 mmap으로 열어 페이지 캐시 공유
+3. 프로세스당 한 번만 등록 (fork된 워커는 부모의 폰트를 copy-on-write로 공유)
+4. 한글 음절/구두점 조밀 폭 테이블로 stringWidth 가속
+5. Matplotlib 폰트 매니저 캐시(fontlist-*.json)에 나눔 폰트를 포함시켜 저장
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+from weakref import WeakKeyDictionary
+
+from reportlab import Version as REPORTLAB_VERSION
+from reportlab import rl_config
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace, TTEncoding
+
+# ==============================================================================
+# 설정
+# ==============================================================================
+CACHE_DIR = os.environ.get('GIMPACT_CACHE_DIR', os.path.expanduser('~/.cache/gimpact'))
+FONT_CACHE_DIR = os.path.join(CACHE_DIR, 'fonts')
+
+# 캐시 포맷이 바뀌면 올려서 기존 캐시 무효화
+FONT_CACHE_VERSION = 1
+
+NANUM_FONTS = {
+    'NanumGothic': '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    'NanumGothicBold': '/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf',
+}
+
+# 조밀 폭 테이블 범위: U+0000 ~ U+D7A3
+# (라틴, 일반 구두점 U+2000~, CJK 기호 U+3000~, 한글 자모, 한글 음절 블록 포함)
+WIDTH_TABLE_END = 0xD7A4
+
+# 프로세스 내 파싱된 폰트 (경로 → TTFontFace)
+_FACES = {}
+
+# ==============================================================================
+# 디스크 캐시
+# ==============================================================================
+def _cache_path(font_path):
+    """폰트 파일 경로/크기/수정시각 기준 캐시 파일 경로"""
+    st = os.stat(font_path)
+    key = f"{os.path.abspath(font_path)}|{st.st_size}|{st.st_mtime_ns}|{REPORTLAB_VERSION}|{FONT_CACHE_VERSION}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(font_path))[0]
+    return os.path.join(FONT_CACHE_DIR, f"{name}-{digest}.pickle")
+
+def _map_file(path):
+    """읽기 전용 mmap (여러 프로세스가 같은 물리 페이지를 공유)"""
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _write_cache(cache_path, face):
+    """폰트 원본 바이트를 제외한 파싱 결과 저장 (원자적 교체)"""
+    state = {k: v for k, v in face.__dict__.items() if k not in ('_ttf_data', '_width_table')}
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # 읽기 전용 파일시스템 등 - 캐시 없이 계속
+        print(f"폰트 캐시 저장 실패: {e}")
+
+def _read_cache(cache_path, font_path):
+    """캐시에서 TTFontFace 복원 (캐시가 없거나 깨졌으면 None)"""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with _map_file(cache_path) as mm:
+            state = pickle.loads(mm)
+    except Exception as e:
+        print(f"폰트 캐시 로드 실패: {e}")
+        return None
+
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(state)
+    face._ttf_data = _map_file(font_path)
+    return face
+
+def load_face(font_path):
+    """파싱된 폰트 반환 (프로세스 메모리 → 디스크 캐시 → TTF 파싱 순)"""
+    face = _FACES.get(font_path)
+    if face is not None:
+        return face
+
+    cache_path = _cache_path(font_path)
+    face = _read_cache(cache_path, font_path)
+    if face is None:
+        face = TTFontFace(font_path)
+        _write_cache(cache_path, face)
+
+    face._width_table = build_width_table(face)
+    _FACES[font_path] = face
+    return face
+
+def build_width_table(face):
+    """코드포인트로 바로 인덱싱하는 글리프 폭 리스트 (폰트에 없는 문자는 기본 폭)"""
+    get = face.charWidths.get
+    default = face.defaultWidth
+    return [get(code, default) for code in range(WIDTH_TABLE_END)]
+
+# ==============================================================================
+# 폰트 등록
+# ==============================================================================
+class CachedTTFont(TTFont):
+    """디스크 캐시에서 복원한 TTFontFace를 사용하는 TTFont"""
+
+    def __init__(self, name, filename, asciiReadable=None):
+        # TTFont.__init__과 동일하되 TTFontFace 파싱만 캐시로 대체
+        self.fontName = name
+        self.face = load_face(filename)
+        self.encoding = TTEncoding()
+        self.state = WeakKeyDictionary()
+        if asciiReadable is None:
+            asciiReadable = rl_config.ttfAsciiReadable
+        self._asciiReadable = asciiReadable
+        self._width_of = self.face._width_table.__getitem__
+
+    def stringWidth(self, text, size, encoding='utf8'):
+        """문자열 폭 (조밀 테이블 조회, 범위 밖 문자가 있으면 기본 구현)"""
+        if not isinstance(text, str):
+            text = text.decode(encoding or 'utf-8')
+        try:
+            return 0.001 * size * sum(map(self._width_of, map(ord, text)))
+        except IndexError:
+            return TTFont.stringWidth(self, text, size, encoding)
+
+def register_font(name, font_path):
+    """폰트 등록 (프로세스당 한 번, 이미 등록되어 있으면 기존 폰트 반환)"""
+    if name in pdfmetrics.getRegisteredFontNames():
+        return pdfmetrics.getFont(name)
+
+    font = CachedTTFont(name, font_path)
+    pdfmetrics.registerFont(font)
+    return font
+
+# ==============================================================================
+# Matplotlib 폰트
+# ==============================================================================
+def _matplotlib_family(font_manager, font_path):
+    """폰트 매니저에 등록된 폰트 파일의 family 이름 (없으면 None)"""
+    real_path = os.path.realpath(font_path)
+    for entry in font_manager.ttflist:
+        if os.path.realpath(entry.fname) == real_path:
+            return entry.name
+    return None
+
+def setup_matplotlib_font(font_path):
+    """Matplotlib에 폰트를 등록하고 family 이름 반환
+
+    캐시된 폰트 매니저에 이미 있으면 바로 사용하고, 없을 때만 addfont 후
+    Matplotlib 캐시 파일에 저장해 다음 프로세스부터는 폰트가 포함된 상태로 시작
+    """
+    import matplotlib
+    import matplotlib.font_manager as fm
+
+    family = _matplotlib_family(fm.fontManager, font_path)
+    if family is not None:
+        return family
+
+    fm.fontManager.addfont(font_path)
+    cache_path = os.path.join(matplotlib.get_cachedir(), f"fontlist-v{fm.FontManager.__version__}.json")
+    fm.json_dump(fm.fontManager, cache_path)
+    return _matplotlib_family(fm.fontManager, font_path)
+
+def warm_font_cache():
+    """나눔 폰트 캐시 미리 생성 (Docker 빌드 시 실행)"""
+    for name, path in NANUM_FONTS.items():
+        if os.path.exists(path):
+            load_face(path)
+            print(f"폰트 캐시 준비: {name} → {_cache_path(path)}")
+            print(f"Matplotlib 폰트 준비: {setup_matplotlib_font(path)}")
+        else:
+            print(f"폰트 없음: {path}")
+
+
+if __name__ == '__main__':
+    warm_font_cache()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 핸드오프 모델
+step_* 핸드오프 딕셔너리를 요청당 한 번 정규화한 타입 레코드 (요약/상세 보고서 공용)
+
+구조:
+1. 점수/금액/확률은 파싱 시 한 번만 float로 변환 ("3.1", "20%", "1,200" 모두 허용)
+2. 레코드는 __slots__ 기반 불변 데이터클래스 (인스턴스 딕셔너리 없음)
+3. 본문 텍스트처럼 모델에 없는 필드는 기존처럼 원본 딕셔너리에서 조회
+"""
+
+from dataclasses import dataclass
+
+# ==============================================================================
+# 값 변환
+# ==============================================================================
+def to_number(value, default=0.0):
+    """점수/금액 값을 float로 변환 (변환할 수 없으면 default)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip().rstrip('%').replace(',', ''))
+        except ValueError:
+            return default
+    return default
+
+def format_number(value):
+    """표시용 숫자 문자열 (정수면 소수점 없이: 5.0 → '5', 3.5 → '3.5')"""
+    return f'{value:g}'
+
+def _dict(value):
+    return value if isinstance(value, dict) else {}
+
+def _list(value):
+    return value if isinstance(value, list) else []
+
+# ==============================================================================
+# 레코드
+# ==============================================================================
+@dataclass(frozen=True, slots=True)
+class AreaScore:
+    """3.1 경영진단 영역 점수"""
+    area: str
+    score: float
+    evaluation: str
+
+@dataclass(frozen=True, slots=True)
+class PestelIssue:
+    """2.1 PESTEL 영역별 이슈"""
+    id: str
+    name: str
+    impact_score: float
+    urgency_score: float
+    classification: str
+
+@dataclass(frozen=True, slots=True)
+class SwotItem:
+    """3.3 SWOT 사분면 항목"""
+    id: str
+    description: str
+    impact_score: float
+    priority: str
+
+@dataclass(frozen=True, slots=True)
+class ScenarioCase:
+    """2.2 시나리오 (probability는 원문 표기, probability_pct는 숫자)"""
+    key: str
+    quadrant: str
+    name: str
+    probability: str
+    probability_pct: float
+
+@dataclass(frozen=True, slots=True)
+class FiveForces:
+    """2.3 Five Forces 점수"""
+    new_entrants: float
+    rivalry: float
+    substitutes: float
+    supplier_power: float
+    buyer_power: float
+    average_score: str
+    industry_attractiveness: str
+
+    def scores(self):
+        """차트 순서 (신규진입, 경쟁강도, 대체재, 공급자, 구매자)"""
+        return [self.new_entrants, self.rivalry, self.substitutes, self.supplier_power, self.buyer_power]
+
+@dataclass(frozen=True, slots=True)
+class MarketSizing:
+    """2.5 시장 규모 (억 원)"""
+    tam: float
+    sam: float
+    som_year1: float
+
+@dataclass(frozen=True, slots=True)
+class StrategyOption:
+    """3.4 TOWS 전략 옵션"""
+    type: str
+    name: str
+    hypothesis: str
+    total_score: float
+    priority: str
+
+# ==============================================================================
+# 파싱
+# ==============================================================================
+PESTEL_AREAS = ('political', 'economic', 'social', 'technological', 'environmental', 'legal')
+SWOT_QUADRANTS = ('strengths', 'weaknesses', 'opportunities', 'threats')
+SCENARIO_KEYS = ('scenario_1', 'scenario_2', 'scenario_3', 'scenario_4')
+TOWS_TYPES = ('SO', 'WO', 'ST', 'WT')
+
+def parse_diagnosis(step):
+    scores = _dict(_dict(step).get('scores_summary'))
+    return tuple(
+        AreaScore(area, to_number(_dict(info).get('score', 0)), str(_dict(info).get('evaluation', '')))
+        for area, info in scores.items()
+    )
+
+def parse_pestel(step):
+    pestel = _dict(_dict(step).get('pestel'))
+    return {
+        area: tuple(
+            PestelIssue(
+                str(issue.get('id', '')), str(issue.get('name', '')),
+                to_number(issue.get('impact_score', 0)), to_number(issue.get('urgency_score', 0)),
+                str(issue.get('classification', '')),
+            )
+            for issue in map(_dict, _list(_dict(pestel.get(area)).get('issues')))
+        )
+        for area in PESTEL_AREAS
+    }
+
+def parse_swot(step):
+    step = _dict(step)
+    return {
+        quadrant: tuple(
+            SwotItem(str(item.get('id', '')), str(item.get('description', '')),
+                     to_number(item.get('impact_score', 0)), str(item.get('priority', '')))
+            for item in map(_dict, _list(step.get(quadrant)))
+        )
+        for quadrant in SWOT_QUADRANTS
+    }
+
+def parse_scenarios(step):
+    scenarios = _dict(_dict(step).get('scenarios'))
+    cases = []
+    for key in SCENARIO_KEYS:
+        s = _dict(scenarios.get(key))
+        if s:
+            probability = str(s.get('probability', ''))
+            cases.append(ScenarioCase(key, str(s.get('quadrant', '++')), str(s.get('name', '')),
+                                      probability, to_number(probability)))
+    return tuple(cases)
+
+def parse_five_forces(step):
+    forces = _dict(_dict(step).get('five_forces'))
+    if not forces:
+        return None
+    overall = _dict(forces.get('overall'))
+    return FiveForces(
+        *(to_number(_dict(forces.get(k)).get('score', 0))
+          for k in ('new_entrants', 'rivalry', 'substitutes', 'supplier_power', 'buyer_power')),
+        average_score=str(overall.get('average_score', '')),
+        industry_attractiveness=str(overall.get('industry_attractiveness', '')),
+    )
+
+def parse_market(step):
+    sizing = _dict(_dict(step).get('market_sizing'))
+    tam = _dict(sizing.get('tam'))
+    if not tam:
+        return None
+    return MarketSizing(
+        to_number(_dict(tam.get('triangulation')).get('confirmed_tam', 0)),
+        to_number(_dict(sizing.get('sam')).get('total', 0)),
+        to_number(_dict(_dict(sizing.get('som')).get('year_1')).get('value', 0)),
+    )
+
+def parse_strategies(step):
+    options = _dict(_dict(step).get('strategy_options'))
+    strategies = []
+    for stype in TOWS_TYPES:
+        for s in map(_dict, _list(options.get(stype))):
+            evaluation = _dict(s.get('evaluation'))
+            strategies.append(StrategyOption(
+                stype, str(s.get('name', '')), str(s.get('hypothesis', '')),
+                to_number(evaluation.get('total_score', 0)), str(evaluation.get('priority', '')),
+            ))
+    return tuple(strategies)
+
+def average_impact(items):
+    """impact_score 평균 (항목이 없으면 0)"""
+    return sum(i.impact_score for i in items) / len(items) if items else 0
+
+class Handoffs:
+    """정규화된 핸드오프 묶음 (parse_handoffs로 생성)
+
+    Attributes:
+        data: 원본 핸드오프 딕셔너리 (모델에 없는 본문 텍스트 조회용)
+        diagnosis: (AreaScore, ...)
+        pestel: {영역: (PestelIssue, ...)}
+        scenarios: (ScenarioCase, ...)
+        five_forces: FiveForces 또는 None
+        market: MarketSizing 또는 None
+        swot: {사분면: (SwotItem, ...)}
+        strategies: (StrategyOption, ...) - SO, WO, ST, WT 순
+    """
+
+    __slots__ = ('data', 'diagnosis', 'pestel', 'scenarios', 'five_forces', 'market', 'swot', 'strategies')
+
+    def __init__(self, data):
+        data = _dict(data)
+        self.data = data
+        self.pestel = parse_pestel(data.get('step_2_1_pestel'))
+        self.scenarios = parse_scenarios(data.get('step_2_2_scenario'))
+        self.five_forces = parse_five_forces(data.get('step_2_3_competition'))
+        self.market = parse_market(data.get('step_2_5_market'))
+        self.diagnosis = parse_diagnosis(data.get('step_3_1_diagnosis'))
+        self.swot = parse_swot(data.get('step_3_3_swot'))
+        self.strategies = parse_strategies(data.get('step_3_4_tows'))
+
+    def key_figures(self, section):
+        """섹션별 핵심 수치 [(항목, 값), ...] (상세 보고서 요약 표용, 없으면 빈 리스트)"""
+        if section == 'diagnosis':
+            return [(s.area, f'{s.score:.1f}/5') for s in self.diagnosis]
+        if section == 'scenario':
+            return [(s.name, s.probability) for s in self.scenarios]
+        if section == 'competition' and self.five_forces:
+            labels = ['신규진입', '경쟁강도', '대체재', '공급자', '구매자']
+            return [(l, f'{v:.1f}/5') for l, v in zip(labels, self.five_forces.scores())]
+        if section == 'market' and self.market:
+            m = self.market
+            return [('TAM', f'{m.tam:,.0f}억'), ('SAM', f'{m.sam:,.0f}억'), ('SOM (1년차)', f'{m.som_year1:,.0f}억')]
+        if section == 'swot':
+            labels = {'strengths': '강점 (S)', 'weaknesses': '약점 (W)',
+                      'opportunities': '기회 (O)', 'threats': '위협 (T)'}
+            return [(labels[q], f'{len(items)}개 / 평균 영향도 {average_impact(items):.1f}')
+                    for q, items in self.swot.items() if items]
+        if section == 'tows':
+            top = sorted(self.strategies, key=lambda s: -s.total_score)[:3]
+            return [(f'{s.type} {s.name}', format_number(s.total_score)) for s in top]
+        return []
+
+def parse_handoffs(data):
+    """핸드오프 딕셔너리를 한 번 정규화 (이미 Handoffs면 그대로 반환)"""
+    return data if isinstance(data, Handoffs) else Handoffs(data)
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 핸드오프 요청 스키마
+API 요청 본문의 step_* 핸드오프를 검증하는 pydantic v2 스키마
+
+구조:
+1. 요청 본문 바이트를 model_validate_json으로 바로 검증 (json.loads dict 그래프를 거치지 않음)
+2. 단계별 스키마는 TypedDict - 검증 결과가 곧 렌더러가 읽는 dict (모델 인스턴스/덤프 비용 없음)
+3. 리포트가 읽는 필드만 타입 지정, 나머지 필드는 그대로 통과 (extra='allow'), 빠진 키는 채우지 않음
+4. 점수/금액은 숫자 또는 숫자 문자열("3.1", "20%", "1,200")만 허용해 float로 변환
+   - 그 밖의 값은 렌더링 전에 422
+5. 스키마로 잡을 수 없는 값(점수 범위, 시나리오 확률)은 check_handoffs가 경고로 보고
+   - 문제마다 JSON 경로($.handoffs.step_3_3_swot.strengths[0].impact_score)와 메시지
+"""
+
+from functools import lru_cache
+from typing import Annotated, Any, Dict, List, Optional, Union
+
+from pydantic import AfterValidator, ConfigDict, Field, TypeAdapter
+from typing_extensions import TypedDict
+
+from handoff_models import PESTEL_AREAS, SCENARIO_KEYS, SWOT_QUADRANTS, to_number
+
+# ==============================================================================
+# 필드 타입
+# ==============================================================================
+def _numeric_text(value):
+    number = to_number(value, None)
+    if number is None:
+        raise ValueError(f"숫자로 변환할 수 없습니다: {value!r}")
+    return number
+
+# 숫자 (대부분 float 검증에서 끝나고, "20%"/"1,200" 같은 문자열만 파이썬 변환)
+NumericLike = Annotated[Union[float, Annotated[str, AfterValidator(_numeric_text)]],
+                        Field(union_mode='left_to_right')]
+# ID/순위 (AI 출력이 숫자로 보내는 경우가 있어 둘 다 허용)
+Label = Union[str, int]
+# 자유 텍스트 - AI 출력에 null이 섞여 있어도 통과 (렌더러는 빈 칸으로 표시)
+Text = Optional[str]
+# 그대로 표시하는 값 ("18", 18, 5.2, "20%") - 숫자는 숫자 그대로 두어 표시 형식이 바뀌지 않음
+DisplayValue = Union[str, int, float]
+
+class HandoffModel(TypedDict, total=False):
+    """핸드오프 스키마 공통 설정 - 모델에 없는 필드는 검증 없이 통과"""
+    __pydantic_config__ = ConfigDict(extra='allow')
+
+# ==============================================================================
+# 2.1 PESTEL
+# ==============================================================================
+class PestelIssue(HandoffModel, total=False):
+    id: Label
+    name: Text
+    description: Text
+    impact_score: NumericLike
+    urgency_score: NumericLike
+    classification: Text
+
+class PestelArea(HandoffModel, total=False):
+    summary: Text
+    issues: List[PestelIssue]
+
+class RankedFactor(HandoffModel, total=False):
+    rank: Label
+    area: Text
+    factor: Text
+    action: Text
+    mitigation: Text
+
+class PestelSynthesis(HandoffModel, total=False):
+    top_5_opportunities: List[RankedFactor]
+    top_5_threats: List[RankedFactor]
+
+class PestelHandoff(HandoffModel, total=False):
+    executive_summary: Text
+    pestel: Dict[str, PestelArea]
+    synthesis: PestelSynthesis
+
+# ==============================================================================
+# 2.2 시나리오
+# ==============================================================================
+class Scenario(HandoffModel, total=False):
+    quadrant: Text
+    name: Text
+    probability: DisplayValue
+    narrative: Text
+    strategic_response: List[Text]
+
+class RobustStrategy(HandoffModel, total=False):
+    common_strategies: List[Text]
+
+class ScenarioHandoff(HandoffModel, total=False):
+    scenarios: Dict[str, Scenario]
+    robust_strategy: RobustStrategy
+
+# ==============================================================================
+# 2.3 경쟁환경
+# ==============================================================================
+class ForceScore(HandoffModel, total=False):
+    score: NumericLike
+
+class FiveForcesOverall(HandoffModel, total=False):
+    average_score: Union[int, float, str]
+    industry_attractiveness: Text
+
+class FiveForces(HandoffModel, total=False):
+    new_entrants: ForceScore
+    rivalry: ForceScore
+    substitutes: ForceScore
+    supplier_power: ForceScore
+    buyer_power: ForceScore
+    overall: FiveForcesOverall
+
+class Competitor(HandoffModel, total=False):
+    name: Text
+    type: Text
+    strengths: List[Text]
+    weaknesses: List[Text]
+    threat_level: Text
+
+class CompetitorAnalysis(HandoffModel, total=False):
+    business_competitors: List[Competitor]
+
+class CompetitionHandoff(HandoffModel, total=False):
+    five_forces: FiveForces
+    competitor_analysis: CompetitorAnalysis
+
+# ==============================================================================
+# 2.4 고객
+# ==============================================================================
+class Jtbd(HandoffModel, total=False):
+    functional: List[Text]
+
+class CustomerRole(HandoffModel, total=False):
+    profile: Text
+    jtbd: Jtbd
+
+class SegmentPriority(HandoffModel, total=False):
+    segment: Text
+    reason: Text
+    approach_strategy: Text
+
+class CustomerHandoff(HandoffModel, total=False):
+    customer_ecosystem: Dict[str, CustomerRole]
+    segment_priority_matrix: Dict[str, SegmentPriority]
+
+# ==============================================================================
+# 2.5 시장
+# ==============================================================================
+class MarketValue(HandoffModel, total=False):
+    value: NumericLike
+
+class TamTriangulation(HandoffModel, total=False):
+    confirmed_tam: NumericLike
+
+class Tam(HandoffModel, total=False):
+    triangulation: TamTriangulation
+
+class Sam(HandoffModel, total=False):
+    total: NumericLike
+
+class Som(HandoffModel, total=False):
+    year_1: MarketValue
+
+class MarketSizing(HandoffModel, total=False):
+    tam: Tam
+    sam: Sam
+    som: Som
+
+class GrowthRate(HandoffModel, total=False):
+    value: DisplayValue
+    period: Text
+
+class MarketTrends(HandoffModel, total=False):
+    growth_rates: Dict[str, GrowthRate]
+
+class MarketHandoff(HandoffModel, total=False):
+    market_sizing: MarketSizing
+    market_trends: MarketTrends
+
+# ==============================================================================
+# 3.1 경영진단 / 3.2 VRIO
+# ==============================================================================
+class AreaScore(HandoffModel, total=False):
+    score: NumericLike
+    evaluation: Text
+
+class DiagnosisHandoff(HandoffModel, total=False):
+    executive_summary: Text
+    scores_summary: Dict[str, AreaScore]
+
+class VrioResource(HandoffModel, total=False):
+    id: Label
+    name: Text
+    type: Text
+
+class ResourceIdentification(HandoffModel, total=False):
+    resources: List[VrioResource]
+
+class VrioHandoff(HandoffModel, total=False):
+    resource_identification: ResourceIdentification
+    vrio_evaluation: Dict[str, Any]
+
+# ==============================================================================
+# 3.3 SWOT / 3.4 TOWS
+# ==============================================================================
+class SwotItem(HandoffModel, total=False):
+    id: Label
+    description: Text
+    impact_score: NumericLike
+
+class SwotHandoff(HandoffModel, total=False):
+    strengths: List[SwotItem]
+    weaknesses: List[SwotItem]
+    opportunities: List[SwotItem]
+    threats: List[SwotItem]
+    key_insights: List[Text]
+
+class StrategyEvaluation(HandoffModel, total=False):
+    total_score: NumericLike
+    priority: Text
+
+class StrategyOption(HandoffModel, total=False):
+    id: Label
+    name: Text
+    hypothesis: Text
+    evaluation: StrategyEvaluation
+
+class TopStrategy(HandoffModel, total=False):
+    rank: Label
+    name: Text
+    type: Text
+    rationale: Text
+
+class ImmediateAction(HandoffModel, total=False):
+    action: Text
+    owner: Text
+    deadline: Text
+
+class DecisionSummary(HandoffModel, total=False):
+    top_3_strategies: List[TopStrategy]
+    immediate_actions: List[ImmediateAction]
+
+class TowsHandoff(HandoffModel, total=False):
+    strategy_options: Dict[str, List[StrategyOption]]
+    decision_summary: DecisionSummary
+
+# ==============================================================================
+# 요청 핸드오프 묶음
+# ==============================================================================
+class HandoffSteps(HandoffModel, total=False):
+    """GenerateRequest.handoffs - 단계별 핸드오프 (검증 결과가 바로 리포트 데이터, 다른 키는 그대로 통과)"""
+    step_2_1_pestel: PestelHandoff
+    step_2_2_scenario: ScenarioHandoff
+    step_2_3_competition: CompetitionHandoff
+    step_2_4_customer: CustomerHandoff
+    step_2_5_market: MarketHandoff
+    step_3_1_diagnosis: DiagnosisHandoff
+    step_3_2_vrio: VrioHandoff
+    step_3_3_swot: SwotHandoff
+    step_3_4_tows: TowsHandoff
+
+# 단계 키 (리포트 순서)
+HANDOFF_STEPS = tuple(HandoffSteps.__annotations__)
+
+@lru_cache(maxsize=None)
+def step_adapter(step):
+    """단계 하나의 검증기 (블롭으로 따로 받은 핸드오프용) - 단계 키가 아니면 KeyError"""
+    return TypeAdapter(HandoffSteps.__annotations__[step])
+
+# ==============================================================================
+# 검증 오류
+# ==============================================================================
+_NUMERIC_BRANCHES = ('float', f'function-after[{_numeric_text.__name__}(), str]')
+
+def json_path(loc):
+    """pydantic loc → JSON 경로 ('handoffs', 'x', 0, 'y') → '$.handoffs.x[0].y'"""
+    return '$' + ''.join(f'[{part}]' if isinstance(part, int) else f'.{part}' for part in loc)
+
+def clean_errors(errors):
+    """ValidationError.errors()에서 NumericLike 유니언 분기별 오류를 필드당 하나로 합치고 JSON 경로 추가"""
+    cleaned = []
+    seen = set()
+    for error in errors:
+        loc = tuple(error['loc'])
+        if loc and loc[-1] in _NUMERIC_BRANCHES:
+            loc = loc[:-1]
+            if loc in seen:
+                continue
+            error = dict(error, type='numeric', msg=f"숫자 또는 숫자 문자열이어야 합니다: {error['input']!r}")
+        seen.add(loc)
+        cleaned.append(dict(error, loc=loc, path=json_path(loc)))
+    return cleaned
+
+def problems_from_errors(errors):
+    """검증 오류 → 문제 목록 [{'path', 'type', 'message'}]"""
+    return [{'path': e['path'], 'type': e['type'], 'message': e['msg']} for e in clean_errors(errors)]
+
+# ==============================================================================
+# 값 점검 (스키마 통과 후, 렌더링은 가능하지만 결과가 이상해지는 값)
+# ==============================================================================
+# 1~5점 척도 필드
+SCORE_MIN, SCORE_MAX = 0, 5
+
+def _warning(path, message):
+    return {'path': path, 'type': 'warning', 'message': message}
+
+def _check_score(warnings, path, value):
+    if isinstance(value, float) and not SCORE_MIN <= value <= SCORE_MAX:
+        warnings.append(_warning(path, f"점수가 {SCORE_MIN}~{SCORE_MAX} 범위를 벗어남: {value:g} (차트에서 잘림)"))
+
+def check_handoffs(handoffs, root='$.handoffs'):
+    """검증된 핸드오프 dict의 값 점검 - 경고 목록 (렌더링은 막지 않음)"""
+    warnings = []
+
+    pestel = handoffs.get('step_2_1_pestel', {}).get('pestel', {})
+    for area in PESTEL_AREAS:
+        for i, issue in enumerate(pestel.get(area, {}).get('issues', [])):
+            for field in ('impact_score', 'urgency_score'):
+                _check_score(warnings, f"{root}.step_2_1_pestel.pestel.{area}.issues[{i}].{field}", issue.get(field))
+
+    scenarios = handoffs.get('step_2_2_scenario', {}).get('scenarios', {})
+    total = 0.0
+    for key in SCENARIO_KEYS:
+        if key not in scenarios:
+            continue
+        probability = scenarios[key].get('probability', '')
+        number = to_number(probability, None)
+        if number is None:
+            warnings.append(_warning(f"{root}.step_2_2_scenario.scenarios.{key}.probability",
+                                     f"확률을 숫자로 읽을 수 없음: {probability!r} (차트에서 0%)"))
+        else:
+            total += number
+    if scenarios and total and abs(total - 100) > 1:
+        warnings.append(_warning(f"{root}.step_2_2_scenario.scenarios", f"시나리오 확률 합계가 100%가 아님: {total:g}%"))
+
+    forces = handoffs.get('step_2_3_competition', {}).get('five_forces', {})
+    for key in ('new_entrants', 'rivalry', 'substitutes', 'supplier_power', 'buyer_power'):
+        if key in forces:
+            _check_score(warnings, f"{root}.step_2_3_competition.five_forces.{key}.score", forces[key].get('score'))
+
+    for area, info in handoffs.get('step_3_1_diagnosis', {}).get('scores_summary', {}).items():
+        _check_score(warnings, f"{root}.step_3_1_diagnosis.scores_summary.{area}.score", info.get('score'))
+
+    swot = handoffs.get('step_3_3_swot', {})
+    for quadrant in SWOT_QUADRANTS:
+        for i, item in enumerate(swot.get(quadrant, [])):
+            _check_score(warnings, f"{root}.step_3_3_swot.{quadrant}[{i}].impact_score", item.get('impact_score'))
+    return warnings
+
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 핸드오프 저장소
+검증된 step_* 핸드오프를 SQLite에 버전별로 저장하고 ID로 조회
+
+구조:
+1. (정규화한 기업명, BM, 단계)마다 버전 이력 - 인덱스로 최신 버전 조회
+   - 기업명 정규화는 Apps Script normalizeCompanyNameV4와 동일 (괄호/공백/주식회사/㈜ 제거, 소문자)
+2. 업서트: 최신 버전과 내용(정렬된 JSON의 SHA-256)이 같으면 기존 ID 반환, 다르면 새 버전 추가
+3. 리포트 요청은 핸드오프 본문 대신 {단계: ID}로 참조 (handoffRefs)
+4. 저장소는 인스턴스 로컬 파일 (GIMPACT_HANDOFF_DB) - scale-to-zero 환경에서는 캐시로 취급하고
+   ID를 찾지 못하면 클라이언트가 본문을 다시 보냄
+
+사용법:
+    python handoff_store.py                       # 저장된 기업/단계별 최신 버전 목록
+    python handoff_store.py --get 12              # ID로 핸드오프 조회
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+# ==============================================================================
+# 설정
+# ==============================================================================
+HANDOFF_DB_PATH = os.environ.get('GIMPACT_HANDOFF_DB') or os.path.join(
+    os.environ.get('GIMPACT_CACHE_DIR', os.path.expanduser('~/.cache/gimpact')), 'handoffs.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS handoffs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    business_key TEXT NOT NULL,
+    business_name TEXT NOT NULL,
+    bm TEXT NOT NULL,
+    step TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS handoffs_version ON handoffs (business_key, step, bm, version);
+"""
+
+StoredHandoff = namedtuple('StoredHandoff', 'id business_name bm step version created_at payload')
+
+# 업서트 결과 (created: 새 버전을 추가했으면 True, 같은 내용이라 기존 버전이면 False)
+UpsertResult = namedtuple('UpsertResult', 'id version created')
+
+def normalize_business_name(name):
+    """기업명 정규화 (Apps Script normalizeCompanyNameV4와 같은 규칙)"""
+    name = re.sub(r'[()（）]', '', str(name or ''))
+    name = re.sub(r'\s+', '', name)
+    return name.replace('주식회사', '').replace('㈜', '').strip().lower()
+
+def canonical_json(payload):
+    """내용 비교/저장용 JSON (키 정렬, 공백 없음)"""
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+# ==============================================================================
+# 저장소
+# ==============================================================================
+class HandoffStore:
+    """SQLite 핸드오프 저장소 (스레드 간 연결 하나를 잠금으로 공유)"""
+
+    def __init__(self, path=HANDOFF_DB_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def _latest(self, business_key, bm, step):
+        return self._db.execute(
+            'SELECT id, version, digest FROM handoffs WHERE business_key = ? AND step = ? AND bm = ? '
+            'ORDER BY version DESC LIMIT 1', (business_key, step, bm)).fetchone()
+
+    def upsert_many(self, business_name, bm, handoffs):
+        """{단계: 핸드오프}를 한 트랜잭션으로 업서트 → {단계: UpsertResult}"""
+        business_key = normalize_business_name(business_name)
+        bm = bm or 'ALL'
+        created_at = datetime.now().isoformat()
+        results = {}
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                for step, payload in handoffs.items():
+                    text = canonical_json(payload)
+                    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+                    latest = self._latest(business_key, bm, step)
+                    if latest and latest[2] == digest:
+                        results[step] = UpsertResult(latest[0], latest[1], False)
+                        continue
+                    version = latest[1] + 1 if latest else 1
+                    cursor = self._db.execute(
+                        'INSERT INTO handoffs (business_key, business_name, bm, step, version, digest, payload, '
+                        'created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (business_key, business_name, bm, step, version, digest, text, created_at))
+                    results[step] = UpsertResult(cursor.lastrowid, version, True)
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        return results
+
+    def upsert(self, business_name, bm, step, payload):
+        """단계 하나 업서트 → UpsertResult"""
+        return self.upsert_many(business_name, bm, {step: payload})[step]
+
+    def get_many(self, ids):
+        """ID 목록 → {ID: StoredHandoff} (없는 ID는 빠짐)"""
+        ids = list({int(i) for i in ids})
+        if not ids:
+            return {}
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT id, business_name, bm, step, version, created_at, payload FROM handoffs '
+                f"WHERE id IN ({','.join('?' * len(ids))})", ids).fetchall()
+        return {row[0]: StoredHandoff(*row[:6], json.loads(row[6])) for row in rows}
+
+    def get(self, handoff_id):
+        """ID → StoredHandoff (없으면 None)"""
+        return self.get_many([handoff_id]).get(int(handoff_id))
+
+    def latest(self, business_name, bm='ALL'):
+        """기업의 단계별 최신 버전 {단계: (ID, 버전, BM)}
+
+        BM 일치 규칙은 Apps Script collectAllHandoffsV4와 동일:
+        bm이 'ALL'이면 모든 BM, 아니면 해당 BM과 'ALL' 행 중 가장 최근에 저장된 것
+        """
+        business_key = normalize_business_name(business_name)
+        bm = bm or 'ALL'
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT step, id, version, bm FROM handoffs WHERE business_key = ? '
+                "AND (? = 'ALL' OR bm = 'ALL' OR bm = ?) ORDER BY id", (business_key, bm, bm)).fetchall()
+        return {step: (handoff_id, version, row_bm) for step, handoff_id, version, row_bm in rows}
+
+    def businesses(self):
+        """저장된 (기업명, BM, 단계, 최신 버전, ID) 목록"""
+        with self._lock:
+            return self._db.execute(
+                'SELECT business_name, bm, step, MAX(version), MAX(id) FROM handoffs '
+                'GROUP BY business_key, bm, step ORDER BY business_key, bm, step').fetchall()
+
+# 서버 프로세스당 하나 (첫 사용 시 연결)
+_store = None
+_store_lock = threading.Lock()
+
+def get_handoff_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HandoffStore()
+        return _store
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='G-IMPACT 핸드오프 저장소')
+    parser.add_argument('--db', default=HANDOFF_DB_PATH, help='SQLite 파일 경로')
+    parser.add_argument('--get', type=int, metavar='ID', help='ID로 핸드오프 조회')
+    args = parser.parse_args()
+
+    store = HandoffStore(args.db)
+    if args.get is not None:
+        stored = store.get(args.get)
+        if stored is None:
+            print(f"저장된 핸드오프 없음: {args.get}")
+        else:
+            print(f"{stored.business_name} / {stored.bm} / {stored.step} v{stored.version} ({stored.created_at})")
+            print(json.dumps(stored.payload, ensure_ascii=False, indent=2))
+    else:
+        for business_name, bm, step, version, handoff_id in store.businesses():
+            print(f"{business_name:<20} {bm:<8} {step:<22} v{version:<4} id={handoff_id}")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 리포트 작업 진행 이벤트
+/generate 요청 하나(작업)의 진행 단계를 이벤트 목록으로 모아 SSE(GET /jobs/{id}/events)로 전달
+
+이벤트 (이름, 데이터):
+- started      {}
+- validated    {steps, warnings}                    요청 검증 완료 (핸드오프 단계, 경고 수)
+- transform    {section, status, done, total}       서버 AI 변환 섹션 완료 (status: done/cached/failed)
+- section      {report, section, index, total}      섹션 빌드 완료 (차트 포함, 조각 캐시면 cached)
+- chart        {report, rendered}                   차트 렌더링 (보고서 안에서 누적 개수)
+- layout       {report, section, page}              섹션 제목이 페이지에 배치됨
+- pdf          {report, pages, bytes}               보고서 PDF 작성 완료
+- done         {summaryPages, detailPages}          작업 완료
+- failed       {error}                              작업 실패
+- callback     {delivered, attempts, status, error} 완료 콜백 전달 결과 (options.callbackUrl, done/failed 뒤)
+
+구조:
+- 렌더링 스레드가 publish로 이벤트를 쌓고, SSE 구독자(이벤트 루프)는 call_soon_threadsafe로 깨움
+- 이벤트에는 1부터 순번(SSE id)이 붙어 Last-Event-ID로 이어 받기 가능
+- 클라이언트가 작업 ID를 정해 /generate 전에 구독할 수 있음 (구독 시 대기 작업 생성)
+- 끝난 작업은 GIMPACT_JOB_TTL_MINUTES 동안 보관 후 삭제 (늦게 붙은 구독자도 전체 이벤트 수신)
+"""
+
+import asyncio
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# ==============================================================================
+# 설정
+# ==============================================================================
+JOB_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# 끝난 작업 보관 시간 / 구독 후 작업이 시작되기를 기다리는 시간
+JOB_TTL = float(os.environ.get('GIMPACT_JOB_TTL_MINUTES', '30')) * 60
+JOB_START_TIMEOUT = 120
+
+# 작업 상태
+PENDING, RUNNING, DONE, FAILED = 'pending', 'running', 'done', 'failed'
+
+# ==============================================================================
+# 작업
+# ==============================================================================
+class Job:
+    """작업 하나의 상태와 이벤트 목록 [(순번, 이름, 데이터), ...]"""
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = PENDING
+        self.events = []
+        self.created = time.time()
+        self.finished = None
+        self._lock = threading.Lock()
+        self._waiters = set()
+        # 보고서 산출물 {보고서: {'key', 'filename', 'size'}} - 콜백 작업 (artifact_store.py)
+        self.results = {}
+
+    @property
+    def closed(self):
+        return self.status in (DONE, FAILED)
+
+    def publish(self, event, **data):
+        """이벤트 추가 (어느 스레드에서나 호출 가능) → 순번"""
+        return self._append(event, data)
+
+    def _append(self, event, data, status=None):
+        """이벤트 추가 - status를 주면 같은 잠금 안에서 상태도 바꿈
+        (구독자가 끝난 상태를 보면 마지막 이벤트까지 이미 목록에 있음)
+        """
+        now = time.time()
+        data['ts'] = round(now - self.created, 3)
+        with self._lock:
+            seq = len(self.events) + 1
+            self.events.append((seq, event, data))
+            if status is not None:
+                self.status = status
+                if status in (DONE, FAILED):
+                    self.finished = now
+            waiters = list(self._waiters)
+        for wake in waiters:
+            wake()
+        return seq
+
+    def reporter(self, **tags):
+        """진행 콜백 progress(event, **fields) - 태그(예: report='summary')를 붙여 publish"""
+        def progress(event, **fields):
+            self.publish(event, **tags, **fields)
+        return progress
+
+    def start(self):
+        self._append('started', {}, RUNNING)
+
+    def finish(self, ok, **data):
+        """완료/실패 이벤트를 마지막으로 추가"""
+        self._append('done' if ok else 'failed', data, DONE if ok else FAILED)
+
+    def add_result(self, report, key, filename, size):
+        self.results[report] = {'key': key, 'filename': filename, 'size': size}
+
+    def events_after(self, seq):
+        with self._lock:
+            return self.events[seq:]
+
+    async def wait(self, seq, timeout):
+        """seq 이후 이벤트가 생기거나 작업이 끝날 때까지 대기 (최대 timeout초)"""
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:  # 구독자 루프가 이미 닫힘
+                pass
+
+        with self._lock:
+            if len(self.events) > seq or self.closed:
+                return
+            self._waiters.add(wake)
+        try:
+            await asyncio.wait_for(ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._waiters.discard(wake)
+
+    def snapshot(self):
+        """GET /jobs/{id} 응답용 요약"""
+        with self._lock:
+            events = [{'id': seq, 'event': event, 'data': data} for seq, event, data in self.events]
+        return {
+            'jobId': self.id,
+            'status': self.status,
+            'createdAt': datetime.fromtimestamp(self.created).isoformat(),
+            'finishedAt': datetime.fromtimestamp(self.finished).isoformat() if self.finished else None,
+            'events': events,
+            'reports': sorted(self.results),
+        }
+
+# ==============================================================================
+# 작업 목록
+# ==============================================================================
+class JobRegistry:
+    """프로세스 안의 작업 목록 (ID → Job)"""
+
+    def __init__(self, ttl=JOB_TTL):
+        self.ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id=None):
+        """작업 시작 (ID가 없으면 생성) - 구독자가 먼저 만든 대기 작업은 그대로 사용
+
+        Raises:
+            ValueError: 같은 ID의 작업이 진행 중
+        """
+        self.prune()
+        job_id = job_id or uuid.uuid4().hex
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == RUNNING:
+                raise ValueError(f"이미 진행 중인 작업입니다: {job_id}")
+            if job is None or job.closed:
+                job = self._jobs[job_id] = Job(job_id)
+            job.start()
+        return job
+
+    def get(self, job_id, create=False):
+        """ID → Job (없으면 None, create면 대기 작업을 만들어 반환)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None and create:
+                job = self._jobs[job_id] = Job(job_id)
+            return job
+
+    def prune(self):
+        """보관 시간이 지난 작업 삭제 (끝난 작업, 시작되지 않은 대기 작업)"""
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if (job.closed and now - job.finished > self.ttl)
+                       or (job.status == PENDING and now - job.created > self.ttl)]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+# 서버 프로세스당 하나
+_registry = JobRegistry()
+
+def get_job_registry():
+    return _registry
@@ -9,25 +9,59 @@ FastAPI 기반 PDF 생성 API 서버
 """
 
 import os
+import sys
 import json
+import asyncio
+import pickle
 import base64
+import tempfile
+import threading
+import time
+import traceback
+from contextlib import asynccontextmanager
 from io import BytesIO
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Annotated, Literal, Optional, Dict, Any, List, Union
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
+from pydantic import (BaseModel, Field, StrictInt, StringConstraints, ValidationError, field_validator,
+                      model_validator)
+from starlette.background import BackgroundTask
+
+from ai_transform import TRANSFORM_STEPS, get_transformer
+from artifact_store import ARTIFACT_KEY_PATTERN, CHUNK_SIZE, content_disposition, file_digest, get_artifact_store
+from callbacks import CALLBACK_SECRET, check_callback_url, deliver
+from handoff_models import Handoffs, parse_handoffs
+from blob_store import BLOB_HASH_PATTERN, get_blob_store
+from handoff_schema import (HANDOFF_STEPS, HandoffSteps, check_handoffs, clean_errors, problems_from_errors,
+                            step_adapter)
+from handoff_store import get_handoff_store, normalize_business_name
+from report_sections import detail_section_order, select_sections
+from jobs import JOB_ID_PATTERN, JOB_START_TIMEOUT, PENDING, get_job_registry
 
 # ============================================
 # FastAPI 앱 설정
 # ============================================
 
+@asynccontextmanager
+async def lifespan(app):
+    if not CALLBACK_SECRET:
+        print("경고: GIMPACT_CALLBACK_SECRET이 설정되지 않아 callbackUrl 요청은 422로 거부됩니다")
+    yield
+    # 조각 렌더링 프로세스 풀 정리 (렌더링을 한 번도 안 했으면 모듈을 새로 임포트하지 않음)
+    report_fragments = sys.modules.get('report_fragments')
+    if report_fragments is not None:
+        report_fragments.shutdown_render_pool()
+
 app = FastAPI(
     title="G-IMPACT PDF Generator API",
     description="AI 분석 결과를 고품질 PDF 리포트로 변환하는 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정 (Google Apps Script에서 호출 허용)
@@ -39,6 +73,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 렌더링 출력은 이 크기까지 메모리, 넘으면 디스크 임시 파일로 넘김 (요청당 메모리 상한)
+SPOOL_MAX_BYTES = int(os.environ.get("GIMPACT_SPOOL_MB", "2")) * 1024 * 1024
+SPOOL_DIR = os.environ.get("GIMPACT_SPOOL_DIR") or tempfile.gettempdir()
+
+# 렌더링은 스레드에서 하나씩 (matplotlib pyplot 전역 상태) - 이벤트 루프는 SSE/헬스 체크를 계속 처리
+RENDER_LOCK = threading.Lock()
+
+# SSE 연결 유지 주석 간격 (프록시 유휴 타임아웃보다 짧게)
+SSE_KEEPALIVE_SECONDS = 15
+
+# 다운로드/콜백 알림 URL 앞부분 (프록시 뒤에서는 외부 주소로, 없으면 요청 주소)
+PUBLIC_URL = os.environ.get("GIMPACT_PUBLIC_URL", "").rstrip("/")
+
+# 콜백 작업 태스크 (완료 전에 가비지 컬렉션되지 않도록 보관)
+BACKGROUND_JOBS = set()
+
+# 산출물 다운로드 파일명
+REPORT_FILENAMES = {"summary": "요약보고서", "detail": "상세보고서"}
+
 # ============================================
 # 요청/응답 모델
 # ============================================
@@ -49,30 +102,430 @@ class ReportMeta(BaseModel):
     collected_at: Optional[str] = None
     version: Optional[str] = "4.0"
 
+# 작업 ID (진행 이벤트 GET /jobs/{id}/events) - 클라이언트가 정하면 /generate 전에 구독 가능
+JobId = Annotated[str, StringConstraints(pattern=JOB_ID_PATTERN.pattern)]
+
 class ReportOptions(BaseModel):
     generateSummary: bool = True
     generateDetail: bool = True
     businessName: str
     bm: Optional[str] = "ALL"
+    # 렌더링할 섹션 키 (없으면 전체) - summary, executive, pestel, ..., swot, tows
+    sections: Optional[List[str]] = None
+    # 서버에서 AI 변환 (transformed에 없는 섹션/경영진 요약을 동시에 변환, ai_transform.py)
+    # - 클라이언트는 핸드오프만 보내면 됨 (상세 보고서를 만들 때만 변환)
+    transform: bool = False
+    # 진행 이벤트 작업 ID (없으면 서버가 생성해 응답 jobId로 반환)
+    jobId: Optional[JobId] = None
+    # PDF 전달 방식 - inline: 응답에 Base64, url: 산출물 저장소에 두고 다운로드 URL (artifact_store.py)
+    output: Literal['inline', 'url'] = 'inline'
+    # 완료 콜백 URL - 있으면 바로 202로 응답하고 작업이 끝나면 서명한 완료 알림을 POST (callbacks.py)
+    callbackUrl: Optional[Annotated[str, StringConstraints(pattern=r'^https?://\S+$', max_length=2048)]] = None
+    # 표지/푸터 생성일 (YYYY-MM-DD, 없으면 오늘)
+    reportDate: Optional[date] = None
+    # 재현 가능한 출력 - 같은 입력이면 바이트까지 같은 PDF (reportDate 필수, ReportLab 고정 시각/문서 ID)
+    # 산출물 저장소 키(내용 해시)/ETag가 같아져 노드 간 캐시 공유와 바이트 단위 검증이 가능
+    deterministic: bool = False
+    # 응답 timings에 구간별 렌더링 시간 포함 (Server-Timing 헤더는 항상)
+    timings: bool = False
+
+    @field_validator('sections')
+    @classmethod
+    def check_sections(cls, sections):
+        if sections:
+            select_sections(sections)  # 레지스트리에 없는 키면 ValueError → 422
+        return sections
+
+    @model_validator(mode='after')
+    def check_deterministic(self):
+        if self.deterministic and self.reportDate is None:
+            raise ValueError("deterministic 출력에는 reportDate가 필요합니다")
+        return self
+
+    @field_validator('callbackUrl')
+    @classmethod
+    def check_callback(cls, url):
+        if url and not CALLBACK_SECRET:
+            raise ValueError("서버에 콜백 서명 키(GIMPACT_CALLBACK_SECRET)가 설정되지 않았습니다")
+        return check_callback_url(url) if url else url
 
 class TransformedData(BaseModel):
     sections: Dict[str, Any] = {}
     executiveSummary: Optional[str] = None
 
+# 블롭 저장소(POST /blobs)에 올린 JSON 텍스트의 SHA-256 hex
+BlobHash = Annotated[str, StringConstraints(pattern=BLOB_HASH_PATTERN.pattern)]
+# 핸드오프 참조 - 저장소 ID(POST /handoffs) 또는 블롭 해시
+HandoffRef = Union[StrictInt, BlobHash]
+
 class GenerateRequest(BaseModel):
     meta: ReportMeta
-    handoffs: Dict[str, Any]
-    transformed: TransformedData
+    handoffs: HandoffSteps = Field(default_factory=dict)  # 단계별 스키마로 검증 (handoff_schema.py)
+    # 본문 대신 참조 {단계: ID 또는 블롭 해시} - handoffs에 같은 단계가 있으면 본문 우선
+    handoffRefs: Optional[Dict[str, HandoffRef]] = None
+    transformed: TransformedData = Field(default_factory=TransformedData)  # options.transform이면 생략 가능
+    # AI 변환 섹션 참조 {섹션: 블롭 해시} - transformed.sections에 같은 섹션이 있으면 본문 우선
+    transformedRefs: Optional[Dict[str, BlobHash]] = None
     options: ReportOptions
 
 class GenerateResponse(BaseModel):
     success: bool
     summaryPdf: Optional[str] = None  # Base64 encoded
     detailPdf: Optional[str] = None   # Base64 encoded
+    # options.output='url'이면 PDF 대신 다운로드 URL (urlExpiresAt까지 유효, Range/ETag 지원)
+    summaryUrl: Optional[str] = None
+    detailUrl: Optional[str] = None
+    urlExpiresAt: Optional[str] = None
     summaryPages: Optional[int] = None
     detailPages: Optional[int] = None
     error: Optional[str] = None
     generatedAt: Optional[str] = None
+    # 렌더링 지표 (보고서별: 섹션, 생략한 섹션, 페이지 수, 렌더링 시간 등)
+    metrics: Optional[Dict[str, Any]] = None
+    # 렌더링은 됐지만 값이 의심스러운 핸드오프 필드 (점수 범위 등) [{path, type, message}]
+    warnings: Optional[List[Dict[str, Any]]] = None
+    # 진행 이벤트 작업 ID (GET /jobs/{jobId}, /jobs/{jobId}/events)
+    jobId: Optional[str] = None
+    # options.timings이면 단계 시간(transform_ms, summary_ms, detail_ms, total_ms)과
+    # 보고서별 구간 시간 {summary|detail: {build.pestel, chart.radar, doc.build, ...: {ms, count}}}
+    timings: Optional[Dict[str, Any]] = None
+
+class ValidateRequest(BaseModel):
+    """/validate 본문 - AI 변환 전에도 보낼 수 있도록 handoffs 외에는 선택"""
+    meta: Optional[ReportMeta] = None
+    handoffs: HandoffSteps = Field(default_factory=dict)
+    handoffRefs: Optional[Dict[str, HandoffRef]] = None
+    transformed: Optional[TransformedData] = None
+    options: Optional[ReportOptions] = None
+
+class ValidateResponse(BaseModel):
+    valid: bool
+    errors: List[Dict[str, Any]] = []    # 렌더링 불가 (생성 요청 시 422)
+    warnings: List[Dict[str, Any]] = []  # 렌더링은 가능
+    elapsedMs: float
+
+class StoreHandoffsRequest(BaseModel):
+    """POST /handoffs 본문 - 기업/BM의 단계별 핸드오프 (검증 후 저장, 블롭 해시로 참조 가능)"""
+    business_name: str
+    bm: Optional[str] = "ALL"
+    handoffs: HandoffSteps = Field(default_factory=dict)
+    handoffRefs: Optional[Dict[str, HandoffRef]] = None
+
+class StoredHandoffInfo(BaseModel):
+    id: int
+    version: int
+    created: bool = False  # 이번 요청으로 새 버전이 추가됐으면 True
+    bm: Optional[str] = None
+
+class StoreHandoffsResponse(BaseModel):
+    businessKey: str
+    handoffs: Dict[str, StoredHandoffInfo]
+    ignored: List[str] = []  # 단계 핸드오프가 아니라 저장하지 않은 키
+
+class MissingBlobsRequest(BaseModel):
+    hashes: List[BlobHash]
+
+class MissingBlobsResponse(BaseModel):
+    missing: List[str]  # 업로드해야 하는 해시
+
+class UploadBlobsRequest(BaseModel):
+    """POST /blobs 본문 - {해시: JSON 텍스트} (텍스트는 파싱하지 않고 해시만 확인해 저장)"""
+    blobs: Dict[BlobHash, str]
+
+class UploadBlobsResponse(BaseModel):
+    stored: int     # 새로 저장한 블롭 수
+    existing: int   # 이미 있던 블롭 수
+    bytes: int
+
+def reject_request(errors: List[Dict[str, Any]]):
+    """검증 오류를 JSON 경로로 정리해 422 (렌더링 전)"""
+    errors = clean_errors(errors)
+    print(f"요청 거부 (렌더링 전): 문제 {len(errors)}개 - {errors[0]['path']}")
+    raise RequestValidationError(errors)
+
+# 블롭 파싱 결과 캐시 - pickle 바이트로 두고 요청마다 새 객체로 풀어 줌
+# (요청이 핸드오프 dict를 고쳐도 다른 요청에 영향 없음, pickle.loads는 다시 검증하는 것보다 몇 배 빠름)
+@lru_cache(maxsize=512)
+def _parsed_handoff_blob(step: str, digest: str) -> bytes:
+    data = get_blob_store().get(digest)
+    if data is None:
+        raise KeyError(digest)
+    return pickle.dumps(step_adapter(step).validate_json(data), pickle.HIGHEST_PROTOCOL)
+
+@lru_cache(maxsize=512)
+def _parsed_section_blob(digest: str) -> bytes:
+    data = get_blob_store().get(digest)
+    if data is None:
+        raise KeyError(digest)
+    return pickle.dumps(json.loads(data), pickle.HIGHEST_PROTOCOL)
+
+def load_handoff_blob(step: str, digest: str) -> Dict[str, Any]:
+    """블롭으로 올린 핸드오프를 단계 스키마로 검증 (같은 해시는 프로세스당 한 번만 파싱, 호출마다 새 dict)
+
+    블롭이 없으면(저장소에서 삭제된 경우 포함) KeyError, 스키마에 맞지 않으면 ValidationError (캐시하지 않음)
+    """
+    if not get_blob_store().touch(digest):
+        raise KeyError(digest)
+    return pickle.loads(_parsed_handoff_blob(step, digest))
+
+def load_section_blob(digest: str) -> Any:
+    """블롭으로 올린 AI 변환 섹션 (같은 해시는 프로세스당 한 번만 파싱, 호출마다 새 객체)"""
+    if not get_blob_store().touch(digest):
+        raise KeyError(digest)
+    return pickle.loads(_parsed_section_blob(digest))
+
+def _missing_ref(loc, ref) -> Dict[str, Any]:
+    return {'type': 'not_found', 'loc': loc, 'input': ref,
+            'msg': f"저장된 데이터가 없습니다: {ref} (본문으로 다시 보내야 함)"}
+
+def resolve_handoff_refs(request) -> List[Dict[str, Any]]:
+    """handoffRefs의 핸드오프를 request.handoffs에 채움 (본문에 같은 단계가 있으면 본문 우선)
+
+    저장소 ID는 저장할 때 검증된 핸드오프, 블롭 해시는 여기서 단계 스키마로 검증
+    Returns:
+        pydantic 형식 오류 목록 (없는 ID/해시, 다른 단계의 ID, 블롭 스키마 오류)
+    """
+    if not request.handoffRefs:
+        return []
+    refs = {step: ref for step, ref in request.handoffRefs.items() if step not in request.handoffs}
+    ids = [ref for ref in refs.values() if isinstance(ref, int)]
+    stored = get_handoff_store().get_many(ids) if ids else {}
+    errors = []
+    for step, ref in refs.items():
+        loc = ('handoffRefs', step)
+        if isinstance(ref, str):
+            if step not in HANDOFF_STEPS:
+                errors.append({'type': 'unknown_step', 'loc': loc, 'input': ref,
+                               'msg': f"알 수 없는 단계: {step} (가능: {', '.join(HANDOFF_STEPS)})"})
+                continue
+            try:
+                request.handoffs[step] = load_handoff_blob(step, ref)
+            except KeyError:
+                errors.append(_missing_ref(loc, ref))
+            except ValidationError as e:
+                errors.extend(dict(error, loc=loc + tuple(error['loc']))
+                              for error in e.errors(include_url=False, include_context=False))
+            continue
+        row = stored.get(ref)
+        if row is None:
+            errors.append(_missing_ref(loc, ref))
+        elif row.step != step:
+            errors.append({'type': 'step_mismatch', 'loc': loc, 'input': ref,
+                           'msg': f"다른 단계의 핸드오프입니다: {ref} ({row.step})"})
+        else:
+            request.handoffs[step] = row.payload
+    return errors
+
+def resolve_transformed_refs(request) -> List[Dict[str, Any]]:
+    """transformedRefs의 AI 변환 섹션을 request.transformed.sections에 채움 (본문 우선)"""
+    if not request.transformedRefs:
+        return []
+    errors = []
+    sections = request.transformed.sections
+    for section, digest in request.transformedRefs.items():
+        if section in sections:
+            continue
+        loc = ('transformedRefs', section)
+        try:
+            sections[section] = load_section_blob(digest)
+        except KeyError:
+            errors.append(_missing_ref(loc, digest))
+        except ValueError as e:
+            errors.append({'type': 'json_invalid', 'loc': loc, 'input': digest, 'msg': f"JSON이 아닙니다: {e}"})
+    return errors
+
+async def transform_request(request: GenerateRequest, progress=None) -> Optional[Dict[str, Any]]:
+    """options.transform이면 transformed에 없는 섹션/경영진 요약을 서버에서 AI 변환해 채움
+
+    Returns:
+        변환 지표 (backend, model, calls, cached, failed, retries, elapsed_ms) - 변환할 것이 없으면 None
+    """
+    if not request.options.transform:
+        return None
+    present = request.transformed.sections
+    missing = [section_id for section_id, source, _ in TRANSFORM_STEPS
+               if section_id not in present and request.handoffs.get(source)]
+    executive = not request.transformed.executiveSummary
+    if not missing and not executive:
+        return None
+    transformed, stats = await get_transformer().transform_all(
+        request.handoffs, request.meta.business_name, sections=missing, executive=executive, progress=progress)
+    present.update(transformed['sections'])
+    if executive:
+        request.transformed.executiveSummary = transformed['executiveSummary']
+    print(f"AI 변환: 섹션 {len(transformed['sections'])}개, 호출 {stats['calls']}회 (캐시 {stats['cached']}, "
+          f"실패 {stats['failed']}, 재시도 {stats['retries']}), {stats['elapsed_ms']}ms")
+    return stats
+
+async def run_render(fn, *args, **kwargs):
+    """렌더링 함수를 스레드에서 실행 (RENDER_LOCK으로 한 번에 하나)"""
+    def locked():
+        with RENDER_LOCK:
+            return fn(*args, **kwargs)
+    return await asyncio.to_thread(locked)
+
+def sse_message(seq: Optional[int], event: str, data: Dict[str, Any]) -> str:
+    """SSE 메시지 하나 (id / event / data 한 줄 JSON)"""
+    head = f"id: {seq}\n" if seq is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def parse_generate_request(raw: Request) -> GenerateRequest:
+    """요청 본문 바이트를 GenerateRequest로 바로 검증
+
+    FastAPI 기본 경로(json.loads로 dict 그래프 생성 후 검증)를 거치지 않고
+    model_validate_json으로 한 번에 파싱 - 잘못된 핸드오프는 렌더링 전에 422
+    handoffRefs/transformedRefs는 저장소/블롭에서 채움
+    """
+    body = await raw.body()
+    try:
+        request = GenerateRequest.model_validate_json(body)
+    except ValidationError as e:
+        reject_request(e.errors(include_url=False, include_context=False))
+    errors = resolve_handoff_refs(request) + resolve_transformed_refs(request)
+    if errors:
+        reject_request(errors)
+    return request
+
+async def render_reports(request: GenerateRequest, job, result: GenerateResponse, store_pdf):
+    """요약/상세 보고서를 렌더링해 result를 채우고 작업 진행 이벤트를 발행
+    
+    Args:
+        store_pdf: 완성된 PDF 처리 await store_pdf(보고서, spool) - 응답 Base64 또는 산출물 저장소
+    
+    Returns:
+        (응답, 시간 {transform_ms, summary_ms, detail_ms, total_ms, summary: {구간}, detail: {구간}})
+        - 실패하면 success=False 응답
+    """
+    started = time.perf_counter()
+    timings = {}
+    transform = None
+    try:
+        # 데이터 준비 (핸드오프는 한 번만 정규화해 두 보고서가 공유)
+        report_data = prepare_report_data(request)
+        handoffs = parse_handoffs(report_data)
+        result.warnings = check_handoffs(request.handoffs) or None
+        job.publish('validated', steps=list(request.handoffs), warnings=len(result.warnings or ()))
+        metrics = {}
+        
+        # 서버 AI 변환 (상세 보고서 본문에만 쓰이므로 요약 보고서 렌더링 중에 진행)
+        if request.options.generateDetail:
+            transform = asyncio.create_task(transform_request(request, job.reporter()))
+        
+        # 요약 보고서 생성
+        if request.options.generateSummary:
+            summary_metrics = metrics['summary'] = {}
+            step_started = time.perf_counter()
+            with RenderSpool() as spool:
+                _, summary_pages = await run_render(
+                    generate_summary_report,
+                    report_data, 
+                    request.transformed,
+                    request.meta.business_name,
+                    sections=request.options.sections,
+                    metrics=summary_metrics,
+                    output=spool,
+                    handoffs=handoffs,
+                    progress=job.reporter(report='summary'),
+                    report_date=request.options.reportDate,
+                    invariant=request.options.deterministic,
+                    timings=timings.setdefault('summary', {})
+                )
+                size = spool.size()
+                await store_pdf('summary', spool)
+                job.publish('pdf', report='summary', pages=summary_pages, bytes=size)
+            result.summaryPages = summary_pages
+            timings['summary_ms'] = round((time.perf_counter() - step_started) * 1000)
+        
+        # 상세 보고서 생성
+        if request.options.generateDetail:
+            transform_stats = await transform
+            if transform_stats:
+                metrics['transform'] = transform_stats
+                timings['transform_ms'] = transform_stats['elapsed_ms']
+            dropped = detail_section_order(request.transformed.sections)[1]
+            if dropped:
+                result.warnings = (result.warnings or []) + [
+                    {'path': f"$.transformed.sections.{key}", 'type': 'warning',
+                     'message': "요약 보고서 섹션이라 상세 보고서에 넣지 않음"}
+                    for key in dropped
+                ]
+            step_started = time.perf_counter()
+            with RenderSpool() as spool:
+                _, detail_pages = await run_render(
+                    generate_detail_report,
+                    report_data,
+                    request.transformed,
+                    request.meta.business_name,
+                    output=spool,
+                    handoffs=handoffs,
+                    progress=job.reporter(report='detail'),
+                    report_date=request.options.reportDate,
+                    invariant=request.options.deterministic,
+                    timings=timings.setdefault('detail', {})
+                )
+                size = spool.size()
+                await store_pdf('detail', spool)
+                job.publish('pdf', report='detail', pages=detail_pages, bytes=size)
+            result.detailPages = detail_pages
+            timings['detail_ms'] = round((time.perf_counter() - step_started) * 1000)
+        
+        result.metrics = metrics or None
+        timings['total_ms'] = round((time.perf_counter() - started) * 1000)
+        if request.options.timings:
+            result.timings = timings
+        job.finish(True, summaryPages=result.summaryPages, detailPages=result.detailPages)
+        return result, timings
+        
+    except Exception as e:
+        traceback.print_exc()
+        if transform is not None:
+            transform.cancel()
+        job.finish(False, error=str(e))
+        timings['total_ms'] = round((time.perf_counter() - started) * 1000)
+        return GenerateResponse(
+            success=False,
+            error=str(e),
+            generatedAt=datetime.now().isoformat(),
+            jobId=job.id
+        ), timings
+
+async def store_artifact(spool: "RenderSpool", report: str, business_name: str):
+    """스풀 PDF를 산출물 저장소에 저장 → (Artifact, 다운로드 파일명)"""
+    artifact = await asyncio.to_thread(get_artifact_store().put_file, spool.to_path())
+    return artifact, f"{business_name}_{REPORT_FILENAMES[report]}.pdf"
+
+async def run_callback_job(request: GenerateRequest, job, result: GenerateResponse, base_url: str):
+    """콜백 작업 - 보고서를 산출물 저장소에 렌더링한 뒤 완료 알림 전달 (PDF는 유효 시간이 짧은 URL)"""
+    async def keep_pdf(report, spool):
+        artifact, filename = await store_artifact(spool, report, request.meta.business_name)
+        job.add_result(report, artifact.key, filename, artifact.size)
+    
+    result, timings = await render_reports(request, job, result, keep_pdf)
+    reports = {}
+    for report, info in job.results.items() if result.success else ():
+        url, expires = get_artifact_store().url(info["key"], info["filename"], base_url)
+        reports[report] = {
+            "url": url,
+            "expiresAt": datetime.fromtimestamp(expires).isoformat(),
+            "pages": getattr(result, f"{report}Pages"),
+            "bytes": info["size"],
+        }
+    notice = {
+        "event": "report.completed" if result.success else "report.failed",
+        "jobId": job.id,
+        "status": job.status,
+        "businessName": request.meta.business_name,
+        "generatedAt": result.generatedAt,
+        "finishedAt": datetime.fromtimestamp(job.finished).isoformat(),
+        "reports": reports,
+        "timings": timings,
+        "warnings": len(result.warnings or ()),
+        "error": result.error,
+    }
+    delivery = await deliver(request.options.callbackUrl, notice)
+    job.publish('callback', **delivery)
+    print(f"콜백 {'전달' if delivery['delivered'] else '실패'}: {job.id} → {request.options.callbackUrl} "
+          f"({delivery['attempts']}회)")
 
 # ============================================
 # API 엔드포인트
@@ -101,103 +554,462 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.post("/validate", response_model=ValidateResponse)
+async def validate_request(raw: Request):
+    """
+    핸드오프 사전 검증 (렌더링 없음, 수 ms)
+    
+    /generate와 같은 스키마로 검사해 문제마다 JSON 경로와 메시지를 반환
+    - errors: 이대로 /generate를 호출하면 422
+    - warnings: 렌더링은 되지만 결과가 이상해지는 값 (점수 범위, 시나리오 확률 등)
+    """
+    started = time.perf_counter()
+    body = await raw.body()
+    try:
+        request = ValidateRequest.model_validate_json(body)
+        errors = problems_from_errors(resolve_handoff_refs(request))
+        warnings = check_handoffs(request.handoffs)
+    except ValidationError as e:
+        errors = problems_from_errors(e.errors(include_url=False, include_context=False))
+        warnings = []
+    return ValidateResponse(
+        valid=not errors,
+        errors=errors,
+        warnings=warnings,
+        elapsedMs=round((time.perf_counter() - started) * 1000, 2)
+    )
+
+@app.post("/handoffs", response_model=StoreHandoffsResponse)
+async def store_handoffs(raw: Request):
+    """
+    핸드오프 저장 (기업명 + BM + 단계별 버전, SQLite)
+    
+    단계마다 최신 버전과 내용이 같으면 기존 ID, 다르면 새 버전을 추가하고 ID 반환
+    - 반환한 ID를 /generate, /validate의 handoffRefs로 보내면 핸드오프 본문 생략 가능
+    """
+    body = await raw.body()
+    try:
+        request = StoreHandoffsRequest.model_validate_json(body)
+    except ValidationError as e:
+        reject_request(e.errors(include_url=False, include_context=False))
+    errors = resolve_handoff_refs(request)
+    if errors:
+        reject_request(errors)
+    steps = {k: v for k, v in request.handoffs.items() if k in HANDOFF_STEPS}
+    results = get_handoff_store().upsert_many(request.business_name, request.bm, steps)
+    return StoreHandoffsResponse(
+        businessKey=normalize_business_name(request.business_name),
+        handoffs={step: StoredHandoffInfo(**r._asdict(), bm=request.bm or "ALL") for step, r in results.items()},
+        ignored=[k for k in request.handoffs if k not in steps]
+    )
+
+@app.get("/handoffs/latest", response_model=StoreHandoffsResponse)
+async def latest_handoffs(business_name: str, bm: str = "ALL"):
+    """기업의 단계별 최신 핸드오프 ID (BM이 ALL이 아니면 해당 BM과 ALL 중 최신)"""
+    latest = get_handoff_store().latest(business_name, bm)
+    return StoreHandoffsResponse(
+        businessKey=normalize_business_name(business_name),
+        handoffs={step: StoredHandoffInfo(id=i, version=v, bm=row_bm) for step, (i, v, row_bm) in latest.items()}
+    )
+
+@app.get("/handoffs/{handoff_id}")
+async def get_stored_handoff(handoff_id: int):
+    """저장된 핸드오프 하나 (본문 포함)"""
+    stored = get_handoff_store().get(handoff_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"저장된 핸드오프가 없습니다: {handoff_id}")
+    return stored._asdict()
+
+@app.post("/blobs/missing", response_model=MissingBlobsResponse)
+async def missing_blobs(request: MissingBlobsRequest):
+    """
+    업로드 1단계: 서버에 없는 블롭 해시
+    
+    클라이언트는 핸드오프 단계/AI 변환 섹션마다 JSON 텍스트의 SHA-256을 보내고,
+    응답의 해시만 POST /blobs로 업로드한 뒤 handoffRefs/transformedRefs로 참조
+    """
+    return MissingBlobsResponse(missing=get_blob_store().missing(request.hashes))
+
+@app.post("/blobs", response_model=UploadBlobsResponse)
+async def upload_blobs(raw: Request):
+    """업로드 2단계: {해시: JSON 텍스트} 저장 (해시가 내용과 다르면 422, 용량 상한 넘으면 오래된 블롭 삭제)"""
+    body = await raw.body()
+    try:
+        request = UploadBlobsRequest.model_validate_json(body)
+    except ValidationError as e:
+        reject_request(e.errors(include_url=False, include_context=False))
+    store = get_blob_store()
+    stored = existing = size = 0
+    errors = []
+    for digest, text in request.blobs.items():
+        try:
+            if store.put(digest, text):
+                stored += 1
+            else:
+                existing += 1
+            size += len(text.encode('utf-8'))
+        except ValueError as e:
+            errors.append({'type': 'hash_mismatch', 'loc': ('blobs', digest), 'input': digest, 'msg': str(e)})
+    if stored:
+        store.prune()
+    if errors:
+        reject_request(errors)
+    return UploadBlobsResponse(stored=stored, existing=existing, bytes=size)
+
 @app.post("/generate", response_model=GenerateResponse)
-async def generate_report(request: GenerateRequest):
+async def generate_report(raw: Request, response: Response,
+                          request: GenerateRequest = Depends(parse_generate_request)):
     """
     PDF 리포트 생성
     
     - 요약 보고서 (15페이지, 디자인된 PDF)
     - 상세 보고서 (50-100페이지)
+    - options.transform이면 서버에서 AI 변환 (ai_transform.py) - 요약 보고서 렌더링과 동시에 진행
+    - 진행 상황은 GET /jobs/{jobId}/events (SSE)로 받을 수 있음 (options.jobId 또는 응답 jobId)
+    - options.callbackUrl이 있으면 PDF 없이 202 (jobId)로 바로 응답하고, 끝나면 완료 알림을 POST
+      (PDF는 알림의 reports.*.url - 만료되면 GET /jobs/{jobId}/reports/{summary|detail}로 새 URL)
+    - options.output='url'이면 PDF 대신 산출물 저장소의 다운로드 URL (summaryUrl, detailUrl)
+    - 단계/구간별 렌더링 시간은 Server-Timing 헤더 (options.timings이면 응답 timings에도)
     
     Returns:
         Base64 인코딩된 PDF 데이터
     """
     try:
-        result = GenerateResponse(
-            success=True,
-            generatedAt=datetime.now().isoformat()
-        )
-        
-        # 데이터 준비
-        report_data = prepare_report_data(request)
-        
-        # 요약 보고서 생성
-        if request.options.generateSummary:
-            summary_buf, summary_pages = generate_summary_report(
-                report_data, 
-                request.transformed,
-                request.meta.business_name
-            )
-            result.summaryPdf = base64.b64encode(summary_buf.getvalue()).decode('utf-8')
-            result.summaryPages = summary_pages
-        
-        # 상세 보고서 생성
-        if request.options.generateDetail:
-            detail_buf, detail_pages = generate_detail_report(
-                report_data,
-                request.transformed,
-                request.meta.business_name
-            )
-            result.detailPdf = base64.b64encode(detail_buf.getvalue()).decode('utf-8')
-            result.detailPages = detail_pages
-        
-        return result
-        
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return GenerateResponse(
-            success=False,
-            error=str(e),
-            generatedAt=datetime.now().isoformat()
-        )
+        job = get_job_registry().create(request.options.jobId)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    result = GenerateResponse(
+        success=True,
+        generatedAt=datetime.now().isoformat(),
+        jobId=job.id
+    )
+    
+    base_url = PUBLIC_URL or str(raw.base_url).rstrip("/")
+    if request.options.callbackUrl:
+        task = asyncio.create_task(run_callback_job(request, job, result, base_url))
+        BACKGROUND_JOBS.add(task)
+        task.add_done_callback(BACKGROUND_JOBS.discard)
+        return JSONResponse(status_code=202, content=result.model_dump(exclude_none=True),
+                            headers={"Location": f"/jobs/{job.id}"})
+    
+    async def inline_pdf(report, spool):
+        setattr(result, f"{report}Pdf", spool.read_base64())
+    
+    async def url_pdf(report, spool):
+        artifact, filename = await store_artifact(spool, report, request.meta.business_name)
+        url, expires = get_artifact_store().url(artifact.key, filename, base_url)
+        setattr(result, f"{report}Url", url)
+        result.urlExpiresAt = datetime.fromtimestamp(expires).isoformat()
+    
+    result, timings = await render_reports(request, job, result,
+                                           url_pdf if request.options.output == 'url' else inline_pdf)
+    response.headers["Server-Timing"] = server_timing_header(timings)
+    return result
 
 @app.post("/generate/summary")
-async def generate_summary_only(request: GenerateRequest):
-    """요약 보고서만 생성 (스트리밍 응답)"""
+async def generate_summary_only(request: GenerateRequest = Depends(parse_generate_request)):
+    """요약 보고서만 생성 (디스크 임시 파일에서 스트리밍)"""
+    spool = RenderSpool()
+    timings = {"summary": {}}
     try:
         report_data = prepare_report_data(request)
-        pdf_buf, _ = generate_summary_report(
+        started = time.perf_counter()
+        await run_render(
+            generate_summary_report,
             report_data,
             request.transformed,
-            request.meta.business_name
-        )
-        
-        return StreamingResponse(
-            pdf_buf,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={request.meta.business_name}_요약보고서.pdf"
-            }
+            request.meta.business_name,
+            sections=request.options.sections,
+            output=spool,
+            report_date=request.options.reportDate,
+            invariant=request.options.deterministic,
+            timings=timings["summary"]
         )
+        timings["summary_ms"] = round((time.perf_counter() - started) * 1000)
+        return spooled_pdf_response(spool, f"{request.meta.business_name}_요약보고서.pdf",
+                                    etag=request.options.deterministic, timings=timings)
     except Exception as e:
+        spool.close()
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/generate/detail")
-async def generate_detail_only(request: GenerateRequest):
-    """상세 보고서만 생성 (스트리밍 응답)"""
+async def generate_detail_only(request: GenerateRequest = Depends(parse_generate_request)):
+    """상세 보고서만 생성 (디스크 임시 파일에서 스트리밍, options.transform이면 서버에서 AI 변환)"""
+    spool = RenderSpool()
+    timings = {"detail": {}}
     try:
+        transform_stats = await transform_request(request)
+        if transform_stats:
+            timings["transform_ms"] = transform_stats["elapsed_ms"]
         report_data = prepare_report_data(request)
-        pdf_buf, _ = generate_detail_report(
+        started = time.perf_counter()
+        await run_render(
+            generate_detail_report,
             report_data,
             request.transformed,
-            request.meta.business_name
-        )
-        
-        return StreamingResponse(
-            pdf_buf,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={request.meta.business_name}_상세보고서.pdf"
-            }
+            request.meta.business_name,
+            output=spool,
+            report_date=request.options.reportDate,
+            invariant=request.options.deterministic,
+            timings=timings["detail"]
         )
+        timings["detail_ms"] = round((time.perf_counter() - started) * 1000)
+        return spooled_pdf_response(spool, f"{request.meta.business_name}_상세보고서.pdf",
+                                    etag=request.options.deterministic, timings=timings)
     except Exception as e:
+        spool.close()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태와 지금까지의 진행 이벤트 (SSE를 쓸 수 없는 클라이언트용)"""
+    job = get_job_registry().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업이 없습니다: {job_id}")
+    return job.snapshot()
+
+@app.get("/jobs/{job_id}/reports/{report}")
+async def get_job_report(job_id: str, report: str, raw: Request):
+    """콜백 작업의 보고서 PDF - 새로 서명한 다운로드 URL로 리다이렉트 (작업 보관 시간 동안)"""
+    job = get_job_registry().get(job_id)
+    if job is None or report not in job.results:
+        raise HTTPException(status_code=404, detail=f"보고서가 없습니다: {job_id}/{report}")
+    result = job.results[report]
+    url, _ = get_artifact_store().url(result["key"], result["filename"],
+                                      PUBLIC_URL or str(raw.base_url).rstrip("/"))
+    return RedirectResponse(url, status_code=307)
+
+@app.api_route("/artifacts/{key}", methods=["GET", "HEAD"])
+async def download_artifact(key: str, raw: Request, name: str = "", expires: str = "", sig: str = ""):
+    """
+    산출물 다운로드 (로컬 저장소의 서명한 URL)
+    
+    - 만료/변조된 URL은 403
+    - ETag = 내용 SHA-256, If-None-Match가 같으면 304
+    - Range: bytes=시작-끝 (단일 구간) → 206, 범위 밖이면 416 / If-Range가 다르면 전체
+    """
+    store = get_artifact_store()
+    if not ARTIFACT_KEY_PATTERN.match(key) or not hasattr(store, "verify"):
+        raise HTTPException(status_code=404, detail=f"산출물이 없습니다: {key}")
+    if not store.verify(key, name, expires, sig):
+        raise HTTPException(status_code=403, detail="다운로드 URL이 만료되었거나 올바르지 않습니다")
+    path = store.path(key)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"산출물이 없습니다: {key}")
+    
+    size = os.path.getsize(path)
+    etag = f'"{key.split(".")[0]}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": f"private, max-age={max(0, int(expires) - int(time.time()))}",
+        "Content-Disposition": content_disposition(name),
+    }
+    if etag in [tag.strip() for tag in raw.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    start, end, status = 0, size - 1, 200
+    byte_range = raw.headers.get("range")
+    if_range = raw.headers.get("if-range")
+    if byte_range and (if_range is None or if_range == etag):
+        span = parse_byte_range(byte_range, size)
+        if span is None:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if span is not False:
+            (start, end), status = span, 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    if raw.method == "HEAD":
+        return Response(status_code=status, headers=headers, media_type="application/pdf")
+    return StreamingResponse(read_file_range(path, start, end), status_code=status, headers=headers,
+                             media_type="application/pdf")
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, raw: Request):
+    """
+    작업 진행 이벤트 스트림 (Server-Sent Events, text/event-stream)
+    
+    - 이벤트 종류/데이터는 jobs.py 참고 (validated, transform, section, chart, layout, pdf, done/failed)
+    - /generate 전에 연결해도 됨 - 작업이 시작될 때까지 대기 (JOB_START_TIMEOUT 지나면 expired)
+    - 재연결 시 Last-Event-ID 이후 이벤트부터, 작업이 끝나면 스트림 종료
+    """
+    if not JOB_ID_PATTERN.match(job_id):
+        raise HTTPException(status_code=422, detail=f"작업 ID 형식이 아닙니다: {job_id}")
+    job = get_job_registry().get(job_id, create=True)
+    try:
+        last_seq = int(raw.headers.get("last-event-id") or 0)
+    except ValueError:
+        last_seq = 0
+    
+    async def stream():
+        seq = last_seq
+        yield "retry: 3000\n\n"
+        while True:
+            for seq, event, data in job.events_after(seq):
+                yield sse_message(seq, event, data)
+            if job.closed and not job.events_after(seq):
+                return
+            if job.status == PENDING and time.time() - job.created > JOB_START_TIMEOUT:
+                yield sse_message(None, "expired", {"jobId": job_id})
+                return
+            if await raw.is_disconnected():
+                return
+            await job.wait(seq, SSE_KEEPALIVE_SECONDS)
+            if not job.events_after(seq) and not job.closed:
+                yield ": keepalive\n\n"
+    
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 # ============================================
 # 유틸리티 함수
 # ============================================
 
+class RenderSpool:
+    """렌더링 출력 버퍼
+    
+    max_size까지는 메모리(BytesIO)에 쓰고, 넘으면 SPOOL_DIR의 임시 파일로 옮겨 계속 씀.
+    tempfile.SpooledTemporaryFile과 달리 넘긴 파일에 경로가 있어 FileResponse로 바로 전송 가능.
+    close()에서 임시 파일 삭제.
+    """
+    
+    def __init__(self, max_size: int = SPOOL_MAX_BYTES):
+        self.max_size = max_size
+        self.path: Optional[str] = None
+        self._file = BytesIO()
+    
+    def write(self, data) -> int:
+        if self.path is None and self._file.tell() + len(data) > self.max_size:
+            self.rollover()
+        return self._file.write(data)
+    
+    def rollover(self):
+        """메모리 내용을 디스크 임시 파일로 옮김 (이미 디스크면 무시)"""
+        if self.path is not None:
+            return
+        fd, path = tempfile.mkstemp(prefix="gimpact-", suffix=".pdf", dir=SPOOL_DIR)
+        f = os.fdopen(fd, "w+b")
+        position = self._file.tell()
+        f.write(self._file.getbuffer())
+        f.seek(position)
+        self._file.close()
+        self._file, self.path = f, path
+    
+    def to_path(self) -> str:
+        """디스크 경로 반환 (메모리에 있으면 먼저 파일로 옮김)"""
+        self.rollover()
+        self._file.flush()
+        return self.path
+    
+    def read_base64(self) -> str:
+        """처음부터 전체를 Base64 문자열로 (JSON 응답용)"""
+        self._file.seek(0)
+        return base64.b64encode(self._file.read()).decode("ascii")
+    
+    def seek(self, *args):
+        return self._file.seek(*args)
+    
+    def tell(self) -> int:
+        return self._file.tell()
+    
+    def read(self, *args):
+        return self._file.read(*args)
+    
+    def flush(self):
+        self._file.flush()
+    
+    def size(self) -> int:
+        """지금까지 쓴 바이트 수"""
+        if self.path is None:
+            return self._file.getbuffer().nbytes
+        self._file.flush()
+        return os.fstat(self._file.fileno()).st_size
+    
+    def close(self):
+        self._file.close()
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def parse_byte_range(header: str, size: int):
+    """Range 헤더 → (시작, 끝) / 여러 구간이거나 형식이 다르면 False (전체 전송) / 범위 밖이면 None (416)"""
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return False
+    first, dash, last = spec.strip().partition("-")
+    # 숫자-숫자 / 숫자- / -숫자 만 허용 (bytes=5--3, bytes=+1-2 등은 무시하고 전체 전송)
+    if not dash or not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        return False
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            start, end = max(0, size - int(last)), size - 1  # 마지막 N바이트
+    except ValueError:
+        return False
+    if start >= size or start > end:
+        return None
+    return start, end
+
+def read_file_range(path: str, start: int, end: int):
+    """파일의 [start, end] 구간을 청크 단위로 읽음 (StreamingResponse용)"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def spooled_pdf_response(spool: RenderSpool, filename: str, etag: bool = False,
+                         timings: Optional[Dict[str, Any]] = None) -> FileResponse:
+    """스풀 파일을 FileResponse로 전송 (청크 단위로 디스크에서 읽고, 전송 후 임시 파일 삭제)
+    
+    etag: 내용 SHA-256을 ETag로 (deterministic 출력이면 같은 입력에 같은 ETag)
+    timings: 렌더링 시간 → Server-Timing 헤더
+    """
+    path = spool.to_path()
+    headers = {}
+    if etag:
+        headers["ETag"] = f'"{file_digest(path)}"'
+    if timings:
+        headers["Server-Timing"] = server_timing_header(timings)
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=filename,  # 한글 파일명은 filename*=utf-8''... 로 인코딩됨
+        headers=headers or None,
+        background=BackgroundTask(spool.close)
+    )
+
+def server_timing_header(timings: Dict[str, Any]) -> str:
+    """렌더링 시간 → Server-Timing 헤더 값
+    
+    단계(transform, summary, detail, total) 다음에 보고서별 구간(summary.build.pestel, detail.doc.build 등)
+    - 같은 구간을 여러 번 거쳤으면(차트 등) 합산 시간과 desc="Nx" (헤더 값은 ASCII만 - 예: desc="3x")
+    """
+    entries = [f"{phase};dur={timings[f'{phase}_ms']}" for phase in ("transform", "summary", "detail", "total")
+               if f"{phase}_ms" in timings]
+    for report in ("summary", "detail"):
+        for name, span in (timings.get(report) or {}).items():
+            entry = f"{report}.{name};dur={span['ms']}"
+            if span["count"] > 1:
+                entry += f';desc="{span["count"]}x"'
+            entries.append(entry)
+    return ", ".join(entries)
+
 def check_fonts() -> bool:
     """폰트 파일 존재 여부 확인"""
     font_paths = [
@@ -212,12 +1024,12 @@ def prepare_report_data(request: GenerateRequest) -> Dict[str, Any]:
     data = {
         "company_name": request.meta.business_name,
         "bm": request.meta.bm,
-        "generated_at": datetime.now().isoformat(),
+        "generated_at": (request.options.reportDate.isoformat() if request.options.reportDate
+                         else datetime.now().isoformat()),
     }
     
-    # HANDOFF 데이터 직접 복사
-    for key, value in request.handoffs.items():
-        data[key] = value
+    # 검증된 HANDOFF 데이터 (점수는 숫자로 변환된 상태의 dict)
+    data.update(request.handoffs)
     
     return data
 
@@ -228,70 +1040,95 @@ def prepare_report_data(request: GenerateRequest) -> Dict[str, Any]:
 def generate_summary_report(
     data: Dict[str, Any], 
     transformed: TransformedData,
-    company_name: str
-) -> tuple[BytesIO, int]:
+    company_name: str,
+    sections: Optional[List[str]] = None,
+    metrics: Optional[Dict[str, Any]] = None,
+    output: Optional[RenderSpool] = None,
+    handoffs: Optional[Handoffs] = None,
+    progress=None,
+    report_date: Optional[date] = None,
+    invariant: bool = False,
+    timings: Optional[Dict[str, Any]] = None
+) -> tuple[RenderSpool, int]:
     """
-    요약 보고서 생성 (15페이지)
+    요약 보고서 생성 (전체 약 15페이지)
     
-    구조:
+    구조 (sections로 일부만 선택 가능, 목차도 선택한 섹션만 표시):
     - 표지 (1p)
     - 목차 (1p)
-    - 1PAGE 요약 (1p)
-    - 경영진 요약 (1-2p)
-    - PESTEL 요약 (2p)
-    - 시나리오 (1p)
-    - 경쟁환경 (1p)
-    - 고객/시장 (1p)
-    - 경영진단 (1p)
-    - VRIO (1p)
-    - SWOT (1p)
-    - TOWS 전략 (2p)
+    - 1PAGE 요약 (1p)                 summary
+    - 경영진 요약 (1-2p)              executive
+    - PESTEL 요약 (2p)                pestel
+    - 시나리오 (1p)                   scenario
+    - 경쟁환경 (1p)                   competition
+    - 고객/시장 (1p)                  customer, market
+    - 경영진단 (1p)                   diagnosis
+    - VRIO (1p)                       vrio
+    - SWOT (1p)                       swot
+    - TOWS 전략 (2p)                  tows
+    
+    timings: dict를 넘기면 구간별 시간 {build.*, chart.*, doc.build, stitch: {ms, count}}을 채움
     """
     try:
-        # 기존 PDF 생성기 임포트 시도
-        from analysis_report_generator import GImpactReportGenerator
-        
-        generator = GImpactReportGenerator(data, company_name)
-        pdf_buffer = generator.generate()
-        
-        # 페이지 수 계산 (대략적)
-        pages = 15
-        
-        return pdf_buffer, pages
-        
+        from analysis_report_generator import RenderTimings, collect_timings, generate_analysis_report
     except ImportError:
         # 폴백: 기본 PDF 생성
-        return generate_basic_pdf(data, transformed, company_name, "summary")
+        return generate_basic_pdf(data, transformed, company_name, "summary", output)
+    
+    if metrics is None:
+        metrics = {}
+    pdf_buffer = output if output is not None else RenderSpool()
+    with collect_timings(RenderTimings()) as render_timings:
+        generate_analysis_report(data, pdf_buffer, company_name, sections=sections, metrics=metrics,
+                                 handoffs=handoffs, progress=progress, report_date=report_date, invariant=invariant)
+    if timings is not None:
+        timings.update(render_timings.as_dict())
+    pdf_buffer.seek(0)
+    print(f"요약 보고서: 섹션 {len(metrics['sections'])}개 (생략 {len(metrics['skipped_sections'])}개), "
+          f"{metrics['pages']}페이지, {metrics['render_ms']}ms")
+    
+    return pdf_buffer, metrics['pages']
 
 def generate_detail_report(
     data: Dict[str, Any],
     transformed: TransformedData,
-    company_name: str
-) -> tuple[BytesIO, int]:
+    company_name: str,
+    output: Optional[RenderSpool] = None,
+    handoffs: Optional[Handoffs] = None,
+    progress=None,
+    report_date: Optional[date] = None,
+    invariant: bool = False,
+    timings: Optional[Dict[str, Any]] = None
+) -> tuple[RenderSpool, int]:
     """
     상세 보고서 생성 (50-100페이지)
     
-    AI 변환된 텍스트를 사용하여 상세 보고서 생성
+    AI 변환된 텍스트(마크다운)를 사용하여 상세 보고서 생성 - detail_report_generator.py
+    timings: dict를 넘기면 구간별 시간 {build.*, doc.build: {ms, count}}을 채움
     """
     try:
+        from analysis_report_generator import RenderTimings, collect_timings
         from detail_report_generator import DetailReportGenerator
-        
-        generator = DetailReportGenerator(data, transformed.dict(), company_name)
-        pdf_buffer = generator.generate()
-        pages = 50  # 대략적
-        
-        return pdf_buffer, pages
-        
     except ImportError:
         # 폴백: 기본 PDF 생성
-        return generate_basic_pdf(data, transformed, company_name, "detail")
+        return generate_basic_pdf(data, transformed, company_name, "detail", output)
+    
+    generator = DetailReportGenerator(data, transformed.model_dump(), company_name, handoffs, progress,
+                                      report_date=report_date, invariant=invariant)
+    with collect_timings(RenderTimings()) as render_timings:
+        pdf_buffer = generator.generate(output if output is not None else RenderSpool())
+    if timings is not None:
+        timings.update(render_timings.as_dict())
+    
+    return pdf_buffer, generator.page_count
 
 def generate_basic_pdf(
     data: Dict[str, Any],
     transformed: TransformedData,
     company_name: str,
-    report_type: str
-) -> tuple[BytesIO, int]:
+    report_type: str,
+    output: Optional[RenderSpool] = None
+) -> tuple[RenderSpool, int]:
     """
     폴백용 기본 PDF 생성 (ReportLab 직접 사용)
     """
@@ -300,10 +1137,9 @@ def generate_basic_pdf(
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import mm
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
+    from font_cache import register_font
     
-    # 폰트 설정
+    # 폰트 설정 (프로세스당 한 번만 파싱/등록)
     try:
         font_paths = [
             "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
@@ -311,12 +1147,12 @@ def generate_basic_pdf(
         ]
         for fp in font_paths:
             if os.path.exists(fp):
-                pdfmetrics.registerFont(TTFont('NanumGothic', fp))
+                register_font('NanumGothic', fp)
                 break
     except:
         pass
     
-    buffer = BytesIO()
+    buffer = output if output is not None else RenderSpool()
     doc = SimpleDocTemplate(
         buffer,
         pagesize=A4,
@@ -403,8 +1239,7 @@ def generate_basic_pdf(
     doc.build(elements)
     buffer.seek(0)
     
-    pages = 15 if report_type == "summary" else 50
-    return buffer, pages
+    return buffer, doc.page
 
 # ============================================
 # 로컬 실행
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 섹션 조각 캐시 / PDF 이어 붙이기
+
+구조:
+1. 상세 섹션(PESTEL ~ TOWS)마다 자기 핸드오프 데이터만으로 PDF 조각 렌더링
+2. 조각은 입력 해시(섹션 데이터, 회사명, 날짜, 렌더러 버전)로 디스크 캐시
+3. 앞부분(표지/목차/요약)은 매번 렌더링 - 목차 번호는 조각 페이지 수로 계산
+4. pypdf로 이어 붙인 뒤 조각 페이지에 푸터 번호를 찍음
+5. 캐시에 없는 조각은 프로세스 풀에서 동시에 렌더링 가능 (GIMPACT_RENDER_WORKERS)
+
+핸드오프 하나만 바뀐 재실행에서는 해당 섹션만 레이아웃/차트를 다시 그림
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from io import BytesIO
+
+from pypdf import PdfReader, PdfWriter
+from reportlab import Version as REPORTLAB_VERSION
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+import analysis_report_generator as arg
+import handoff_models
+import report_sections
+from font_cache import CACHE_DIR
+
+# ==============================================================================
+# 설정
+# ==============================================================================
+FRAGMENT_CACHE_DIR = os.path.join(CACHE_DIR, 'fragments')
+
+# 조각 포맷이 바뀌면 올려서 기존 캐시 무효화 (렌더러 소스가 바뀌면 자동 무효화)
+FRAGMENT_CACHE_VERSION = 1
+
+# 캐시 전체 크기 상한 - 넘으면 오래 안 쓴 조각부터 삭제
+FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('GIMPACT_FRAGMENT_CACHE_MB', '256')) * 1024 * 1024
+
+def _renderer_digest():
+    """리포트 생성기/핸드오프 모델/섹션 레지스트리 소스 해시 (레이아웃이나 정규화 코드가 바뀌면 모든 조각 무효화)"""
+    digest = hashlib.sha1()
+    for module in (arg, handoff_models, report_sections):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+RENDERER_DIGEST = _renderer_digest()
+
+# 조각 렌더링 프로세스 풀 (요청마다 새로 띄우지 않도록 프로세스당 하나 유지)
+# 풀 생성/교체/종료와 작업 제출은 잠금 안에서 - 교체되는 풀에 다른 스레드가 제출하지 않도록
+_render_pool = None
+_render_pool_size = 0
+_render_pool_lock = threading.Lock()
+
+def _pool_context():
+    """워커 시작 방식 - forkserver (없는 플랫폼은 spawn)
+
+    서버 프로세스는 스레드(렌더링, 이벤트 루프)와 열린 소켓을 가지고 있어 fork하면
+    잠긴 락이나 소켓을 물려받을 수 있음. forkserver는 이 모듈만 임포트한 깨끗한 프로세스에서
+    워커를 fork하므로 워커 시작 비용은 작게 유지됨
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+def get_render_pool(workers):
+    """조각 렌더링 프로세스 풀 (_render_pool_lock을 잡은 채로 호출, 크기가 바뀌면 교체)
+
+    교체된 풀은 이미 제출된 작업을 끝낸 뒤 종료됨 (shutdown(wait=False)는 대기 중인 작업을 취소하지 않음)
+    """
+    global _render_pool, _render_pool_size
+    if _render_pool is None or _render_pool_size != workers:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False)
+        _render_pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+        _render_pool_size = workers
+    return _render_pool
+
+def shutdown_render_pool():
+    """프로세스 풀 종료 (서버 종료 시) - 대기 중인 조각 렌더링은 취소"""
+    global _render_pool, _render_pool_size
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+            _render_pool_size = 0
+
+# ==============================================================================
+# 조각 캐시
+# ==============================================================================
+def _section_data(data, section):
+    """섹션이 읽는 핸드오프만 담은 데이터"""
+    step = arg.REPORT_SECTIONS[section].step
+    return {step: data.get(step, {})}
+
+def _section_benchmark(section, benchmark):
+    """섹션이 쓰는 코호트 비교 (경영진단 차트만 사용)"""
+    return benchmark if section == 'diagnosis' else None
+
+def fragment_key(data, section, company_name, report_date, with_heading, benchmark=None, invariant=False):
+    """섹션 조각 캐시 키 (해당 섹션의 입력 + 고정 출력 여부)"""
+    payload = json.dumps(_section_data(data, section), ensure_ascii=False, sort_keys=True, default=str)
+    benchmark = _section_benchmark(section, benchmark)
+    if benchmark is not None:
+        payload += json.dumps(asdict(benchmark), ensure_ascii=False, sort_keys=True)
+    key = '|'.join([section, str(with_heading), str(invariant), company_name, report_date, payload,
+                    RENDERER_DIGEST, REPORTLAB_VERSION, str(FRAGMENT_CACHE_VERSION)])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]
+
+def _fragment_paths(section, digest):
+    base = os.path.join(FRAGMENT_CACHE_DIR, f"{section}-{digest}")
+    return f"{base}.pdf", f"{base}.json"
+
+def _write_atomic(path, content):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def render_fragment(data, section, company_name, report_date, with_heading=False, handoffs=None,
+                    benchmark=None, invariant=False):
+    """섹션 하나를 단독 PDF로 렌더링 (푸터 번호 없음)
+
+    handoffs: 같은 프로세스에서 이미 정규화한 Handoffs (워커에서는 None - 넘겨받은 섹션만 파싱)
+    benchmark: 경영진단 섹션의 코호트 비교
+    invariant: ReportLab 고정 출력 (생성 시각/문서 ID 고정)
+
+    Returns:
+        (PDF 바이트, 페이지 수, {목차 키: 조각 내 페이지}, 구간 시간 {이름: [초, 횟수]})
+    """
+    with arg.collect_timings(arg.RenderTimings()) as timings:
+        builder = arg.AnalysisReportBuilder(data, company_name, handoffs=handoffs, benchmark=benchmark)
+        if with_heading:
+            builder.build_detail_heading()
+        builder.build_detail_section(section)
+
+        buf = BytesIO()
+        doc = arg.create_report_doc(buf, invariant=invariant, cover=False)
+        template = arg.ReportTemplate(company_name, report_date, number_pages=False)
+        with timings.span('doc.build'):
+            doc.build(builder.elements, onFirstPage=template.header_footer, onLaterPages=template.header_footer)
+    return buf.getvalue(), doc.page, doc.toc_pages, timings.spans
+
+def find_fragment(digest, section):
+    """캐시된 조각 메타 반환 (없거나 깨졌으면 None)"""
+    pdf_path, meta_path = _fragment_paths(section, digest)
+
+    # 메타 파일은 PDF 다음에 쓰므로 메타가 있으면 PDF도 완성된 상태
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        os.utime(pdf_path)  # 최근 사용 표시 (정리 순서)
+    except (OSError, ValueError) as e:
+        print(f"섹션 조각 캐시 로드 실패 ({section}): {e}")
+        return None
+    return dict(meta, section=section, path=pdf_path, cached=True)
+
+def store_fragment(digest, section, pdf, pages, toc_pages, use_cache=True):
+    """렌더링한 조각 저장 후 메타 반환 (저장 못 하면 메모리의 PDF 바이트 사용)"""
+    meta = {'pages': pages, 'toc_pages': toc_pages}
+    if use_cache:
+        pdf_path, meta_path = _fragment_paths(section, digest)
+        try:
+            os.makedirs(FRAGMENT_CACHE_DIR, exist_ok=True)
+            _write_atomic(pdf_path, pdf)
+            _write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+            return dict(meta, section=section, path=pdf_path, cached=False)
+        except OSError as e:
+            # 읽기 전용 파일시스템 등 - 메모리의 조각으로 계속
+            print(f"섹션 조각 캐시 저장 실패 ({section}): {e}")
+    return dict(meta, section=section, pdf=pdf, cached=False)
+
+def load_fragments(data, sections, company_name, report_date, use_cache=True, workers=0, handoffs=None,
+                   benchmark=None, progress=None, invariant=False):
+    """섹션 조각 목록 (순서 유지) - 캐시에 없는 조각만 렌더링
+
+    workers > 1이면 없는 조각을 프로세스 풀에서 동시에 렌더링
+    (섹션끼리는 데이터/레이아웃이 독립이고 각자 페이지 나눔으로 끝남)
+    progress(section, cached): 조각이 준비될 때마다 호출 (캐시 조각 먼저, 렌더링한 조각은 끝나는 대로)
+    렌더링한 조각의 구간 시간은 현재 측정기(arg.collect_timings)에 합산 (워커 조각은 워커 시간 합)
+    """
+    timings = arg.current_timings()
+    jobs = []  # (순서, 섹션, 캐시 키, 첫 섹션 여부)
+    fragments = [None] * len(sections)
+    for i, section in enumerate(sections):
+        with_heading = (i == 0)  # 상세 분석 대제목은 첫 섹션 조각에 포함
+        digest = fragment_key(data, section, company_name, report_date, with_heading, benchmark, invariant)
+        fragments[i] = find_fragment(digest, section) if use_cache else None
+        if fragments[i] is None:
+            jobs.append((i, section, digest, with_heading))
+        elif progress is not None:
+            progress(section, True)
+
+    if workers > 1 and len(jobs) > 1:
+        # 워커에는 해당 섹션의 핸드오프만 넘겨 pickle 비용 최소화
+        with _render_pool_lock:
+            pool = get_render_pool(workers)
+            futures = [
+                pool.submit(render_fragment, _section_data(data, section), section,
+                            company_name, report_date, with_heading,
+                            benchmark=_section_benchmark(section, benchmark), invariant=invariant)
+                for _, section, _, with_heading in jobs
+            ]
+        results = (future.result() for future in futures)
+    else:
+        results = (render_fragment(data, section, company_name, report_date, with_heading, handoffs,
+                                   _section_benchmark(section, benchmark), invariant)
+                   for _, section, _, with_heading in jobs)
+
+    for (i, section, digest, _), (pdf, pages, toc_pages, spans) in zip(jobs, results):
+        if timings is not None:
+            timings.merge(spans)
+        fragments[i] = store_fragment(digest, section, pdf, pages, toc_pages, use_cache)
+        if progress is not None:
+            progress(section, False)
+    return fragments
+
+def prune_fragment_cache(max_bytes=FRAGMENT_CACHE_MAX_BYTES):
+    """캐시 크기가 상한을 넘으면 오래 안 쓴 조각부터 삭제"""
+    if not os.path.isdir(FRAGMENT_CACHE_DIR):
+        return
+    entries = []
+    for name in os.listdir(FRAGMENT_CACHE_DIR):
+        if name.endswith('.pdf'):
+            st = os.stat(os.path.join(FRAGMENT_CACHE_DIR, name))
+            entries.append((st.st_mtime, st.st_size, name[:-len('.pdf')]))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, base in sorted(entries):
+        if total <= max_bytes:
+            break
+        for ext in ('.json', '.pdf'):
+            try:
+                os.remove(os.path.join(FRAGMENT_CACHE_DIR, base + ext))
+            except FileNotFoundError:
+                pass
+        total -= size
+
+# ==============================================================================
+# 이어 붙이기
+# ==============================================================================
+def number_overlay(first_number, count):
+    """푸터 번호만 그린 페이지들 (조각 페이지에 겹쳐 찍음)"""
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=A4)
+    for i in range(count):
+        c.setFillColor(arg.COLORS['medium'])
+        c.setFont(arg.FONT, 8)
+        arg.ReportTemplate.draw_page_number(c, first_number + i)
+        c.showPage()
+    c.save()
+    buf.seek(0)
+    return PdfReader(buf)
+
+def stitch_report(front, fragments, first_number, output_path):
+    """앞부분 PDF 뒤에 섹션 조각을 붙이고 조각 페이지에 번호를 찍어 저장
+
+    output_path: 경로 또는 쓰기 가능한 파일 객체
+    Returns:
+        전체 페이지 수
+    """
+    writer = PdfWriter()
+    front_reader = PdfReader(front)
+    writer.append(front_reader)
+    front_pages = len(writer.pages)
+
+    for fragment in fragments:
+        writer.append(fragment['path'] if 'path' in fragment else BytesIO(fragment['pdf']))
+
+    overlay = number_overlay(first_number, len(writer.pages) - front_pages)
+    for page, number_page in zip(writer.pages[front_pages:], overlay.pages):
+        page.merge_page(number_page)
+
+    if front_reader.metadata:
+        writer.add_metadata(front_reader.metadata)
+    if hasattr(output_path, 'write'):
+        writer.write(output_path)
+    else:
+        with open(output_path, 'wb') as f:
+            writer.write(f)
+    return len(writer.pages)
+
+def generate_incremental_report(data, output_path, template, sections,
+                                use_cache=True, workers=None, metrics=None, handoffs=None, benchmark=None,
+                                progress=None, invariant=False):
+    """섹션 조각으로 분석 리포트 생성 (generate_analysis_report에서 호출)
+
+    template: 앞부분용 ReportTemplate (회사명/날짜/표지 범위)
+    sections: 선택한 섹션 키 (리포트 순서)
+    use_cache: 조각 디스크 캐시 사용 여부
+    workers: 조각 동시 렌더링 프로세스 수 (기본: GIMPACT_RENDER_WORKERS)
+    metrics: dict를 넘기면 페이지 수와 조각 캐시 사용 내역을 채움
+    handoffs: 이미 정규화한 Handoffs (없으면 여기서 한 번 파싱해 앞부분/조각이 공유)
+    benchmark: 코호트 비교 (경영진단 조각에만 반영, 캐시 키에 포함)
+    progress: 진행 콜백 - 앞부분은 빌더/문서 이벤트, 조각은 준비될 때 'section' {cached}
+    invariant: 앞부분과 조각 모두 ReportLab 고정 출력으로 (조각 캐시 키에도 포함 -
+               캐시를 처음 채울 때와 캐시된 조각을 쓸 때 결과 바이트가 같음)
+    """
+    if workers is None:
+        workers = arg.RENDER_WORKERS
+    company_name, report_date = template.company_name, template.report_date
+    handoffs = arg.parse_handoffs(data) if handoffs is None else handoffs
+    builder = arg.AnalysisReportBuilder(data, company_name, sections, handoffs, progress=progress)
+
+    def fragment_ready(section, cached):
+        builder.section_built(section, cached=cached)
+
+    fragments = load_fragments(data, builder.detail_section_keys(), company_name, report_date,
+                               use_cache, workers, handoffs, benchmark,
+                               fragment_ready if progress is not None else None, invariant)
+
+    # 앞부분 렌더링 - 목차의 상세 섹션 번호는 앞부분 페이지 수 + 조각 내 위치
+    doc = arg.create_report_doc(BytesIO(), progress, invariant)
+    offset = 0
+    for fragment in fragments:
+        for key, page in fragment['toc_pages'].items():
+            doc.appended_toc[key] = offset + page
+        offset += fragment['pages']
+
+    front = builder.build_front()
+    with arg.timing_span('doc.build'):
+        doc.build(arg.cover_elements() + front, onFirstPage=template.cover_page, onLaterPages=template.header_footer)
+
+    if progress is not None:
+        for key, page in doc.appended_toc.items():
+            progress('layout', section=key, page=doc.last_number + page)
+
+    doc.filename.seek(0)
+    with arg.timing_span('stitch'):
+        pages = stitch_report(doc.filename, fragments, template.page_num + 1, output_path)
+    if use_cache:
+        prune_fragment_cache()
+
+    cached = [f['section'] for f in fragments if f['cached']]
+    rendered = [f['section'] for f in fragments if not f['cached']]
+    print(f"섹션 조각: {len(fragments)}개 중 {len(cached)}개 캐시 사용"
+          + (f", 렌더링 {', '.join(rendered)}" if rendered else "")
+          + (f" (워커 {workers}개)" if workers > 1 and len(rendered) > 1 else ""))
+    if metrics is not None:
+        metrics.update(pages=pages, fragments_cached=cached, fragments_rendered=rendered)
+    return output_path
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT 리포트 섹션 레지스트리
+목차/섹션 선택 키와 순서 - 렌더러(analysis_report_generator.py)와 요청 검증(pdf_api_server.py)이 함께 사용
+
+요청 검증에서 렌더러(ReportLab/matplotlib)를 임포트하지 않도록 의존성 없는 모듈로 둠
+"""
+
+from collections import namedtuple
+
+# ==============================================================================
+# 섹션 레지스트리
+# ==============================================================================
+# key: 목차/선택 키, step: 섹션이 읽는 핸드오프 키 (요약은 여러 핸드오프를 읽으므로 None)
+# method: 빌더 메서드, title/desc: 목차 항목
+ReportSection = namedtuple('ReportSection', 'key step method title desc')
+
+# 앞부분 요약 - 목차 다음에 나오는 순서
+SUMMARY_SECTIONS = [
+    ReportSection('summary', None, 'build_one_page_summary', '1PAGE 요약', '핵심 결론과 전략 방향'),
+    ReportSection('executive', None, 'build_executive_summary', '경영진 요약', '현황 진단 및 90일 로드맵'),
+]
+
+# 상세 분석 - 나오는 순서
+# 각 섹션은 자기 핸드오프 데이터만 사용하므로 섹션 단위로 따로 렌더링/캐시 가능
+DETAIL_SECTIONS = [
+    ReportSection('pestel', 'step_2_1_pestel', 'build_pestel_detail', '2.1 PESTEL 분석', '거시환경 6대 영역 분석'),
+    ReportSection('scenario', 'step_2_2_scenario', 'build_scenario_detail', '2.2 시나리오 분석', '미래 4대 시나리오'),
+    ReportSection('competition', 'step_2_3_competition', 'build_competition_detail', '2.3 경쟁환경 분석', 'Five Forces 및 경쟁사'),
+    ReportSection('customer', 'step_2_4_customer', 'build_customer_detail', '2.4 고객 분석', 'User/Payer/Beneficiary'),
+    ReportSection('market', 'step_2_5_market', 'build_market_detail', '2.5 시장 분석', 'TAM/SAM/SOM 시장규모'),
+    ReportSection('diagnosis', 'step_3_1_diagnosis', 'build_diagnosis_detail', '3.1 경영진단', '5대 영역 역량 평가'),
+    ReportSection('vrio', 'step_3_2_vrio', 'build_vrio_detail', '3.2 VRIO 분석', '핵심 자원 경쟁우위'),
+    ReportSection('swot', 'step_3_3_swot', 'build_swot_detail', '3.3 SWOT 분석', '강점/약점/기회/위협'),
+    ReportSection('tows', 'step_3_4_tows', 'build_tows_detail', '3.4 TOWS 전략', '전략 옵션 및 우선순위'),
+]
+
+REPORT_SECTIONS = {section.key: section for section in SUMMARY_SECTIONS + DETAIL_SECTIONS}
+
+def select_sections(keys=None):
+    """선택한 섹션 키를 리포트 순서로 정렬 (None/빈 목록이면 전체)
+
+    Raises:
+        ValueError: 레지스트리에 없는 키
+    """
+    if not keys:
+        return list(REPORT_SECTIONS)
+    unknown = [k for k in keys if k not in REPORT_SECTIONS]
+    if unknown:
+        raise ValueError(f"알 수 없는 섹션: {', '.join(unknown)} (가능: {', '.join(REPORT_SECTIONS)})")
+    return [k for k in REPORT_SECTIONS if k in keys]
+
+def detail_section_order(keys):
+    """상세 보고서 본문 순서 → (본문 섹션 키, 빠지는 키)
+
+    레지스트리의 상세 섹션은 레지스트리 순서, 레지스트리에 없는 키는 뒤에 받은 순서대로.
+    요약 섹션 키(summary 등)는 상세 보고서 본문이 없으므로 빠짐 (경영진 요약은 executiveSummary로 받음)
+    """
+    order = [s.key for s in DETAIL_SECTIONS if s.key in keys] + [k for k in keys if k not in REPORT_SECTIONS]
+    dropped = [k for k in keys if k in REPORT_SECTIONS and k not in order]
+    return order, dropped
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""AI 변환 - 섹션 하나의 백엔드 오류는 그 섹션만 {error, original}로 기록"""
+
+import asyncio
+import http.client
+import io
+import os
+import sys
+import urllib.request
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_transform import GeminiBackend, StubBackend, TransformBackend, TransformError, Transformer
+
+HANDOFFS = {
+    'step_2_1_pestel': {'political': ['규제 완화']},
+    'step_3_3_swot': {'strengths': ['기술력']},
+}
+
+class FailingBackend(StubBackend):
+    """PESTEL 프롬프트에서만 ValueError"""
+
+    name = 'failing'
+
+    async def generate(self, prompt):
+        if 'PESTEL' in prompt:
+            raise ValueError('응답 JSON이 잘렸습니다')
+        return await super().generate(prompt)
+
+def test_backend_value_error_fails_one_section():
+    transformer = Transformer(FailingBackend(), rate=0, backoff=0)
+    transformed, stats = asyncio.run(transformer.transform_all(HANDOFFS, 'G임팩트', executive=False))
+
+    pestel = transformed['sections']['pestel']
+    assert pestel['original'] == HANDOFFS['step_2_1_pestel']
+    assert 'ValueError' in pestel['error']
+    assert 'content' in transformed['sections']['swot']
+    assert stats['failed'] == 1 and stats['retries'] == 0
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        TransformBackend()
+
+class FakeResponse(io.BytesIO):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+@pytest.mark.parametrize('body', [b'{"candidates": [', b'{"candidates": []}', b'[]'])
+def test_gemini_unparsable_response_is_not_retryable(monkeypatch, body):
+    monkeypatch.setattr(urllib.request, 'urlopen', lambda request, timeout: FakeResponse(body))
+    with pytest.raises(TransformError) as info:
+        GeminiBackend(api_key='test')._call('프롬프트')
+    assert not info.value.retryable
+
+@pytest.mark.parametrize('error', [http.client.RemoteDisconnected('closed'), ConnectionResetError(104, 'reset')])
+def test_gemini_connection_error_is_retryable(monkeypatch, error):
+    def urlopen(request, timeout):
+        raise error
+    monkeypatch.setattr(urllib.request, 'urlopen', urlopen)
+    with pytest.raises(TransformError) as info:
+        GeminiBackend(api_key='test')._call('프롬프트')
+    assert info.value.retryable
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""블롭 참조 - 파싱 캐시는 요청마다 새 객체를 주고, 저장소에서 삭제된 블롭은 내주지 않음"""
+
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('fastapi')
+
+# 서버 모듈은 임포트할 때 저장소 경로를 읽음 - 테스트용 임시 폴더로
+_tmp = tempfile.mkdtemp(prefix='gimpact-test-')
+for _name, _value in {'GIMPACT_HANDOFF_DB': os.path.join(_tmp, 'handoffs.sqlite3'),
+                      'GIMPACT_BLOB_DIR': os.path.join(_tmp, 'blobs'),
+                      'GIMPACT_ARTIFACT_DIR': os.path.join(_tmp, 'artifacts')}.items():
+    os.environ.setdefault(_name, _value)
+
+import blob_store
+import pdf_api_server as api
+from real_sample_data import REAL_SAMPLE_DATA
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = blob_store.BlobStore(str(tmp_path), max_bytes=0)
+    monkeypatch.setattr(blob_store, '_store', store)
+    api._parsed_handoff_blob.cache_clear()
+    api._parsed_section_blob.cache_clear()
+    yield store
+    api._parsed_handoff_blob.cache_clear()
+    api._parsed_section_blob.cache_clear()
+
+def put(store, value):
+    text = json.dumps(value, ensure_ascii=False)
+    digest = blob_store.blob_hash(text.encode('utf-8'))
+    store.put(digest, text)
+    return digest
+
+def test_each_load_returns_a_fresh_object(store):
+    digest = put(store, REAL_SAMPLE_DATA['step_3_3_swot'])
+    first = api.load_handoff_blob('step_3_3_swot', digest)
+    first['strengths'].clear()
+    assert api.load_handoff_blob('step_3_3_swot', digest)['strengths']
+
+    section = put(store, {'content': '## SWOT'})
+    api.load_section_blob(section)['content'] = '변경'
+    assert api.load_section_blob(section) == {'content': '## SWOT'}
+
+def test_pruned_blob_is_not_served_from_cache(store):
+    digest = put(store, REAL_SAMPLE_DATA['step_3_4_tows'])
+    api.load_handoff_blob('step_3_4_tows', digest)
+
+    assert store.prune() >= 1  # 상한 0 - 모두 삭제
+    assert store.missing([digest]) == [digest]
+    with pytest.raises(KeyError):
+        api.load_handoff_blob('step_3_4_tows', digest)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Range 헤더 해석 - 형식이 다르면 False (전체 200), 범위 밖이면 None (416)"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('fastapi')
+
+from pdf_api_server import parse_byte_range
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 99)),
+    ('bytes=100-', (100, 999)),
+    ('bytes=-100', (900, 999)),
+    ('bytes=900-5000', (900, 999)),
+    ('bytes=1000-', None),
+    ('bytes=50-10', None),
+    ('bytes=5--3', False),
+    ('bytes=+1-2', False),
+    ('bytes=-', False),
+    ('bytes=5', False),
+    ('bytes=0-1,5-6', False),
+    ('items=0-1', False),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, 1000) == expected
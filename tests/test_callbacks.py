@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""콜백 전달 - 로컬 수신 서버(callbacks.make_handler)로 서명/재시도 확인"""
+
+import asyncio
+import os
+import sys
+import threading
+from http.server import HTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from callbacks import check_callback_url, deliver, make_handler
+
+SECRET = 's3cret'
+NOTICE = {'event': 'report.completed', 'jobId': 'job-1', 'status': 'done'}
+
+# 열려 있지 않은 포트 - 연결 실패
+CLOSED_URL = 'http://127.0.0.1:9/callback'
+
+@pytest.fixture
+def receiver():
+    """임시 포트의 수신 서버 → (시작 함수(fail) → URL, 받은 알림 목록)"""
+    servers, received = [], []
+
+    def start(fail=0, secret=SECRET):
+        server = HTTPServer(('127.0.0.1', 0), make_handler(secret, fail, received))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/hook"
+
+    yield start, received
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def test_signed_delivery(receiver):
+    start, received = receiver
+    result = asyncio.run(deliver(start(), NOTICE, secret=SECRET, backoff=0))
+
+    assert result == {'delivered': True, 'attempts': 1, 'status': 204, 'error': None}
+    assert len(received) == 1
+    assert received[0]['valid'] and received[0]['notice'] == NOTICE
+
+def test_wrong_secret_is_rejected(receiver):
+    start, received = receiver
+    result = asyncio.run(deliver(start(secret='other'), NOTICE, secret=SECRET, backoff=0))
+
+    assert result['delivered'] is False and result['status'] == 401 and result['attempts'] == 1
+    assert received[0]['valid'] is False
+
+def test_retries_after_503_with_same_delivery_id(receiver):
+    start, received = receiver
+    result = asyncio.run(deliver(start(fail=2), NOTICE, secret=SECRET, backoff=0))
+
+    assert result['delivered'] is True and result['attempts'] == 3
+    assert [r['status'] for r in received] == [503, 503, 204]
+    assert received[-1]['valid']
+    assert len({r['delivery'] for r in received}) == 1 and received[0]['delivery']
+
+def test_zero_attempts_still_tries_once():
+    result = asyncio.run(deliver(CLOSED_URL, NOTICE, secret=SECRET, attempts=0, timeout=1))
+    assert result['delivered'] is False
+    assert result['attempts'] == 1
+    assert '연결 실패' in result['error']
+
+def test_missing_secret_is_not_sent():
+    result = asyncio.run(deliver(CLOSED_URL, NOTICE, secret=''))
+    assert result == {'delivered': False, 'attempts': 0, 'status': None, 'error': result['error']}
+    assert 'GIMPACT_CALLBACK_SECRET' in result['error']
+
+def test_unopenable_url_fails_without_retry():
+    result = asyncio.run(deliver('http://[oops/cb', NOTICE, secret=SECRET, backoff=0))
+    assert result['delivered'] is False and result['attempts'] == 1
+    assert 'URL' in result['error']
+
+@pytest.mark.parametrize('url', ['http://[oops/cb', 'http://example.com:port/cb', 'http:///cb'])
+def test_check_callback_url_rejects(url):
+    with pytest.raises(ValueError):
+        check_callback_url(url)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""코호트 비교 - 백분위/중앙값은 영역 점수가 있는 기업 기준이고 그 수를 함께 넘김"""
+
+import copy
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cohort import Cohort
+from real_sample_data import REAL_SAMPLE_DATA
+
+def company(scores, drop=()):
+    handoffs = copy.deepcopy(REAL_SAMPLE_DATA)
+    summary = handoffs['step_3_1_diagnosis']['scores_summary']
+    for area, score in scores.items():
+        summary[area]['score'] = score
+    for area in drop:
+        del summary[area]
+    return handoffs
+
+def test_benchmark_counts_only_companies_with_a_score():
+    cohort = Cohort.from_companies([
+        ('A', company({'재무': '4.5'})),
+        ('B', company({'재무': '2.0'})),
+        ('C', company({}, drop=['재무'])),
+    ])
+    benchmark = cohort.benchmark('A')
+
+    assert benchmark.size == 3
+    assert benchmark.counts['재무'] == 2
+    assert benchmark.counts['경영일반'] == 3
+    assert benchmark.percentiles['재무'] == 75.0
+    assert benchmark.medians['재무'] == 3.25
+
+def test_radar_label_shows_partial_comparison():
+    from analysis_report_generator import _cohort_label
+
+    cohort = Cohort.from_companies([('A', company({'재무': '4.5'})), ('B', company({}, drop=['재무']))])
+    benchmark = cohort.benchmark('A')
+    assert _cohort_label('재무', '재무', benchmark).endswith('(1/2)')
+    assert '(' not in _cohort_label('경영\n일반', '경영일반', benchmark)
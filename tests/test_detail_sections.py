@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""상세 보고서 섹션 순서 - 요약 섹션 키는 빠지고 빠진 키를 알려줌"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_sections import detail_section_order
+
+def test_detail_section_order():
+    keys = ['custom', 'tows', 'summary', 'pestel']
+    assert detail_section_order(keys) == (['pestel', 'tows', 'custom'], ['summary'])
+
+def test_generator_reports_dropped_sections():
+    from detail_report_generator import DetailReportGenerator
+    from real_sample_data import REAL_SAMPLE_DATA
+
+    transformed = {'sections': {'summary': {'content': '## 요약'}, 'swot': {'content': '## SWOT'}}}
+    generator = DetailReportGenerator(REAL_SAMPLE_DATA, transformed, 'G임팩트')
+    assert generator.section_keys() == ['swot']
+    assert generator.dropped_section_keys() == ['summary']
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""섹션 조각 경로 - 고정 출력(invariant)이면 캐시를 채울 때와 캐시를 쓸 때 바이트가 같음"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analysis_report_generator as arg
+import report_fragments
+from real_sample_data import REAL_SAMPLE_DATA
+
+def render(path, workers=0):
+    metrics = {}
+    arg.generate_analysis_report(REAL_SAMPLE_DATA, str(path), 'G임팩트', use_fragment_cache=True, workers=workers,
+                                 metrics=metrics, report_date='2026-01-15', invariant=True)
+    with open(path, 'rb') as f:
+        return f.read(), metrics
+
+def test_invariant_cold_and_warm_renders_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_fragments, 'FRAGMENT_CACHE_DIR', str(tmp_path / 'fragments'))
+    cold, cold_metrics = render(tmp_path / 'cold.pdf')
+    warm, warm_metrics = render(tmp_path / 'warm.pdf')
+
+    assert not cold_metrics['fragments_cached']
+    assert not warm_metrics['fragments_rendered']
+    assert cold == warm
+
+def test_invariant_fragment_bytes_do_not_depend_on_clock():
+    first = report_fragments.render_fragment(REAL_SAMPLE_DATA, 'pestel', 'G임팩트', '2026-01-15', invariant=True)
+    time.sleep(1.1)  # 비고정 출력은 초 단위 생성 시각/문서 ID가 달라짐
+    second = report_fragments.render_fragment(REAL_SAMPLE_DATA, 'pestel', 'G임팩트', '2026-01-15', invariant=True)
+    assert first[0] == second[0]
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""POST /generate - AI 변환 결과가 없어도 두 보고서 모두 생성"""
+
+import base64
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('fastapi')
+pytest.importorskip('httpx')
+
+# 서버 모듈은 임포트할 때 저장소 경로를 읽음 - 테스트용 임시 폴더로
+_tmp = tempfile.mkdtemp(prefix='gimpact-test-')
+for _name, _value in {'GIMPACT_HANDOFF_DB': os.path.join(_tmp, 'handoffs.sqlite3'),
+                      'GIMPACT_BLOB_DIR': os.path.join(_tmp, 'blobs'),
+                      'GIMPACT_ARTIFACT_DIR': os.path.join(_tmp, 'artifacts')}.items():
+    os.environ.setdefault(_name, _value)
+
+from fastapi.testclient import TestClient
+
+import pdf_api_server
+from real_sample_data import REAL_SAMPLE_DATA
+
+def test_generate_with_empty_transformed():
+    body = {'meta': {'business_name': 'G임팩트'}, 'handoffs': REAL_SAMPLE_DATA,
+            'transformed': {'sections': {}}, 'options': {'businessName': 'G임팩트'}}
+    with TestClient(pdf_api_server.app) as client:
+        response = client.post('/generate', json=body)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result['success'], result.get('error')
+    assert result['summaryPages'] > 1 and result['detailPages'] >= 1
+    assert base64.b64decode(result['detailPdf']).startswith(b'%PDF-')
+    assert base64.b64decode(result['summaryPdf']).startswith(b'%PDF-')
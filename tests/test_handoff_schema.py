@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""핸드오프 스키마 - 기존 리포트가 렌더링하던 값(숫자 성장률/확률, null 텍스트)은 통과"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handoff_schema import step_adapter
+
+def test_numeric_display_values_pass_unchanged():
+    market = step_adapter('step_2_5_market').validate_python({'market_trends': {'growth_rates': {
+        'historical_cagr': {'value': 18, 'period': '2021-2026'},
+        'forecast_short': {'value': 5.2, 'period': '1년'},
+        'forecast_mid': {'value': '15', 'period': '3년'},
+    }}})
+    rates = market['market_trends']['growth_rates']
+    assert [rates[k]['value'] for k in ('historical_cagr', 'forecast_short', 'forecast_mid')] == [18, 5.2, '15']
+
+    scenario = step_adapter('step_2_2_scenario').validate_python(
+        {'scenarios': {'scenario_1': {'name': '황금기', 'probability': 20}}})
+    assert scenario['scenarios']['scenario_1']['probability'] == 20
+
+def test_null_free_text_passes():
+    tows = step_adapter('step_3_4_tows').validate_python({'decision_summary': {'immediate_actions': [
+        {'action': '협력 전담자 지정', 'owner': None, 'deadline': None}]}})
+    assert tows['decision_summary']['immediate_actions'][0]['deadline'] is None
+
+    swot = step_adapter('step_3_3_swot').validate_python({'strengths': [{'id': 'S1', 'description': None}]})
+    assert swot['strengths'][0]['description'] is None
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""목차 페이지 번호 = 해당 섹션 페이지의 푸터 번호 (전체 레이아웃 / 섹션 조각 경로)"""
+
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pymupdf = pytest.importorskip('pymupdf')
+
+import analysis_report_generator as arg
+import report_fragments
+from real_sample_data import REAL_SAMPLE_DATA
+
+FOOTER = re.compile(r'^- (\d+) -$', re.M)
+
+def page_texts(path):
+    with pymupdf.open(path) as doc:
+        return [page.get_text() for page in doc]
+
+def toc_entries(texts):
+    """목차 페이지(두 번째 페이지)의 (제목, 번호)"""
+    lines = texts[1].split('- 1 -', 1)[1].split('\n')
+    titles = [section.title for section in arg.REPORT_SECTIONS.values()]
+    entries = []
+    for i, line in enumerate(lines):
+        if line in titles:
+            entries.append((line, lines[i + 2]))
+    return entries
+
+def footer_of(text):
+    match = FOOTER.search(text)
+    return match.group(1) if match else None
+
+def render(tmp_path, use_fragment_cache, monkeypatch):
+    monkeypatch.setattr(report_fragments, 'FRAGMENT_CACHE_DIR', str(tmp_path / 'fragments'))
+    path = str(tmp_path / f'report-{int(use_fragment_cache)}.pdf')
+    arg.generate_analysis_report(REAL_SAMPLE_DATA, path, 'G임팩트', use_fragment_cache=use_fragment_cache,
+                                 workers=0, report_date='2026-01-15')
+    return page_texts(path)
+
+@pytest.mark.parametrize('use_fragment_cache', [False, True])
+def test_toc_numbers_match_footers(tmp_path, monkeypatch, use_fragment_cache):
+    texts = render(tmp_path, use_fragment_cache, monkeypatch)
+    entries = toc_entries(texts)
+    assert len(entries) == len(arg.REPORT_SECTIONS)
+
+    # 상세 섹션 제목은 본문 제목과 같음 - 목차 뒤에서 제목이 처음 나오는 페이지의 푸터와 비교
+    detail_titles = {section.title for section in arg.DETAIL_SECTIONS}
+    for title, number in entries:
+        assert number.isdigit(), (title, number)
+        if title in detail_titles:
+            page = next(text for text in texts[2:] if title in text)
+            assert footer_of(page) == number, title
+
+def test_toc_same_for_both_paths(tmp_path, monkeypatch):
+    assert toc_entries(render(tmp_path, False, monkeypatch)) == toc_entries(render(tmp_path, True, monkeypatch))
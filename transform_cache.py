@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+G-IMPACT AI 변환 캐시
+섹션별 AI 변환 마크다운을 SQLite에 저장해 입력이 같으면 LLM 호출 없이 재사용
+
+구조:
+1. 키 = (섹션 ID, 입력 해시, 프롬프트 버전, 모델)
+   - 입력 해시: 섹션 핸드오프(경영진 요약은 핸드오프 전체)와 기업명의 정렬된 JSON SHA-256
+   - 프롬프트 버전: ai_transform.PROMPT_KEY (프롬프트 문구가 바뀌면 자동으로 바뀜)
+2. 저장 후 TTL(GIMPACT_TRANSFORM_CACHE_TTL_HOURS)이 지나면 만료 - 조회 시 무시, prune에서 삭제
+3. 전체 크기가 상한(GIMPACT_TRANSFORM_CACHE_MB)을 넘으면 오래 안 쓴 항목부터 삭제
+4. 변환 실패는 저장하지 않음
+
+사용법:
+    python transform_cache.py            # 섹션/모델별 항목 수와 크기
+    python transform_cache.py --prune    # 만료/용량 초과 항목 삭제
+    python transform_cache.py --clear    # 전체 삭제
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from handoff_store import canonical_json
+
+# ==============================================================================
+# 설정
+# ==============================================================================
+TRANSFORM_CACHE_ENABLED = os.environ.get('GIMPACT_TRANSFORM_CACHE', '1') == '1'
+TRANSFORM_CACHE_PATH = os.environ.get('GIMPACT_TRANSFORM_CACHE_DB') or os.path.join(
+    os.environ.get('GIMPACT_CACHE_DIR', os.path.expanduser('~/.cache/gimpact')), 'transforms.sqlite3')
+
+# 저장 후 유효 시간 / 전체 크기 상한
+TRANSFORM_CACHE_TTL = float(os.environ.get('GIMPACT_TRANSFORM_CACHE_TTL_HOURS', '168')) * 3600
+TRANSFORM_CACHE_MAX_BYTES = int(os.environ.get('GIMPACT_TRANSFORM_CACHE_MB', '64')) * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transforms (
+    section TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    model TEXT NOT NULL,
+    content TEXT NOT NULL,
+    generated_at TEXT NOT NULL,
+    created REAL NOT NULL,
+    used REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (section, digest, prompt_version, model)
+);
+CREATE INDEX IF NOT EXISTS transforms_used ON transforms (used);
+"""
+
+def input_digest(data, business_name):
+    """변환 입력(핸드오프 + 기업명) 해시 - 키 순서와 무관"""
+    return hashlib.sha256(canonical_json([business_name, data]).encode('utf-8')).hexdigest()
+
+# ==============================================================================
+# 캐시
+# ==============================================================================
+class TransformCache:
+    """SQLite 변환 캐시 (스레드 간 연결 하나를 잠금으로 공유)"""
+
+    def __init__(self, path=TRANSFORM_CACHE_PATH, ttl=TRANSFORM_CACHE_TTL, max_bytes=TRANSFORM_CACHE_MAX_BYTES):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def get(self, section, digest, prompt_version, model):
+        """저장된 (마크다운, 생성 시각) - 없거나 만료됐으면 None"""
+        now = time.time()
+        key = (section, digest, prompt_version, model)
+        with self._lock:
+            row = self._db.execute(
+                'SELECT content, generated_at, created FROM transforms '
+                'WHERE section = ? AND digest = ? AND prompt_version = ? AND model = ?', key).fetchone()
+            if row is None or now - row[2] > self.ttl:
+                return None
+            self._db.execute('UPDATE transforms SET used = ? '
+                             'WHERE section = ? AND digest = ? AND prompt_version = ? AND model = ?', (now, *key))
+        return row[0], row[1]
+
+    def put(self, section, digest, prompt_version, model, content, generated_at):
+        """변환 결과 저장 (같은 키가 있으면 덮어씀)"""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO transforms (section, digest, prompt_version, model, content, generated_at, '
+                'created, used, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (section, digest, prompt_version, model, content, generated_at, now, now,
+                 len(content.encode('utf-8'))))
+
+    def prune(self):
+        """만료 항목 삭제 후 전체 크기가 상한을 넘으면 오래 안 쓴 항목부터 삭제 → 삭제한 개수"""
+        with self._lock:
+            removed = self._db.execute('DELETE FROM transforms WHERE created < ?',
+                                       (time.time() - self.ttl,)).rowcount
+            total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM transforms').fetchone()[0]
+            if total <= self.max_bytes:
+                return removed
+            evict = []
+            for rowid, size in self._db.execute('SELECT rowid, size FROM transforms ORDER BY used'):
+                if total <= self.max_bytes:
+                    break
+                evict.append((rowid,))
+                total -= size
+            self._db.executemany('DELETE FROM transforms WHERE rowid = ?', evict)
+            return removed + len(evict)
+
+    def clear(self):
+        with self._lock:
+            return self._db.execute('DELETE FROM transforms').rowcount
+
+    def summary(self):
+        """(섹션, 모델, 프롬프트 버전, 항목 수, 바이트) 목록"""
+        with self._lock:
+            return self._db.execute(
+                'SELECT section, model, prompt_version, COUNT(*), SUM(size) FROM transforms '
+                'GROUP BY section, model, prompt_version ORDER BY section, model, prompt_version').fetchall()
+
+# 서버 프로세스당 하나 (GIMPACT_TRANSFORM_CACHE=0이면 None)
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_transform_cache():
+    global _cache
+    if not TRANSFORM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = TransformCache()
+        return _cache
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='G-IMPACT AI 변환 캐시')
+    parser.add_argument('--db', default=TRANSFORM_CACHE_PATH, help='SQLite 파일 경로')
+    parser.add_argument('--prune', action='store_true', help='만료/용량 초과 항목 삭제')
+    parser.add_argument('--clear', action='store_true', help='전체 삭제')
+    args = parser.parse_args()
+
+    cache = TransformCache(args.db)
+    if args.clear:
+        print(f"삭제: {cache.clear()}개")
+    elif args.prune:
+        print(f"삭제: {cache.prune()}개")
+    for section, model, prompt_version, count, size in cache.summary():
+        print(f"{section:<12} {model:<20} {prompt_version:<18} {count:>5}개 {size / 1024:>8.1f}KB")